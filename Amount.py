@@ -0,0 +1,268 @@
+import sys
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from fractions import Fraction
+from operator import itemgetter
+from typing import Union
+
+from xrpl.models import IssuedCurrencyAmount
+from xrpl.utils import XRPRangeException
+
+"""
+Exact amounts
+
+xAmount keeps xrp as integer drops and tokens as the ledger stores them, a 16 digit integer mantissa and an exponent,
+so parsing, comparing, adding and rating amounts never goes through float and rounds at most once
+"""
+
+DROPS_PER_XRP = 1000000
+MAX_DROPS = 10 ** 17 # 100 billion xrp, like `xrp_to_drops`
+MANTISSA_DIGITS = 16
+MIN_MANTISSA = 10 ** (MANTISSA_DIGITS - 1)
+MAX_MANTISSA = 10 ** MANTISSA_DIGITS - 1
+ZERO_EXPONENT = -100 # the ledger's canonical zero
+POWERS = [10 ** power for power in range(64)]
+
+
+def parse_value(value: str) -> tuple:
+    """return (mantissa, exponent) of a decimal string such as "1.5", "-20" or "1.23e-20", exactly"""
+    number, _, exponent = value.lower().partition("e")
+    whole, _, fraction = number.partition(".")
+    return int(whole + fraction), (int(exponent) if exponent else 0) - len(fraction)
+
+
+def normalize(mantissa: int, exponent: int) -> tuple:
+    """scale a mantissa to 16 digits like the ledger does, rounding half to even if it is longer"""
+    if mantissa == 0:
+        return 0, ZERO_EXPONENT
+    sign = -1 if mantissa < 0 else 1
+    mantissa = abs(mantissa)
+    if MIN_MANTISSA <= mantissa <= MAX_MANTISSA:
+        return sign * mantissa, exponent
+    # digit count from the bit length, off by at most one
+    digits = (mantissa.bit_length() * 1233 >> 12) + 1
+    if digits < len(POWERS) and mantissa < POWERS[digits - 1]:
+        digits -= 1
+    elif digits >= len(POWERS):
+        digits = len(str(mantissa))
+    shift = digits - MANTISSA_DIGITS
+    if shift < 0:
+        mantissa *= POWERS[-shift]
+    elif shift > 0:
+        mantissa, remainder = divmod(mantissa, 10 ** shift)
+        half = 5 * 10 ** (shift - 1)
+        if remainder > half or (remainder == half and mantissa & 1):
+            mantissa += 1
+        if mantissa > MAX_MANTISSA:
+            mantissa //= 10
+            shift += 1
+    return sign * mantissa, exponent + shift
+
+
+def xrp_string(drops: Union[int, str]) -> str:
+    """format drops as xrp with 6 decimals, "20000000" -> "20.000000" """
+    drops = int(drops)
+    whole, fraction = divmod(abs(drops), DROPS_PER_XRP)
+    return f"{'-' if drops < 0 else ''}{whole}.{fraction:06d}"
+
+
+def to_drops(xrp: Union[int, float, str, Decimal, "xAmount"]) -> str:
+    """convert an xrp amount to a drops string without going through float arithmetic\n
+    floats are taken at their shortest repr and rounded half to even to a whole drop, like `xrp_to_drops`,
+    str and Decimal amounts must be a whole number of drops\n
+    raises `XRPRangeException` like `xrp_to_drops` for negative, non-finite, below one drop and above 100 billion xrp"""
+    if isinstance(xrp, xAmount):
+        if not xrp.is_xrp():
+            raise ValueError(f"{xrp!r} is not an xrp amount")
+        xrp = xrp.to_decimal()
+    try:
+        value = Decimal(repr(xrp)) if isinstance(xrp, float) else Decimal(xrp)
+    except InvalidOperation:
+        raise XRPRangeException(f"Not a valid amount of XRP: '{xrp}'")
+    if not value.is_finite():
+        raise XRPRangeException(f"Not a valid amount of XRP: '{xrp}'")
+    if value < 0:
+        raise XRPRangeException(f"XRP amount {xrp} is negative.")
+    if value != 0 and value.scaleb(6) < 1:
+        raise XRPRangeException(f"XRP amount {xrp} is too small.")
+    if isinstance(xrp, float):
+        drops = int(value.scaleb(6).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+    else:
+        mantissa, exponent = parse_value(str(value))
+        exponent += 6
+        if exponent >= 0:
+            drops = mantissa * 10 ** exponent
+        else:
+            drops, remainder = divmod(mantissa, 10 ** -exponent)
+            if remainder:
+                raise ValueError(f"{xrp} XRP is not a whole number of drops")
+    if drops > MAX_DROPS:
+        raise XRPRangeException(f"XRP amount {xrp} is too large.")
+    return str(drops)
+
+
+def rate(numerator: Union[str, int, Decimal], denominator: Union[str, int, Decimal]) -> float:
+    """return numerator / denominator of two decimal amounts, rounded once to the nearest float"""
+    numerator_mantissa, numerator_exponent = parse_value(str(numerator))
+    denominator_mantissa, denominator_exponent = parse_value(str(denominator))
+    return float(Fraction(numerator_mantissa, denominator_mantissa) * Fraction(10) ** (numerator_exponent - denominator_exponent))
+
+
+class xAmount(tuple):
+    # a tuple underneath, so amounts are immutable and cheap to build
+    __slots__ = ()
+
+    mantissa = property(itemgetter(0))
+    exponent = property(itemgetter(1))
+    currency = property(itemgetter(2))
+    issuer = property(itemgetter(3))
+
+    def __new__(cls, mantissa: int, exponent: int, currency: str = "XRP", issuer: str = "") -> "xAmount":
+        """the value is mantissa * 10 ** exponent, xrp amounts are drops with exponent -6\n
+        use `xrp`, `token` or `from_xrpl` rather than building one directly"""
+        return tuple.__new__(cls, (mantissa, exponent, currency, issuer))
+
+    @classmethod
+    def drops(cls, drops: Union[int, str]) -> "xAmount":
+        return cls(int(drops), -6)
+
+    @classmethod
+    def xrp(cls, xrp: Union[int, float, str, Decimal]) -> "xAmount":
+        return cls(int(to_drops(xrp)), -6)
+
+    @classmethod
+    def token(cls, value: Union[str, int, Decimal], currency: str, issuer: str) -> "xAmount":
+        return cls(*normalize(*parse_value(str(value))), currency, issuer)
+
+    @classmethod
+    def from_xrpl(cls, amount: Union[str, dict]) -> "xAmount":
+        """parse an amount field as rippled returns it, drops string or {"currency", "issuer", "value"}"""
+        if isinstance(amount, str):
+            return cls(int(amount), -6)
+        # interned, so the many amounts of one token share their currency and issuer
+        return cls.token(amount["value"], sys.intern(amount["currency"]), sys.intern(amount["issuer"]))
+
+    def to_xrpl(self) -> Union[str, dict]:
+        """return the amount as builders and rippled take it"""
+        if self.is_xrp():
+            return str(self.mantissa)
+        return {"currency": self.currency, "issuer": self.issuer, "value": self.value()}
+
+    def to_model(self) -> Union[str, IssuedCurrencyAmount]:
+        """return the amount as the transaction models take it"""
+        if self.is_xrp():
+            return str(self.mantissa)
+        return IssuedCurrencyAmount(currency=self.currency, issuer=self.issuer, value=self.value())
+
+    def is_xrp(self) -> bool:
+        return self.currency == "XRP" and not self.issuer
+
+    def value(self) -> str:
+        """the amount in units, xrp with 6 decimals, tokens formatted like rippled"""
+        if self.is_xrp():
+            return xrp_string(self.mantissa)
+        mantissa, exponent = self.mantissa, self.exponent
+        if mantissa == 0:
+            return "0"
+        if exponent != 0 and (exponent < -25 or exponent > -5):
+            while mantissa % 10 == 0:
+                mantissa //= 10
+                exponent += 1
+            return f"{mantissa}e{exponent}"
+        sign = "-" if mantissa < 0 else ""
+        digits = str(abs(mantissa))
+        if exponent == 0:
+            return sign + digits
+        point = len(digits) + exponent
+        whole = digits[:point] if point > 0 else "0"
+        fraction = ("0" * -point + digits if point < 0 else digits[point:]).rstrip("0")
+        return f"{sign}{whole}.{fraction}" if fraction else sign + whole
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.mantissa).scaleb(self.exponent)
+
+    def __float__(self) -> float:
+        """the amount in units, rounded once to the nearest float"""
+        if self.exponent >= 0:
+            return float(self.mantissa * 10 ** self.exponent)
+        return self.mantissa / 10 ** -self.exponent
+
+    def _aligned(self, other: "xAmount") -> tuple:
+        exponent = min(self.exponent, other.exponent)
+        return self.mantissa * 10 ** (self.exponent - exponent), other.mantissa * 10 ** (other.exponent - exponent), exponent
+
+    def _same_asset(self, other: "xAmount") -> None:
+        if not isinstance(other, xAmount):
+            raise TypeError(f"cannot combine xAmount with {type(other).__name__}")
+        if self.currency != other.currency or self.issuer != other.issuer:
+            raise ValueError(f"cannot combine {self.currency}.{self.issuer} with {other.currency}.{other.issuer}")
+
+    def __add__(self, other: "xAmount") -> "xAmount":
+        self._same_asset(other)
+        left, right, exponent = self._aligned(other)
+        if self.is_xrp():
+            return xAmount(left + right, exponent)
+        return xAmount(*normalize(left + right, exponent), self.currency, self.issuer)
+
+    def __sub__(self, other: "xAmount") -> "xAmount":
+        return self + -other
+
+    def __neg__(self) -> "xAmount":
+        return xAmount(-self.mantissa, self.exponent, self.currency, self.issuer)
+
+    def __mul__(self, other):
+        return NotImplemented # not tuple repetition
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: "xAmount") -> Fraction:
+        """the exact ratio of two amounts in units, e.g. the rate of an offer"""
+        return Fraction(self.mantissa, other.mantissa) * Fraction(10) ** (self.exponent - other.exponent)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, xAmount):
+            return NotImplemented
+        if self.currency != other.currency or self.issuer != other.issuer:
+            return False
+        left, right, _ = self._aligned(other)
+        return left == right
+
+    def __ne__(self, other) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __lt__(self, other: "xAmount") -> bool:
+        self._same_asset(other)
+        left, right, _ = self._aligned(other)
+        return left < right
+
+    def __le__(self, other: "xAmount") -> bool:
+        return self == other or self < other
+
+    def __gt__(self, other: "xAmount") -> bool:
+        return other < self
+
+    def __ge__(self, other: "xAmount") -> bool:
+        return other <= self
+
+    def __hash__(self) -> int:
+        return hash((self.currency, self.issuer, self.to_decimal()))
+
+    def __bool__(self) -> bool:
+        return self.mantissa != 0
+
+    def __str__(self) -> str:
+        return self.value()
+
+    def __repr__(self) -> str:
+        if self.is_xrp():
+            return f"xAmount({self.value()} XRP)"
+        return f"xAmount({self.value()} {self.currency}.{self.issuer})"
+
+
+def model_amount(amount: Union[float, xAmount, IssuedCurrencyAmount]) -> Union[str, IssuedCurrencyAmount]:
+    """an amount as the transaction models take it, xrp given as a float or `xAmount` becomes drops"""
+    if isinstance(amount, xAmount):
+        return amount.to_model()
+    if isinstance(amount, float):
+        return to_drops(amount)
+    return amount
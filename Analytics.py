@@ -0,0 +1,145 @@
+import asyncio
+import time
+from typing import Union
+
+import numpy as np
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.ledger import get_latest_validated_ledger_sequence
+
+from Holders import holder_row
+from Wallet import xWallet
+
+"""
+Holder analytics
+
+One scan of an issuer's trust lines (see `Holders`) gives a balance column per token, rich lists,
+gini, concentration and threshold counts are then vectorized over it. A full scan of a large issuer
+takes longer than a ledger, so a scan is reused while it is at most `max_lag` ledgers behind the validated
+one (or younger than `max_age` seconds, without asking the node), every book reports the ledger it was read on
+"""
+
+
+class xHolderBook:
+    def __init__(self, holders: list, balances: list, frozen: list, ledger_index: int = None) -> None:
+        """the holders of one token with their balances (holder side, decimal strings) and freeze status as of `ledger_index`\n
+        only positive balances are holdings, empty trust lines and negative balances are left out"""
+        self.ledger_index = ledger_index
+        balances = np.array(balances, dtype=np.float64) if balances else np.zeros(0, dtype=np.float64)
+        held = balances > 0
+        # largest first
+        order = np.argsort(-balances[held], kind="stable")
+        self.holders = np.array(holders, dtype=object)[held][order] if holders else np.zeros(0, dtype=object)
+        self.balances = balances[held][order]
+        self.frozen = np.array(frozen, dtype=bool)[held][order] if frozen else np.zeros(0, dtype=bool)
+        self.trust_lines = len(balances)
+        self.cumulative = np.cumsum(self.balances)
+
+    def __len__(self) -> int:
+        return len(self.balances)
+
+    def supply(self) -> float:
+        """the total held"""
+        return float(self.cumulative[-1]) if len(self) else 0.0
+
+    def top(self, n: int = 100) -> list:
+        """return the `n` largest holders with their balance and share of supply"""
+        supply = self.supply()
+        return [{
+            "rank": rank + 1,
+            "holder": self.holders[rank],
+            "balance": float(self.balances[rank]),
+            "share": float(self.balances[rank] / supply),
+            "frozen": bool(self.frozen[rank])} for rank in range(min(n, len(self)))]
+
+    def concentration(self, n: int = 10) -> float:
+        """return the share of supply the `n` largest holders hold"""
+        if not len(self) or n <= 0:
+            return 0.0
+        return float(self.cumulative[min(n, len(self)) - 1] / self.cumulative[-1])
+
+    def gini(self) -> float:
+        """return the gini coefficient of the holdings, 0 when everyone holds the same, towards 1 when one holder has it all"""
+        count = len(self)
+        if not count:
+            return 0.0
+        ascending = self.balances[::-1]
+        ranks = np.arange(1, count + 1, dtype=np.float64)
+        return float(2.0 * np.dot(ranks, ascending) / (count * self.cumulative[-1]) - (count + 1) / count)
+
+    def holders_above(self, thresholds: Union[list, tuple]) -> dict:
+        """return how many holders hold at least each of `thresholds`"""
+        ascending = self.balances[::-1]
+        counts = len(self) - np.searchsorted(ascending, np.asarray(thresholds, dtype=np.float64), side="left")
+        return {threshold: int(count) for threshold, count in zip(thresholds, counts)}
+
+    def frozen_supply(self) -> float:
+        """the total held on frozen trust lines"""
+        return float(self.balances[self.frozen].sum())
+
+    def summary(self, top_n: int = 10, thresholds: Union[list, tuple] = (1, 1000, 1000000)) -> dict:
+        return {
+            "ledger_index": self.ledger_index,
+            "holders": len(self),
+            "trust_lines": self.trust_lines,
+            "supply": self.supply(),
+            "frozen_supply": self.frozen_supply(),
+            "frozen_holders": int(self.frozen.sum()),
+            "gini": self.gini(),
+            "top_concentration": self.concentration(top_n),
+            "holders_above": self.holders_above(thresholds),
+            "top_holders": self.top(top_n)}
+
+
+class xHolderAnalytics:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], issuer: str, page_size: int = 400, max_lag: int = 15, max_age: float = 0.0) -> None:
+        """holder distribution of the tokens `issuer` issued, `page_size` trust lines per request\n
+        a scan is reused while it is at most `max_lag` ledgers behind the validated ledger,
+        and for `max_age` seconds without asking the node at all"""
+        self.wallet = xWallet(url)
+        self.client = self.wallet.client
+        self.issuer = issuer
+        self.page_size = page_size
+        self.max_lag = max_lag
+        self.max_age = max_age
+        self.ledger_index = None
+        self.scanned = 0.0
+        self.books = {}
+        self.lock = None
+
+    async def scan(self) -> dict:
+        """return a `xHolderBook` per token symbol, rescanning at the latest validated ledger once the last scan is more than `max_lag` ledgers behind"""
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if self.ledger_index is not None and time.monotonic() - self.scanned < self.max_age:
+                return self.books
+            validated = await get_latest_validated_ledger_sequence(self.client)
+            if self.ledger_index is None or validated - self.ledger_index > self.max_lag:
+                columns = {}
+                async for page in self.wallet.iter_account_lines(self.issuer, self.page_size, ledger_index=validated):
+                    for line in page["lines"]:
+                        holder, currency, balance, _, freeze, _ = holder_row(line)
+                        holders, balances, frozen = columns.setdefault(currency, ([], [], []))
+                        holders.append(holder)
+                        balances.append(balance)
+                        frozen.append(freeze)
+                self.books = {currency: xHolderBook(*column, ledger_index=validated) for currency, column in columns.items()}
+                self.ledger_index = validated
+                self.scanned = time.monotonic()
+        return self.books
+
+    async def book(self, token: str) -> xHolderBook:
+        """return the holders of `token`, an empty book if nobody trusts it"""
+        books = await self.scan()
+        return books.get(token, xHolderBook([], [], [], self.ledger_index))
+
+    async def rich_list(self, token: str, n: int = 100) -> list:
+        """return the `n` largest holders of `token`"""
+        return (await self.book(token)).top(n)
+
+    async def distribution(self, token: str, top_n: int = 10, thresholds: Union[list, tuple] = (1, 1000, 1000000)) -> dict:
+        """return holder count, supply, frozen supply, gini, top `top_n` concentration, holders above `thresholds` and the top holders of `token`"""
+        summary = (await self.book(token)).summary(top_n, thresholds)
+        summary["token"] = token
+        summary["issuer"] = self.issuer
+        return summary
@@ -1,14 +1,10 @@
 
-from xrpl import CryptoAlgorithm
 from xrpl.models import (AccountSet, AccountSetFlag, IssuedCurrencyAmount,
                          NFTokenBurn, NFTokenMint, NFTokenMintFlag, Payment,
                          TrustSet, Transaction, AccountSetAsfFlag)
-from xrpl.clients.json_rpc_client import JsonRpcClient
-from xrpl.transaction.main  import autofill_and_sign, sign_and_submit
-from xrpl.wallet import Wallet
 
-from Misc import (mm, nft_fee_to_xrp_format,
-                  transfer_fee_to_xrp_format, validate_symbol_to_hex)
+from Currency import text_to_hex, validate_symbol_to_hex
+from Misc import mm, nft_fee_to_xrp_format, transfer_fee_to_xrp_format
 from x_constants import M_SOURCE_TAG
 
 """create tokens, nfts"""
@@ -18,14 +14,14 @@ from x_constants import M_SOURCE_TAG
 """1"""
 def accountset_issuer(issuer_addr: str, ticksize: int, transferfee: float, domain: str, fee: str = None) -> dict:
     txn = AccountSet(account=issuer_addr, set_flag=AccountSetAsfFlag.ASF_DEFAULT_RIPPLE, tick_size=ticksize,
-    transfer_rate=transfer_fee_to_xrp_format(transferfee), domain=validate_symbol_to_hex(domain), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    transfer_rate=transfer_fee_to_xrp_format(transferfee), domain=text_to_hex(domain), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 """2"""
 def accountset_manager(manager_addr: str, domain: str, fee: str = None) -> dict:
     txn = AccountSet(account=manager_addr,
                         set_flag=AccountSetAsfFlag.ASF_REQUIRE_AUTH, # TF_REQUIRE_AUTH
-                    domain=validate_symbol_to_hex(domain), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+                    domain=text_to_hex(domain), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 """3"""
@@ -72,7 +68,7 @@ def mint_nft(issuer_addr: str, taxon: int, is_transferable: bool, only_xrp: bool
     txn = NFTokenMint(
         account=issuer_addr,
         nftoken_taxon=taxon,
-        uri=validate_symbol_to_hex(uri), flags=flag, transfer_fee=nft_fee_to_xrp_format(transfer_fee), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+        uri=text_to_hex(uri), flags=flag, transfer_fee=nft_fee_to_xrp_format(transfer_fee), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 def burn_nft(sender_addr: str, nftoken_id: str, holder: str = None, fee: str = None) -> dict:
@@ -84,13 +80,13 @@ def burn_nft(sender_addr: str, nftoken_id: str, holder: str = None, fee: str = N
 
 
 # token_client = JsonRpcClient("http://s.devnet.rippletest.net:51234")
-issuer1 = Wallet.from_seed(seed= "sEdS1jTVU58HsPeL4xhPkziphnxFDHz") # rHTfx7p4ge8CfDhyoczpSwc84LWfiK3dhN
-print(issuer1.address)
+# issuer1 = Wallet.from_seed(seed= "sEdS1jTVU58HsPeL4xhPkziphnxFDHz") # rHTfx7p4ge8CfDhyoczpSwc84LWfiK3dhN
+# print(issuer1.address)
 
 
-manager1 = Wallet.from_seed(seed= "sEdVdthdYnRRLqBXAD76QC7CatoLqU8")
-print(manager1.classic_address) # rBoSibkbwaAUEpkehYixQrXp4AqZez9WqA
-token1 = "NGN"
+# manager1 = Wallet.from_seed(seed= "sEdVdthdYnRRLqBXAD76QC7CatoLqU8")
+# print(manager1.classic_address) # rBoSibkbwaAUEpkehYixQrXp4AqZez9WqA
+# token1 = "NGN"
 
 
 
@@ -0,0 +1,107 @@
+import csv
+import time
+from decimal import Decimal
+from typing import Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.ledger import get_fee
+from xrpl.wallet import Wallet
+
+from Misc import memo_builder
+from Objects import create_ticket, iter_account_objects
+from Signer import account_state, xSigner
+from Submit import xSubmitter
+from Transport import x_client
+from Wallet import send_token, send_xrp
+from x_constants import D_DATA, D_TYPE
+
+"""
+Bulk payments
+
+Payouts from one account are serialized by its Sequence, xBulkPayer spends Tickets instead
+so a whole batch can be signed across processes (see `Signer.xSigner`) and submitted at once (see `Submit.xSubmitter`)
+"""
+
+MAX_TICKETS = 250  # an account can hold at most 250 tickets
+
+
+def read_payments(path: str) -> list:
+    """return (recipient, amount, tag) rows of a csv file, a header row and the tag column are optional"""
+    payments = []
+    with open(path, newline="") as file:
+        for row in csv.reader(file):
+            if not row or row[0].strip().lower() in ("recipient", "address", "destination"):
+                continue
+            tag = row[2].strip() if len(row) > 2 else ""
+            payments.append((row[0].strip(), row[1].strip(), int(tag) if tag else None))
+    return payments
+
+
+class xBulkPayer:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], wallet: Wallet, token: str = None, issuer: str = None,
+        concurrency: int = 50, processes: int = None, ledger_offset: int = 20, poll_interval: float = 1.0) -> None:
+        """pays out of `wallet`, in xrp or in `token` of `issuer` when given\n
+        `concurrency` bounds the requests in flight, `processes` the signing workers (one per core by default)\n
+        every transaction expires `ledger_offset` ledgers after it is built"""
+        self.client = x_client(url)
+        self.wallet = wallet
+        self.token = token
+        self.issuer = issuer
+        self.signer = xSigner(wallet, processes)
+        self.submitter = xSubmitter(self.client, concurrency, poll_interval)
+        self.ledger_offset = ledger_offset
+
+    def payment(self, recipient: str, amount: str, tag: int = None, fee: str = None) -> dict:
+        memo = memo_builder(D_TYPE, D_DATA)
+        if self.token is not None:
+            return send_token(self.wallet.classic_address, recipient, self.token, str(amount), self.issuer, destination_tag=tag, memo=memo, fee=fee)
+        return send_xrp(self.wallet.classic_address, recipient, Decimal(str(amount)), destination_tag=tag, memo=memo, fee=fee)
+
+    async def tickets(self, count: int, fee: str) -> list:
+        """return `count` unused ticket sequences, creating the missing ones in one TicketCreate"""
+        tickets = sorted([ticket["TicketSequence"] async for ticket in iter_account_objects(self.client, self.wallet.classic_address, "ticket")])
+        missing = min(count, MAX_TICKETS) - len(tickets)
+        if missing > 0:
+            state = await account_state(self.client, self.wallet.classic_address, fee, self.ledger_offset)
+            sequence = state["sequence"]
+            [(blob, txid)] = await self.signer.sign_batch([create_ticket(self.wallet.classic_address, missing, fee=fee)], state)
+            [final] = await self.submitter.submit_many([blob])
+            if final["result"] != "tesSUCCESS":
+                raise RuntimeError(f"TicketCreate {txid} failed: {final['result']}")
+            # a TicketCreate at sequence S creates tickets S+1 .. S+count
+            tickets += range(sequence + 1, sequence + 1 + missing)
+        return tickets[:count]
+
+    async def pay(self, payments: list, fee: str = None) -> dict:
+        """pay every (recipient, amount, tag) of `payments` (a list or `read_payments` rows), up to 250 per round\n
+        returns one result per payment and the throughput"""
+        started = time.perf_counter()
+        fee = fee or await get_fee(self.client)
+        payments = [tuple(payment) + (None,) * (3 - len(payment)) for payment in payments]
+        results = []
+        for start in range(0, len(payments), MAX_TICKETS):
+            batch = payments[start:start + MAX_TICKETS]
+            tickets = await self.tickets(len(batch), fee)
+            state = await account_state(self.client, self.wallet.classic_address, fee, self.ledger_offset)
+            signed = await self.signer.sign_batch([self.payment(recipient, amount, tag, fee) for recipient, amount, tag in batch], state, tickets)
+            finals = await self.submitter.submit_many([blob for blob, _ in signed])
+            for (recipient, amount, tag), final in zip(batch, finals):
+                results.append({
+                    "recipient": recipient,
+                    "amount": str(amount),
+                    "tag": tag,
+                    "txid": final["txid"],
+                    "submit_result": final["submit_result"],
+                    "result": final["result"]})
+
+        seconds = time.perf_counter() - started
+        return {
+            "payments": results,
+            "succeeded": sum(1 for payment in results if payment["result"] == "tesSUCCESS"),
+            "seconds": seconds,
+            "payments_per_minute": len(results) * 60 / seconds if seconds else 0.0}
+
+    async def close(self) -> None:
+        """stop following ledgers and shut the signing workers down"""
+        await self.submitter.stop()
+        self.signer.close()
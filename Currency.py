@@ -0,0 +1,54 @@
+from functools import lru_cache
+
+from Misc import is_hex
+from Misc import validate_hex_to_symbol as hex_to_text
+from Misc import validate_symbol_to_hex as text_to_hex
+
+"""
+Memoised currency codes
+
+A deployment only ever sees a few hundred currency codes, so the conversions the parsers run on every
+currency field are cached, drop-in for the `Misc` functions of the same name
+only pass currency codes through them, nft URIs, domains and other values that rarely repeat would evict the
+codes, convert those with the uncached `hex_to_text` / `text_to_hex`
+"""
+
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def validate_hex_to_symbol(currency: str) -> str:
+    """return the symbol of a 3 letter or 40 hex char currency code"""
+    return hex_to_text(currency)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def validate_symbol_to_hex(symbol: str) -> str:
+    """return the currency code of a symbol"""
+    return text_to_hex(symbol)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def is_lp_token(currency: str) -> bool:
+    """true for the amm lp token codes `xWallet.account_tokens` leaves out"""
+    return isinstance(is_hex(currency), Exception)
+
+
+def cache_stats() -> dict:
+    """return the hits, misses, size and hit rate of each conversion cache"""
+    stats = {}
+    for function in (validate_hex_to_symbol, validate_symbol_to_hex, is_lp_token):
+        info = function.cache_info()
+        lookups = info.hits + info.misses
+        stats[function.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0}
+    return stats
+
+
+def cache_clear() -> None:
+    for function in (validate_hex_to_symbol, validate_symbol_to_hex, is_lp_token):
+        function.cache_clear()
@@ -1,15 +1,20 @@
 import asyncio
 from typing import Union
 
+import numpy as np
 from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
 from xrpl.models import (XRP, AccountOffers, AMMCreate, AMMVote, BookOffers,
                          IssuedCurrency, IssuedCurrencyAmount, OfferCreate,
                          OfferCreateFlag, AuthAccount, AMMBid, OfferCancel)
-from xrpl.utils import drops_to_xrp, xrp_to_drops
 
-from Misc import (amm_fee_to_xrp_format, mm,
-                  validate_hex_to_symbol)
+from Amount import model_amount, normalize, parse_value, xAmount
+from Currency import validate_hex_to_symbol
+from Flags import OFFER_OBJECT_CODEC
+from Misc import amm_fee_to_xrp_format, mm
 from Objects import xObject
+from Records import creator_liquidity, xOffer
+from Transport import x_client
 from x_constants import M_SOURCE_TAG
 
 """
@@ -20,9 +25,100 @@ Manages AMM and order book objects
 Call order book swaps Non determinstic swap (sounds cool)
 """
 
+def quality_key(quality: str) -> tuple:
+    """return (exponent, mantissa) of a BookOffers `quality` with the mantissa scaled to 16 digits,
+    ordering these pairs orders the qualities exactly"""
+    mantissa, exponent = normalize(*parse_value(quality))
+    return (exponent, mantissa)
+
+
+def amount_value(amount: Union[str, dict]) -> float:
+    """xrp (drops) or token amount as a number of units"""
+    return float(xAmount.from_xrpl(amount))
+
+
+def owner_funds_value(offer: dict) -> float:
+    """the `owner_funds` of a BookOffers offer as a number of its TakerGets units, nan when not reported"""
+    if "owner_funds" not in offer:
+        return np.nan
+    if isinstance(offer["TakerGets"], str):
+        return amount_value(offer["owner_funds"])
+    return amount_value({**offer["TakerGets"], "value": offer["owner_funds"]})
+
+
+class xBook:
+    def __init__(self, offers: list, bids: bool = False) -> None:
+        """`offers` as returned by BookOffers, ordered best first by exact quality\n
+        asks are priced in TakerPays per TakerGets and sized in TakerGets,
+        `bids` are priced in TakerGets per TakerPays and sized in TakerPays, so both sides of a pair share units\n
+        prices are the quoted ones, sizes are what the owner can fund when rippled reports less than the offer,
+        so an unfunded offer is a level of size 0 that adds nothing to depth or cost"""
+        keys = [quality_key(offer["quality"]) for offer in offers]
+        exponents = np.array([key[0] for key in keys], dtype=np.int64)
+        mantissas = np.array([key[1] for key in keys], dtype=np.int64)
+        # lowest TakerPays/TakerGets is best for the taker on both sides
+        order = np.lexsort((mantissas, exponents))
+        self.bids = bids
+        self.offers = [offers[index] for index in order]
+        gets = np.array([amount_value(offer["TakerGets"]) for offer in self.offers], dtype=np.float64)
+        pays = np.array([amount_value(offer["TakerPays"]) for offer in self.offers], dtype=np.float64)
+        self.owner_funds = np.array([owner_funds_value(offer) for offer in self.offers], dtype=np.float64)
+        numerator, denominator = (gets, pays) if bids else (pays, gets)
+        self.price = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+        if bids:
+            self.size = np.array([amount_value(offer.get("taker_pays_funded", offer["TakerPays"])) for offer in self.offers], dtype=np.float64)
+        else:
+            self.size = np.array([amount_value(offer.get("taker_gets_funded", offer["TakerGets"])) for offer in self.offers], dtype=np.float64)
+        self.depth = np.cumsum(self.size)
+        self.cost = np.cumsum(self.price * self.size)
+
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    def best(self) -> float:
+        """return the best price with something behind it, None for an empty or unfunded book"""
+        funded = np.flatnonzero(self.size > 0)
+        return float(self.price[funded[0]]) if len(funded) else None
+
+    def vwap(self, size: float) -> float:
+        """return the average price of filling `size` from the top of the book, None if the book is not deep enough"""
+        if not len(self.offers) or size <= 0 or size > self.depth[-1]:
+            return None
+        index = int(np.searchsorted(self.depth, size))
+        filled = self.depth[index - 1] if index else 0.0
+        cost = self.cost[index - 1] if index else 0.0
+        return float((cost + (size - filled) * self.price[index]) / size)
+
+    def depth_at(self, price: float) -> float:
+        """return the size available at `price` or better"""
+        if self.bids:
+            return float(self.size[self.price >= price].sum())
+        return float(self.size[self.price <= price].sum())
+
+
+def book_offer_record(offer: dict) -> dict:
+    """a BookOffers offer in the shape `xOrderBook.sort_best_offer` returns"""
+    of = {}
+    of["creator"] = offer["Account"]
+    of["offer_id"] = offer["index"]
+    of["flags"] = offer["Flags"]
+    of["sequence"] = offer["Sequence"] # offer id
+    of["rate"] = offer["quality"]
+    of["creator_liquidity"] = creator_liquidity(offer) # available amount the offer creator of `sell_token` is currently holding
+    pays = xAmount.from_xrpl(offer["TakerPays"])
+    gets = xAmount.from_xrpl(offer["TakerGets"])
+    of["buy_token"] = "XRP" if pays.is_xrp() else validate_hex_to_symbol(pays.currency)
+    of["buy_issuer"] = pays.issuer
+    of["buy_amount"] = pays.value()
+    of["sell_token"] = "XRP" if gets.is_xrp() else validate_hex_to_symbol(gets.currency)
+    of["sell_issuer"] = gets.issuer
+    of["sell_amount"] = gets.value()
+    return of
+
 class xOrderBook(AsyncJsonRpcClient):
-    def __init__(self, url: str):
-        self.client = AsyncJsonRpcClient(url) 
+    def __init__(self, url: Union[str, AsyncJsonRpcClient]) -> None:
+        """`url` is a node url or a shared `Transport.xTransport`"""
+        self.client = x_client(url)
 
     async def get_account_order_book_liquidity(self, wallet_addr: str) -> list:
         """return all offers that are liquidity an account created"""
@@ -34,135 +130,62 @@ class xOrderBook(AsyncJsonRpcClient):
         if "offers" in result:
             offers = result["offers"]
             for offer in offers:
-                if 0x00010000 & offer["flags"] == 0x00010000:
-                    of = {}
-                    of["flags"] = offer["flags"]
-                    of["sequence"] = offer["seq"]
-                    of["quality"] = offer["quality"]# str(drops_to_xrp(offer["quality"])) # rate is subject to error from the blockchain because xrp returned in this call has no decimal  # The exchange rate of the offer, as the ratio of the original taker_pays divided by the original taker_gets. rate = pay/get
-                    if isinstance(offer["taker_pays"], dict):
-                        of["buy_token"] = validate_hex_to_symbol(offer["taker_pays"]["currency"])
-                        of["buy_issuer"] = offer["taker_pays"]["issuer"]
-                        of["buy_amount"] = offer["taker_pays"]["value"]
-                    elif isinstance(offer["taker_pays"], str):
-                        of["buy_token"] = "XRP"
-                        of["buy_issuer"] = ""
-                        of["buy_amount"] = str(drops_to_xrp(offer["taker_pays"]))
-                    if isinstance(offer["taker_gets"], dict):
-                        of["sell_token"] = validate_hex_to_symbol(offer["taker_gets"]["currency"])
-                        of["sell_issuer"] = offer["taker_gets"]["issuer"]
-                        of["sell_amount"] = offer["taker_gets"]["value"]
-                    elif isinstance(offer["taker_gets"], str):
-                        of["sell_token"] = "XRP"
-                        of["sell_issuer"] = ""
-                        of["sell_amount"] = str(drops_to_xrp(offer["taker_gets"]))
-                    of["rate"] = float(of["sell_amount"])/float(of["buy_amount"])
-                    offer_list.append(of)
+                if OFFER_OBJECT_CODEC.has(offer["flags"], "lsfPassive"):
+                    offer_list.append(xOffer.from_account_offer(offer).to_dict())
         return offer_list
         
     async def sort_best_offer(self, buy: Union[XRP, IssuedCurrency], sell: Union[XRP, IssuedCurrency], best_buy: bool = False, best_sell: bool = False) -> dict:
         """return all available orders and best {option} first, choose either best_buy or best_sell"""
         best = {}
-
-        if best_sell:
-            req = BookOffers(taker_gets=sell, taker_pays=buy, ledger_index="validated")
-            response = await self.client.request(req)
-            result = response.result
-            if "offers" in result:
-                offers: list = result["offers"]
-                # sort offer list and return highest rate first
-                offers.sort(key=lambda object: object["quality"], reverse=True)
-                index = 0
-                for offer in offers:
-                    of = {}
-                    of["creator"] = offer["Account"]
-                    of["offer_id"] = offer["index"]
-                    of["flags"] = offer["Flags"]
-                    of["sequence"] = offer["Sequence"] # offer id
-                    of["rate"] = offer["quality"]
-                    of["creator_liquidity"] = ""
-                    if "owner_funds" in offer:
-                        of["creator_liquidity"] = offer["owner_funds"] # available amount the offer creator of `sell_token` is currently holding
-                    if isinstance(offer["TakerPays"], dict):
-                        of["buy_token"] = validate_hex_to_symbol(offer["TakerPays"]["currency"])
-                        of["buy_issuer"] = offer["TakerPays"]["issuer"]
-                        of["buy_amount"] = offer["TakerPays"]["value"]
-                    elif isinstance(offer["TakerPays"], str):
-                        of["buy_token"] = "XRP"
-                        of["buy_issuer"] = ""
-                        of["buy_amount"] = str(drops_to_xrp(offer["TakerPays"]))
-
-                    if isinstance(offer["TakerGets"], dict):
-                        of["sell_token"] = validate_hex_to_symbol(offer["TakerGets"]["currency"])
-                        of["sell_issuer"] = offer["TakerGets"]["issuer"]
-                        of["sell_amount"] = offer["TakerGets"]["value"]
-                    elif isinstance(offer["TakerGets"], str):
-                        of["sell_token"] = "XRP"
-                        of["sell_issuer"] = ""
-                        of["sell_amount"] = str(drops_to_xrp(offer["TakerGets"]))                    
-                    index += 1
-                    best[index] = of
-
-        if best_buy:
+        if best_sell or best_buy:
             req = BookOffers(taker_gets=sell, taker_pays=buy, ledger_index="validated")
             response = await self.client.request(req)
             result = response.result
             if "offers" in result:
-                offers: list = result["offers"]
-                # sort offer list and return lowest rate first
-                offers.sort(key=lambda object: object["quality"])
-                index = 0
-                for offer in offers:
-                    of = {}
-                    of["creator"] = offer["Account"]
-                    of["offer_id"] = offer["index"]
-                    of["flags"] = offer["Flags"]
-                    of["sequence"] = offer["Sequence"] # offer id
-                    of["rate"] = offer["quality"]
-                    of["creator_liquidity"] = ""
-                    if "owner_funds" in offer:
-                        of["creator_liquidity"] = offer["owner_funds"] # available amount the offer creator is currently holding
-                    if isinstance(offer["TakerPays"], dict):
-                        of["buy_token"] = validate_hex_to_symbol(offer["TakerPays"]["currency"])
-                        of["buy_issuer"] = offer["TakerPays"]["issuer"]
-                        of["buy_amount"] = offer["TakerPays"]["value"]
-                    elif isinstance(offer["TakerPays"], str):
-                        of["buy_token"] = "XRP"
-                        of["buy_issuer"] = ""
-                        of["buy_amount"] = str(drops_to_xrp(offer["TakerPays"]))
-
-                    if isinstance(offer["TakerGets"], dict):
-                        of["sell_token"] = validate_hex_to_symbol(offer["TakerGets"]["currency"])
-                        of["sell_issuer"] = offer["TakerGets"]["issuer"]
-                        of["sell_amount"] = offer["TakerGets"]["value"]
-                    elif isinstance(offer["TakerGets"], str):
-                        of["sell_token"] = "XRP"
-                        of["sell_issuer"] = ""
-                        of["sell_amount"] = str(drops_to_xrp(offer["TakerGets"]))                    
-                    index += 1
-                    best[index] = of
+                offers = xBook(result["offers"]).offers
+                # best_buy returns lowest rate first, best_sell highest rate first
+                if not best_buy:
+                    offers = offers[::-1]
+                for index, offer in enumerate(offers, 1):
+                    best[index] = book_offer_record(offer)
         return best
 
+    async def book(self, base: Union[XRP, IssuedCurrency], quote: Union[XRP, IssuedCurrency], limit: int = None) -> dict:
+        """return both sides of a pair priced in `quote` per `base` and sized in `base`, with best bid, best ask and spread\n
+        raises `XRPLRequestFailureException` when the node returns an error for either side"""
+        asks_response, bids_response = await asyncio.gather(
+            self.client.request(BookOffers(taker_gets=base, taker_pays=quote, ledger_index="validated", limit=limit)),
+            self.client.request(BookOffers(taker_gets=quote, taker_pays=base, ledger_index="validated", limit=limit)))
+        for response in (asks_response, bids_response):
+            if not response.is_successful():
+                raise XRPLRequestFailureException(response.result)
+        asks = xBook(asks_response.result.get("offers", []))
+        bids = xBook(bids_response.result.get("offers", []), bids=True)
+        best_ask = asks.best()
+        best_bid = bids.best()
+        return {
+            "asks": asks,
+            "bids": bids,
+            "best_ask": best_ask,
+            "best_bid": best_bid,
+            "spread": best_ask - best_bid if best_ask is not None and best_bid is not None else None}
+
 def cancel_offer(sender_addr: str, offer_seq: int, fee: str = None) -> dict:
     """cancel an offer"""
     txn = OfferCancel(account=sender_addr, offer_sequence=offer_seq, fee=fee, memos=mm, source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
-def create_order_book_liquidity(sender_addr: str, buy: Union[float, IssuedCurrencyAmount], sell: Union[float, IssuedCurrencyAmount], expiry_date: int = None, fee: str = None) -> dict:
+def create_order_book_liquidity(sender_addr: str, buy: Union[float, xAmount, IssuedCurrencyAmount], sell: Union[float, xAmount, IssuedCurrencyAmount], expiry_date: int = None, fee: str = None) -> dict:
     """create an offer as passive; it doesn't immediately consume offers that match it, just stays on the ledger as an object for liquidity"""
     flags = [OfferCreateFlag.TF_PASSIVE]
     tx_dict = {}
-    if isinstance(buy, float) and isinstance(sell, IssuedCurrencyAmount): # check if give == xrp and get == asset
-        txn = OfferCreate(account=sender_addr, taker_pays=xrp_to_drops(buy), taker_gets=sell, flags=flags, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
-        tx_dict = txn.to_xrpl()
-    if isinstance(buy, IssuedCurrencyAmount) and isinstance(sell, float): # check if give == asset and get == xrp
-        txn = OfferCreate(account=sender_addr, taker_pays=buy, taker_gets=xrp_to_drops(sell), flags=flags, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
-        tx_dict = txn.to_xrpl()
-    if isinstance(buy, IssuedCurrencyAmount) and isinstance(sell, IssuedCurrencyAmount): # check if give and get are == asset
-        txn = OfferCreate(account=sender_addr, taker_pays=buy, taker_gets=sell, flags=flags, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    taker_pays, taker_gets = model_amount(buy), model_amount(sell)
+    if isinstance(taker_pays, IssuedCurrencyAmount) or isinstance(taker_gets, IssuedCurrencyAmount): # xrp for a token, a token for xrp or a token for a token
+        txn = OfferCreate(account=sender_addr, taker_pays=taker_pays, taker_gets=taker_gets, flags=flags, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
         tx_dict = txn.to_xrpl()
     return tx_dict
 
-def order_book_swap(sender_addr: str, buy: Union[float, IssuedCurrencyAmount], sell: Union[float, IssuedCurrencyAmount], tf_sell: bool = False, tf_fill_or_kill: bool = False, tf_immediate_or_cancel: bool = False, fee: str = None) -> dict:
+def order_book_swap(sender_addr: str, buy: Union[float, xAmount, IssuedCurrencyAmount], sell: Union[float, xAmount, IssuedCurrencyAmount], tf_sell: bool = False, tf_fill_or_kill: bool = False, tf_immediate_or_cancel: bool = False, fee: str = None) -> dict:
     """create an offer that either matches with existing offers to get entire sell amount or cancels\n
     if swap_all is enabled, this will force exchange all the paying units regardless of profit or loss\n
 
@@ -176,14 +199,9 @@ def order_book_swap(sender_addr: str, buy: Union[float, IssuedCurrencyAmount], s
     if tf_immediate_or_cancel:
         flags.append(OfferCreateFlag.TF_IMMEDIATE_OR_CANCEL)
     tx_dict = {}
-    if isinstance(buy, float) and isinstance(sell, IssuedCurrencyAmount): # check if give == xrp and get == asset
-        txn = OfferCreate(account=sender_addr, taker_pays=xrp_to_drops(buy), taker_gets=sell, flags=flags, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
-        tx_dict = txn.to_xrpl()
-    if isinstance(buy, IssuedCurrencyAmount) and isinstance(sell, float): # check if give == asset and get == xrp
-        txn = OfferCreate(account=sender_addr, taker_pays=buy, taker_gets=xrp_to_drops(sell), flags=flags, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
-        tx_dict = txn.to_xrpl()
-    if isinstance(buy, IssuedCurrencyAmount) and isinstance(sell, IssuedCurrencyAmount): # check if give and get are == asset
-        txn = OfferCreate(account=sender_addr, taker_pays=buy, taker_gets=sell, flags=flags, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    taker_pays, taker_gets = model_amount(buy), model_amount(sell)
+    if isinstance(taker_pays, IssuedCurrencyAmount) or isinstance(taker_gets, IssuedCurrencyAmount): # xrp for a token, a token for xrp or a token for a token
+        txn = OfferCreate(account=sender_addr, taker_pays=taker_pays, taker_gets=taker_gets, flags=flags, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
         tx_dict = txn.to_xrpl()
     return tx_dict
 
@@ -192,10 +210,10 @@ def order_book_swap(sender_addr: str, buy: Union[float, IssuedCurrencyAmount], s
 """The AMM ERA is here"""
 
 """Liquidity providers can vote to set the fee from 0% to 1%, in increments of 0.%."""
-def create_amm(sender_addr: str, token_1: Union[float, IssuedCurrencyAmount], token_2: Union[float, IssuedCurrencyAmount], trading_fee: float, fee: str = None) -> dict:
+def create_amm(sender_addr: str, token_1: Union[float, xAmount, IssuedCurrencyAmount], token_2: Union[float, xAmount, IssuedCurrencyAmount], trading_fee: float, fee: str = None) -> dict:
     """create a liquidity pool for asset pairs if one doesnt already exist"""      
-    token1 = xrp_to_drops(token_1) if isinstance(token_1, float) else token_1
-    token2 = xrp_to_drops(token_2) if isinstance(token_2, float) else token_2
+    token1 = model_amount(token_1)
+    token2 = model_amount(token_2)
     txn = AMMCreate(
         account=sender_addr,
         amount=token1,
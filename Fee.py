@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from typing import Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.models.requests import Fee
+
+from Transport import x_client
+
+"""
+Fee oracle
+
+Keeps the node's fee levels cached and answers builders without a round trip,
+pass `xFeeOracle.fee()` as the `fee=` of any builder or hand the oracle to `xWallet`
+"""
+
+logger = logging.getLogger(__name__)
+
+LEVELS = {"minimum": "minimum_fee", "open": "open_ledger_fee", "median": "median_fee"}
+
+
+class xFeeOracle:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], policy: str = "open", interval: float = 4.0,
+        escalation: float = 1.5, queue_pressure: float = 0.5, max_fee: int = 2000000) -> None:
+        """`policy` picks the drops level served, "minimum", "open" (open ledger) or "median"\n
+        when the queue is more than `queue_pressure` full the fee is multiplied by `escalation`\n
+        fees are capped at `max_fee` drops and refreshed every `interval` seconds, ledgers close every ~4s"""
+        if policy not in LEVELS:
+            raise ValueError(f"policy must be one of {tuple(LEVELS)}")
+        self.client = x_client(url)
+        self.policy = policy
+        self.interval = interval
+        self.escalation = escalation
+        self.queue_pressure = queue_pressure
+        self.max_fee = max_fee
+        self.levels = {}
+        self.refreshed = 0.0
+        self.last_error = None # the error of the last failed refresh, None once a refresh succeeds
+        self.errors = 0
+        self.lock = None
+        self.task = None
+
+    def fee(self) -> Union[str, None]:
+        """return the cached fee in drops, None before the first refresh"""
+        if not self.levels:
+            return None
+        drops = self.levels[LEVELS[self.policy]]
+        if self.levels["max_queue_size"] and self.levels["current_queue_size"] / self.levels["max_queue_size"] > self.queue_pressure:
+            drops = int(drops * self.escalation)
+        return str(min(drops, self.max_fee))
+
+    async def refresh(self) -> Union[str, None]:
+        """ask the node for the current fee levels, an error response is kept in `last_error` and the last known fee served"""
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            response = await self.client.request(Fee())
+            result = response.result
+            if "drops" in result:
+                self.levels = {
+                    **{key: int(value) for key, value in result["drops"].items()},
+                    "current_queue_size": int(result.get("current_queue_size", 0)),
+                    "max_queue_size": int(result.get("max_queue_size", 0)),
+                    "ledger_current_index": result.get("ledger_current_index")}
+                self.refreshed = time.monotonic()
+                self.last_error = None
+            else:
+                self.last_error = result
+                self.errors += 1
+        return self.fee()
+
+    async def get(self) -> Union[str, None]:
+        """return the cached fee, refreshing first when older than `interval`, None if the node never answered"""
+        if not self.levels or time.monotonic() - self.refreshed >= self.interval:
+            return await self.refresh()
+        return self.fee()
+
+    async def on_ledger(self, message: dict) -> None:
+        """refresh on every ledger close, use as `xStream.run(on_ledger=oracle.on_ledger)`"""
+        await self.refresh()
+
+    async def run(self) -> None:
+        """refresh every `interval` seconds until cancelled"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as error:
+                # keep serving the last known fee
+                self.last_error = error
+                self.errors += 1
+                logger.warning("fee refresh failed: %r", error)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """refresh in the background on the running event loop"""
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
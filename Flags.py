@@ -1,6 +1,7 @@
 from xrpl.models import AccountSet, AccountSetAsfFlag
 from Misc import mm
-from x_constants import M_SOURCE_TAG
+from x_constants import (ACCOUNT_ROOT_FLAGS, M_SOURCE_TAG, NFTOKEN_FLAGS, NFTOKEN_OFFER_FLAGS,
+                         OFFER_FLAGS, OFFER_OBJECT_FLAGS, PAYMENT_FLAGS)
 
 # Read More
 # https://xrpl.org/accountset.html#accountset-flags
@@ -130,4 +131,52 @@ def enable_clawback(sender_addr: str, state: bool = False, fee: str = None) -> d
     txn = AccountSet(account=sender_addr, clear_flag=AccountSetAsfFlag.ASF_ALLOW_TRUSTLINE_CLAWBACK, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     if state:
         txn = AccountSet(account=sender_addr, set_flag=AccountSetAsfFlag.ASF_ALLOW_TRUSTLINE_CLAWBACK, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
-    return txn.to_xrpl()
\ No newline at end of file
+    return txn.to_xrpl()
+
+
+
+# Flag codecs
+# decode a `Flags` integer into flag names and encode names back, one step per set bit
+class xFlagCodec:
+    def __init__(self, table: list) -> None:
+        """`table` is one of the `x_constants` flag tables, every "decimal" must match its "hex" """
+        self.bits = {}
+        self.names = {}
+        self.decoded = {}
+        for flag in table:
+            if flag["decimal"] != flag["hex"]:
+                raise ValueError(f'{flag["flagname"]}: decimal {flag["decimal"]} does not match hex {flag["hex"]:#010x}')
+            self.bits[flag["flagname"]] = flag["hex"]
+            self.names[flag["hex"]] = flag["flagname"]
+
+    def decode(self, flags: int) -> tuple:
+        """return the names of the flags set, unknown bits as hex"""
+        names = self.decoded.get(flags)
+        if names is None:
+            found = []
+            remaining = flags
+            while remaining:
+                bit = remaining & -remaining
+                found.append(self.names.get(bit, f"{bit:#010x}"))
+                remaining ^= bit
+            # few distinct combinations exist, so decoded names are kept and shared
+            names = self.decoded[flags] = tuple(found)
+        return names
+
+    def encode(self, names: list) -> int:
+        """return the `Flags` integer for flag names"""
+        flags = 0
+        for name in names:
+            flags |= self.bits[name]
+        return flags
+
+    def has(self, flags: int, name: str) -> bool:
+        return flags & self.bits[name] != 0
+
+
+ACCOUNT_ROOT_CODEC = xFlagCodec(ACCOUNT_ROOT_FLAGS)
+NFTOKEN_CODEC = xFlagCodec(NFTOKEN_FLAGS)
+NFTOKEN_OFFER_CODEC = xFlagCodec(NFTOKEN_OFFER_FLAGS)
+OFFER_CODEC = xFlagCodec(OFFER_FLAGS) # OfferCreate transaction flags
+OFFER_OBJECT_CODEC = xFlagCodec(OFFER_OBJECT_FLAGS) # Offer ledger object flags
+PAYMENT_CODEC = xFlagCodec(PAYMENT_FLAGS)
@@ -0,0 +1,111 @@
+import sqlite3
+from datetime import datetime
+from typing import Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.ledger import get_latest_validated_ledger_sequence
+from xrpl.utils import datetime_to_ripple_time
+
+from Wallet import payment_record, xWallet
+
+"""
+Local payment history
+
+Parsed payments are stored in sqlite keyed by (account, tx hash) with the ledger index and ripple time they closed in,
+a sync only asks the node for ledgers newer than the last one synced for that account
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    account TEXT NOT NULL,
+    txid TEXT NOT NULL,
+    ledger_index INTEGER NOT NULL,
+    date INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    token TEXT NOT NULL,
+    issuer TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    fee TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    result TEXT NOT NULL,
+    tx_type TEXT NOT NULL,
+    PRIMARY KEY (account, txid)
+);
+CREATE INDEX IF NOT EXISTS payments_account_date ON payments (account, date);
+CREATE INDEX IF NOT EXISTS payments_account_ledger ON payments (account, ledger_index);
+CREATE TABLE IF NOT EXISTS synced (
+    account TEXT PRIMARY KEY,
+    ledger_index INTEGER NOT NULL
+);
+"""
+
+PAYMENT_FIELDS = ("sender", "receiver", "token", "issuer", "amount", "fee", "timestamp", "result", "txid", "tx_type")
+
+
+class xHistory:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], path: str = "history.sqlite3", batch_size: int = 1000) -> None:
+        """`url` is a node url or a shared `Transport.xTransport`, `path` is the sqlite file"""
+        self.wallet = xWallet(url)
+        self.batch_size = batch_size
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def last_synced_ledger(self, wallet_addr: str) -> int:
+        """return the newest validated ledger the stored history of an account covers, -1 if never synced"""
+        row = self.db.execute("SELECT ledger_index FROM synced WHERE account = ?", (wallet_addr,)).fetchone()
+        return row["ledger_index"] if row else -1
+
+    async def sync(self, wallet_addr: str, limit: int = 200) -> int:
+        """store every payment of an account closed since the last sync, returns how many were added\n
+        the sync mark only moves once every new ledger has been read, a node error raises out of the sync and
+        leaves the mark where it was, so the next sync redoes the whole range (rows already stored are kept once)"""
+        last = self.last_synced_ledger(wallet_addr)
+        validated = await get_latest_validated_ledger_sequence(self.wallet.client)
+        if last >= validated:
+            return 0
+        added = 0
+        rows = []
+        try:
+            async for transaction in self.wallet.iter_account_tx(wallet_addr, limit, last + 1, validated):
+                if transaction["tx"]["TransactionType"] == "Payment":
+                    payment = payment_record(transaction)
+                    rows.append((wallet_addr, transaction["tx"]["ledger_index"], transaction["tx"]["date"], *[payment[field] for field in PAYMENT_FIELDS]))
+                    if len(rows) >= self.batch_size:
+                        added += self._insert(rows)
+                        rows = []
+        finally:
+            # keep what was read either way, the payments table ignores duplicates on the redo
+            added += self._insert(rows)
+        # only reached when every page up to `validated` was read
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO synced (account, ledger_index) VALUES (?, ?)", (wallet_addr, validated))
+        return added
+
+    def _insert(self, rows: list) -> int:
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO payments (account, ledger_index, date, sender, receiver, token, issuer, amount, fee, timestamp, result, txid, tx_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            return self.db.total_changes - before
+
+    def payments(self, wallet_addr: str, start: datetime = None, end: datetime = None, token: str = None) -> list:
+        """return stored payments of an account newest first, optionally between two dates and for one token"""
+        query = "SELECT * FROM payments WHERE account = ?"
+        params = [wallet_addr]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(datetime_to_ripple_time(start))
+        if end is not None:
+            query += " AND date <= ?"
+            params.append(datetime_to_ripple_time(end))
+        if token is not None:
+            query += " AND token = ?"
+            params.append(token)
+        query += " ORDER BY ledger_index DESC, date DESC"
+        return [{field: row[field] for field in PAYMENT_FIELDS} for row in self.db.execute(query, params)]
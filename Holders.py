@@ -0,0 +1,205 @@
+import csv
+import json
+import os
+import time
+from typing import Callable, Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+
+from Currency import validate_hex_to_symbol
+from Wallet import xWallet
+
+"""
+Holder export
+
+Pages every trust line of an issuer with `xWallet.iter_account_lines` and streams one row per holder to
+a csv file, a parquet dataset or a callback, only a page (and the sink's buffer) is held in memory.
+After every `checkpoint_pages` pages the sink is flushed and the marker saved, so an interrupted export
+resumes from the last checkpoint on the same ledger, the state is only removed once the last page was read.
+Node errors raise out of the export with the state kept, so running it again resumes
+"""
+
+COLUMNS = ("holder", "currency", "balance", "limit", "freeze", "no_ripple")
+
+
+def holder_row(line: dict) -> tuple:
+    """a trust line of the issuer as (holder, currency, balance, limit, freeze, no_ripple) from the holder's side\n
+    the issuer sees the balances it owes as negative, `freeze` is the issuer's freeze, `no_ripple` the holder's flag"""
+    balance = line["balance"]
+    balance = balance[1:] if balance.startswith("-") else ("-" + balance if balance != "0" else balance)
+    return (line["account"], validate_hex_to_symbol(line["currency"]), balance, line["limit_peer"],
+        line.get("freeze", False), line.get("no_ripple_peer", False))
+
+
+class CsvSink:
+    def __init__(self, path: str) -> None:
+        """rows are appended to `path`, a header is written when it is new"""
+        self.path = path
+        self.file = None
+        self.writer = None
+
+    def open(self, position: Union[int, None]) -> None:
+        """open for writing, dropping whatever was written after `position` (a byte offset from `flush`)"""
+        new = position is None or not os.path.exists(self.path)
+        self.file = open(self.path, "w" if new else "r+", newline="")
+        if not new:
+            self.file.seek(position)
+            self.file.truncate()
+        self.writer = csv.writer(self.file)
+        if new:
+            self.writer.writerow(COLUMNS)
+
+    def write(self, rows: list) -> None:
+        self.writer.writerows(rows)
+
+    def flush(self) -> int:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ParquetSink:
+    def __init__(self, path: str, rows_per_file: int = 100000) -> None:
+        """rows are written to `path` as a directory of parquet files of up to `rows_per_file` rows, needs pyarrow"""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("ParquetSink needs pyarrow, pip install pyarrow") from error
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.rows_per_file = rows_per_file
+        self.schema = pyarrow.schema([
+            ("holder", pyarrow.string()), ("currency", pyarrow.string()), ("balance", pyarrow.string()),
+            ("limit", pyarrow.string()), ("freeze", pyarrow.bool_()), ("no_ripple", pyarrow.bool_())])
+        self.rows = []
+        self.part = 0
+
+    def open(self, position: Union[int, None]) -> None:
+        """`position` is the number of files written before the checkpoint, later ones are dropped"""
+        os.makedirs(self.path, exist_ok=True)
+        self.part = position or 0
+        for name in os.listdir(self.path):
+            if name.startswith("part-") and name.endswith(".parquet") and int(name[5:-8]) >= self.part:
+                os.remove(os.path.join(self.path, name))
+
+    def write(self, rows: list) -> None:
+        self.rows += rows
+        if len(self.rows) >= self.rows_per_file:
+            self.flush()
+
+    def flush(self) -> int:
+        if self.rows:
+            table = self.pa.Table.from_arrays([self.pa.array(column) for column in zip(*self.rows)], schema=self.schema)
+            self.pq.write_table(table, os.path.join(self.path, f"part-{self.part:05d}.parquet"))
+            self.part += 1
+            self.rows = []
+        return self.part
+
+    def close(self) -> None:
+        self.flush()
+
+
+class CallbackSink:
+    def __init__(self, callback: Callable[[list], None]) -> None:
+        """`callback` gets every page of rows, pages after the last checkpoint are delivered again on resume"""
+        self.callback = callback
+
+    def open(self, position: Union[int, None]) -> None:
+        pass
+
+    def write(self, rows: list) -> None:
+        self.callback(rows)
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class xHolderExport:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], issuer: str, page_size: int = 400, state_path: str = None,
+        checkpoint_pages: int = 25) -> None:
+        """exports the holders of `issuer`, `page_size` trust lines per request (the node may cap it)\n
+        the resume state is kept in `state_path` when given and removed once the export completes"""
+        self.wallet = xWallet(url)
+        self.client = self.wallet.client
+        self.issuer = issuer
+        self.page_size = page_size
+        self.state_path = state_path
+        self.checkpoint_pages = checkpoint_pages
+
+    def load_state(self) -> Union[dict, None]:
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as file:
+            state = json.load(file)
+        return state if state.get("issuer") == self.issuer else None
+
+    def save_state(self, state: dict) -> None:
+        if self.state_path is None:
+            return
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.state_path)
+
+    async def export(self, sink: Union[CsvSink, ParquetSink, CallbackSink, Callable[[list], None]]) -> dict:
+        """stream every holder row into `sink`, a plain callable is wrapped in `CallbackSink`\n
+        returns the rows and pages exported (resumed ones included), the ledger read and the rows/sec of this run"""
+        if not hasattr(sink, "write"):
+            sink = CallbackSink(sink)
+        state = self.load_state() or {"issuer": self.issuer, "marker": None, "ledger_index": "validated", "rows": 0, "pages": 0, "position": None}
+        started = time.perf_counter()
+        resumed_rows = state["rows"]
+        complete = False
+        sink.open(state["position"])
+        try:
+            async for page in self.wallet.iter_account_lines(self.issuer, self.page_size, state["marker"], state["ledger_index"]):
+                rows = [holder_row(line) for line in page["lines"]]
+                sink.write(rows)
+                state["rows"] += len(rows)
+                state["pages"] += 1
+                state["marker"] = page["marker"]
+                state["ledger_index"] = page["ledger_index"]
+                if page["marker"] is None:
+                    complete = True
+                elif state["pages"] % self.checkpoint_pages == 0:
+                    state["position"] = sink.flush()
+                    self.save_state(state)
+            sink.flush()
+        except XRPLRequestFailureException as error:
+            # a marker is only valid on its own ledger, once the node no longer has it the export cannot continue
+            if error.error == "lgrNotFound" and state["marker"] is not None:
+                if self.state_path is not None and os.path.exists(self.state_path):
+                    os.remove(self.state_path)
+                raise RuntimeError(f"ledger {state['ledger_index']} the export is pinned to is no longer on the node, "
+                    "restart required: the resume state was dropped, export again") from error
+            raise
+        finally:
+            sink.close()
+        if not complete:
+            raise RuntimeError(f"holder export of {self.issuer} ended before the last page")
+        if self.state_path is not None and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        seconds = time.perf_counter() - started
+        return {
+            "rows": state["rows"],
+            "pages": state["pages"],
+            "ledger_index": state["ledger_index"],
+            "seconds": seconds,
+            "rows_per_second": (state["rows"] - resumed_rows) / seconds if seconds else 0.0}
+
+    async def to_csv(self, path: str) -> dict:
+        return await self.export(CsvSink(path))
+
+    async def to_parquet(self, path: str, rows_per_file: int = 100000) -> dict:
+        return await self.export(ParquetSink(path, rows_per_file))
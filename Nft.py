@@ -1,15 +1,15 @@
-import asyncio
 from typing import Union
 from xrpl.asyncio.clients import AsyncJsonRpcClient
-import requests
-from xrpl.clients import JsonRpcClient
-from xrpl.models import (AccountObjects, IssuedCurrencyAmount, NFTBuyOffers,
+from xrpl.models import (IssuedCurrencyAmount, NFTBuyOffers,
                          NFTokenAcceptOffer, NFTokenCancelOffer,
                          NFTokenCreateOffer, NFTokenCreateOfferFlag,
                          NFTSellOffers)
-from xrpl.utils import drops_to_xrp, ripple_time_to_datetime, xrp_to_drops
+from xrpl.utils import ripple_time_to_datetime
 
+from Amount import to_drops, xrp_string
 from Misc import mm
+from Objects import iter_account_objects, nft_offer_record
+from Transport import x_client
 from x_constants import M_SOURCE_TAG
 
 """nft handler"""
@@ -20,7 +20,7 @@ def create_sell_offer(sender_addr: str, nftoken_id: str, get: Union[float, Issue
     """create an nft sell offer, receiver is the account you want to match this offer"""
     amount = get
     if isinstance(get, float):
-        amount = xrp_to_drops(get)
+        amount = to_drops(get)
     txn = NFTokenCreateOffer(
         account=sender_addr,
         nftoken_id=nftoken_id,
@@ -37,7 +37,7 @@ def create_buy_offer(sender_addr: str, nftoken_id: str, give: Union[float, Issue
     """create an nft buy offer, receiver is the account you want to match this offer"""
     amount = give
     if isinstance(give, float):
-        amount = xrp_to_drops(give)
+        amount = to_drops(give)
     txn = NFTokenCreateOffer(
         account=sender_addr,
         nftoken_id=nftoken_id,
@@ -57,7 +57,7 @@ def accept_nft_offer(sender_addr: str, sell_offer_id: str = None, buy_offer_id:
     """accept an nft sell or buy offer, or both simultaneously and charge a fee"""
     amount = broker_fee
     if isinstance(broker_fee, float):
-        amount = xrp_to_drops(broker_fee)
+        amount = to_drops(broker_fee)
     txn = NFTokenAcceptOffer(
         account=sender_addr,
         nftoken_buy_offer=buy_offer_id,
@@ -66,40 +66,18 @@ def accept_nft_offer(sender_addr: str, sell_offer_id: str = None, buy_offer_id:
     return txn.to_xrpl() 
 
 class xNFT(AsyncJsonRpcClient):
-    def __init__(self, url: str) -> None:
-        self.client = AsyncJsonRpcClient(url)
+    def __init__(self, url: Union[str, AsyncJsonRpcClient]) -> None:
+        """`url` is a node url or a shared `Transport.xTransport`"""
+        self.client = x_client(url)
 
-    async def account_nft_offers(self, wallet_addr: str, mainnet: bool = True) -> dict:
-        """return all nft offers an account has created and received"""
-        offers = []
+    async def stream_nft_offers(self, wallet_addr: str, limit: int = 200):
+        """yield every nft offer an account has created and received as an `xNftOffer`, page by page"""
+        async for nft_offer in iter_account_objects(self.client, wallet_addr, "nft_offer", limit):
+            yield nft_offer_record(nft_offer)
 
-        req = AccountObjects(account=wallet_addr, type="nft_offer")
-        response = await self.client.request(req)
-        result = response.result
-        if "account_objects" in result:
-            nft_offers = result["account_objects"]
-            for nft_offer in nft_offers:
-                offer = {}
-                offer["offer_id"] = nft_offer["index"]
-                offer["nftoken_id"] = nft_offer["NFTokenID"]
-                offer["owner"] = nft_offer["Owner"]
-                offer["flag"] = nft_offer["Flags"]
-                offer["receiver"] = ""
-                offer["expiry_date"] = ""
-                if isinstance(nft_offer["Amount"], str):
-                    offer["token"] = "XRP"
-                    offer["issuer"] = ""
-                    offer["amount"] = str(drops_to_xrp(nft_offer["Amount"]))
-                if isinstance(nft_offer["Amount"], dict):
-                    offer["token"] = nft_offer["Amount"]["currency"]
-                    offer["issuer"] = nft_offer["Amount"]["issuer"]
-                    offer["amount"] = nft_offer["Amount"]["value"]
-                if "Destination" in nft_offer:
-                    offer["receiver"] = nft_offer["Destination"]
-                if "Expiration" in nft_offer:
-                    offer["expiry_date"] = str(ripple_time_to_datetime(nft_offer["Expiration"]))
-                offers.append(offer)
-        return offers
+    async def account_nft_offers(self, wallet_addr: str, mainnet: bool = True, limit: int = 200) -> list:
+        """return all nft offers an account has created and received"""
+        return [nft_offer.to_dict() async for nft_offer in self.stream_nft_offers(wallet_addr, limit)]
     
     # async def account_nft_offers(self, wallet_addr: str, mainnet: bool = True) -> dict:
     #     """return all nft offers an account has created and received"""
@@ -196,7 +174,7 @@ class xNFT(AsyncJsonRpcClient):
                 if isinstance(buy_offer["amount"], str):
                     offer["token"] = "XRP"
                     offer["issuer"] = ""
-                    offer["amount"] = str(drops_to_xrp(buy_offer["Amount"]))
+                    offer["amount"] = xrp_string(buy_offer["Amount"])
                 if isinstance(buy_offer["amount"], dict):
                     offer["token"] = buy_offer["amount"]["currency"]
                     offer["issuer"] = buy_offer["amount"]["issuer"]
@@ -223,7 +201,7 @@ class xNFT(AsyncJsonRpcClient):
                 if isinstance(sell_offer["amount"], str):
                     offer["token"] = "XRP"
                     offer["issuer"] = ""
-                    offer["amount"] = str(drops_to_xrp(sell_offer["amount"]))
+                    offer["amount"] = xrp_string(sell_offer["amount"])
                 if isinstance(sell_offer["amount"], dict):
                     offer["token"] = sell_offer["amount"]["currency"]
                     offer["issuer"] = sell_offer["amount"]["issuer"]
@@ -240,9 +218,9 @@ class xNFT(AsyncJsonRpcClient):
     
 
 
-client = AsyncJsonRpcClient("https://s.altnet.rippletest.net:51234")
-client = JsonRpcClient("https://s.altnet.rippletest.net:51234")
-d = xNFT(client.url)
+# client = AsyncJsonRpcClient("https://s.altnet.rippletest.net:51234")
+# client = JsonRpcClient("https://s.altnet.rippletest.net:51234")
+# d = xNFT(client.url)
 # d = xNFT("https://xrplcluster.com")
 
 # sell_response = client.request(NFTSellOffers(nft_id="00080000ADFDB77A8B3A255EB4DEC33759232E724309D0700000099A00000000", id="validated"))
@@ -251,6 +229,6 @@ d = xNFT(client.url)
 
 
 
-print(asyncio.run(  d.account_nft_offers(
-    "rGiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W", False
-)))
\ No newline at end of file
+# print(asyncio.run(  d.account_nft_offers(
+#     "rGiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W", False
+# )))
\ No newline at end of file
@@ -1,10 +1,13 @@
-from datetime import datetime, timedelta
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
 from decimal import Decimal
 from typing import Union
 
 from xrpl.core.binarycodec import encode_for_signing_claim
 from xrpl.core.keypairs import sign, is_valid_message
 from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
 from xrpl.clients import JsonRpcClient
 from xrpl.models import (XRP, AccountSet, AccountObjects, DepositPreauth, AccountOffers, BookOffers,
                          CheckCancel, CheckCash, CheckCreate, EscrowCancel,
@@ -13,10 +16,14 @@ from xrpl.models import (XRP, AccountSet, AccountObjects, DepositPreauth, Accoun
                          OfferCreate, Tx, OfferCreateFlag, DepositAuthorized, PaymentChannelCreate,
                          PaymentChannelFund, ChannelVerify,
                          PaymentChannelClaim, PaymentChannelClaimFlag)
-from xrpl.utils import drops_to_xrp, ripple_time_to_datetime, xrp_to_drops, datetime_to_ripple_time
+from xrpl.utils import datetime_to_ripple_time
 
-from Misc import mm, validate_hex_to_symbol, validate_symbol_to_hex
+from Amount import model_amount, to_drops, xAmount
+from Currency import validate_hex_to_symbol, validate_symbol_to_hex
+from Misc import mm
+from Records import creator_liquidity, xChannel, xCheck, xEscrow, xNftOffer, xOffer, xTicket
 
+from Transport import x_client
 from x_constants import M_SOURCE_TAG
 
 """
@@ -40,16 +47,16 @@ payment channel info
 
 # settle delay max = 2**32-1 time in seconds, Amount of time the source address must wait before closing the channel if it has unclaimed XRP.
 def create_xrp_payment_channel(sender_addr: str, public_key: str, amount: Union[int, float, Decimal], receiver: str, settle_delay: int, cancel_after: int = None, destination_tag: int = None, fee: str = None) -> dict:
-    txn = PaymentChannelCreate(account=sender_addr, amount=xrp_to_drops(amount), destination=receiver, settle_delay=settle_delay, public_key=public_key, cancel_after=cancel_after, destination_tag=destination_tag, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    txn = PaymentChannelCreate(account=sender_addr, amount=to_drops(amount), destination=receiver, settle_delay=settle_delay, public_key=public_key, cancel_after=cancel_after, destination_tag=destination_tag, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 def claim_xrp_payment_channel_funds(sender_addr: str, public_key: str, channel_id: str, signature: str, amount: str, fee: str = None) -> dict:
-    txn = PaymentChannelClaim(account=sender_addr, channel=channel_id, signature=signature, amount=xrp_to_drops(amount), balance=xrp_to_drops(amount), public_key=public_key, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    txn = PaymentChannelClaim(account=sender_addr, channel=channel_id, signature=signature, amount=to_drops(amount), balance=to_drops(amount), public_key=public_key, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 # only the payment channel sender can call this - https://xrpl.org/docs/references/protocol/transactions/types/paymentchannelfund/
 def update_xrp_payment_channel(sender_addr: str, channel_id: str, amount: Union[int, float, Decimal], expiry_date: int = None, fee: str = None) -> dict:
-    txn = PaymentChannelFund(account=sender_addr, channel=channel_id, amount=xrp_to_drops(amount), expiration=expiry_date, source_tag=M_SOURCE_TAG, memos=mm(), fee=fee)
+    txn = PaymentChannelFund(account=sender_addr, channel=channel_id, amount=to_drops(amount), expiration=expiry_date, source_tag=M_SOURCE_TAG, memos=mm(), fee=fee)
     return txn.to_xrpl()
 
 def renew_payment_channel(sender_addr: str, channel_id: str, fee: str = None) -> dict:
@@ -62,13 +69,13 @@ def close_payment_channel(sender_addr: str, channel_id: str, fee: str = None) ->
     return txn.to_xrpl()
 
 def generate_xrp_payment_channel_signature(channel_id: str, amount: Union[int, Decimal, float], private_key: str) -> str:
-    data = encode_for_signing_claim({"channel": channel_id, "amount": xrp_to_drops(amount)})
+    data = encode_for_signing_claim({"channel": channel_id, "amount": to_drops(amount)})
     return sign(data, private_key)
 
 # def verify_xrp_payment_channel_signature(channel_id: str, amount: Union[int, float, Decimal], public_key: str, signature: str) -> bool:
 #     """check the validity of a signature that can be used to redeem a specific amount of XRP from a payment channel."""
 #     value = False
-#     data = encode_for_signing_claim({"channel": channel_id, "amount": xrp_to_drops(amount)})
+#     data = encode_for_signing_claim({"channel": channel_id, "amount": to_drops(amount)})
 #     value = is_valid_message(data, signature, public_key)
 #     return value
 
@@ -89,12 +96,12 @@ def deposit_pre_auth(sender_addr: str, authorize: str = None, unauthorize: str =
 
 def create_xrp_check(sender_addr: str, receiver_addr: str, amount: Union[int, float, Decimal], expiry_date: int = None, invoice_id: str = None, fee: str = None) -> dict:
     """create xrp check"""
-    txn = CheckCreate(account=sender_addr, destination=receiver_addr, send_max=xrp_to_drops(amount), expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG, invoice_id=invoice_id)
+    txn = CheckCreate(account=sender_addr, destination=receiver_addr, send_max=to_drops(amount), expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG, invoice_id=invoice_id)
     return txn.to_xrpl()
 
 def cash_xrp_check(sender_addr: str, check_id: str, amount: Union[int, Decimal, float], fee: str = None) -> dict:
     """cash a check, only the receiver defined on creation can cash a check"""
-    txn = CheckCash(account=sender_addr, check_id=check_id, amount=xrp_to_drops(amount), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    txn = CheckCash(account=sender_addr, check_id=check_id, amount=to_drops(amount), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 def cancel_check(sender_addr: str, check_id: str, fee: str = None) -> dict:
@@ -124,25 +131,82 @@ def create_xrp_escrow(sender_addr: str, amount: Union[int, float, Decimal], rece
     """create an Escrow\n
     fill condition with `Misc.gen_condition_fulfillment["condition"]`\n
     You must use one `claim_date` or `expiry_date` unless this will fail"""
-    txn = EscrowCreate(account=sender_addr, amount=xrp_to_drops(amount), destination=receiver_addr, finish_after=claim_date, cancel_after=expiry_date, condition=condition, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    txn = EscrowCreate(account=sender_addr, amount=to_drops(amount), destination=receiver_addr, finish_after=claim_date, cancel_after=expiry_date, condition=condition, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 def schedule_xrp( sender_addr: str, amount: Union[int, float, Decimal], receiver_addr: str, claim_date: int, expiry_date: Union[int, None], fee: str = None) -> dict:
     """schedule an Xrp payment
     \n expiry date must be greater than claim date"""
-    txn = EscrowCreate(account=sender_addr, amount=xrp_to_drops(amount), destination=receiver_addr, finish_after=claim_date, cancel_after=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    txn = EscrowCreate(account=sender_addr, amount=to_drops(amount), destination=receiver_addr, finish_after=claim_date, cancel_after=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
-def r_sequence(client: JsonRpcClient, prev_txn_id: str) -> int:
-    """return escrow seq for finishing or cancelling escrow"""
+ESCROW_SEQUENCES = OrderedDict() # prev_txn_id -> escrow sequence, a transaction's sequence never changes once it exists
+ESCROW_SEQUENCES_SIZE = 4096
+
+def escrow_sequence(result: dict) -> int:
+    """return the sequence an escrow create used, the ticket sequence if it was created with a ticket"""
     seq = 0
-    req = Tx(transaction=prev_txn_id)
-    response = client.request(req)
-    result = response.result
     if "Sequence" in result:
         seq = result["Sequence"]
+    if seq == 0 and "TicketSequence" in result:
+        seq = result["TicketSequence"]
     return seq
 
+def cached_sequence(prev_txn_id: str) -> Union[int, None]:
+    seq = ESCROW_SEQUENCES.get(prev_txn_id)
+    if seq is not None:
+        ESCROW_SEQUENCES.move_to_end(prev_txn_id)
+    return seq
+
+def tx_sequence(prev_txn_id: str, response) -> int:
+    """the escrow sequence of a Tx response, remembered in `ESCROW_SEQUENCES` with the least recently used ones dropped\n
+    raises `XRPLRequestFailureException` when the lookup failed, an escrow cannot be finished or cancelled without its sequence"""
+    if not response.is_successful():
+        raise XRPLRequestFailureException(response.result)
+    seq = escrow_sequence(response.result)
+    if not seq:
+        raise XRPLRequestFailureException({"error": "noSequence", "error_message": f"transaction {prev_txn_id} has no sequence"})
+    ESCROW_SEQUENCES[prev_txn_id] = seq
+    while len(ESCROW_SEQUENCES) > ESCROW_SEQUENCES_SIZE:
+        ESCROW_SEQUENCES.popitem(last=False)
+    return seq
+
+def r_sequence(client: JsonRpcClient, prev_txn_id: str) -> int:
+    """return escrow seq for finishing or cancelling escrow"""
+    seq = cached_sequence(prev_txn_id)
+    if seq is not None:
+        return seq
+    req = Tx(transaction=prev_txn_id)
+    response = client.request(req)
+    return tx_sequence(prev_txn_id, response)
+
+async def r_sequence_async(client: AsyncJsonRpcClient, prev_txn_id: str) -> int:
+    """return escrow seq for finishing or cancelling escrow, looked up once per `prev_txn_id`"""
+    seq = cached_sequence(prev_txn_id)
+    if seq is not None:
+        return seq
+    req = Tx(transaction=prev_txn_id)
+    response = await client.request(req)
+    return tx_sequence(prev_txn_id, response)
+
+async def r_sequences(client: AsyncJsonRpcClient, prev_txn_ids: list, concurrency: int = 10) -> dict:
+    """return prev_txn_id -> escrow seq for many escrows, uncached ids are looked up concurrently\n
+    raises on the first failed lookup, the other lookups in flight are cancelled"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(prev_txn_id: str) -> tuple:
+        async with semaphore:
+            return prev_txn_id, await r_sequence_async(client, prev_txn_id)
+
+    tasks = [asyncio.create_task(lookup(prev_txn_id)) for prev_txn_id in dict.fromkeys(prev_txn_ids)]
+    try:
+        sequences = dict(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return {prev_txn_id: sequences[prev_txn_id] for prev_txn_id in prev_txn_ids}
+
 def cancel_xrp_escrow(sender_addr: str, escrow_creator: str, prev_txn_id: str, mainnet: bool = True, fee: str = None) -> dict:
     """cancel an escrow\n
     If the escrow does not have a CancelAfter time, it never expires """
@@ -157,13 +221,25 @@ def finish_xrp_escrow(sender_addr: str, escrow_creator: str, prev_txn_id: str, c
     txn = EscrowFinish(account=sender_addr, owner=escrow_creator, offer_sequence=r_sequence(client, prev_txn_id), condition=condition, fulfillment=fulfillment, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
+async def cancel_xrp_escrow_async(client: AsyncJsonRpcClient, sender_addr: str, escrow_creator: str, prev_txn_id: str, fee: str = None) -> dict:
+    """cancel an escrow, resolving its sequence through a shared client, raises `XRPLRequestFailureException` if that lookup fails\n
+    If the escrow does not have a CancelAfter time, it never expires """
+    txn = EscrowCancel(account=sender_addr, owner=escrow_creator, offer_sequence=await r_sequence_async(client, prev_txn_id), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    return txn.to_xrpl()
+
+async def finish_xrp_escrow_async(client: AsyncJsonRpcClient, sender_addr: str, escrow_creator: str, prev_txn_id: str, condition: Union[str, None] = None, fulfillment: Union[str, None] = None, fee: str = None) -> dict:
+    """complete an escrow, resolving its sequence through a shared client, raises `XRPLRequestFailureException` if that lookup fails\n
+    cannot be called until the finish time is reached"""
+    txn = EscrowFinish(account=sender_addr, owner=escrow_creator, offer_sequence=await r_sequence_async(client, prev_txn_id), condition=condition, fulfillment=fulfillment, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    return txn.to_xrpl()
+
 def cancel_offer( sender_addr: str, offer_seq: int, fee: str = None) -> dict:
     """cancel an offer"""
     txn = OfferCancel(account=sender_addr, offer_sequence=offer_seq, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 
-def create_offer( sender_addr: str, pay: Union[float, IssuedCurrencyAmount], receive: Union[float, IssuedCurrencyAmount], expiry_date: int = None,
+def create_offer( sender_addr: str, pay: Union[float, xAmount, IssuedCurrencyAmount], receive: Union[float, xAmount, IssuedCurrencyAmount], expiry_date: int = None,
     tf_passive: bool = False, tf_immediate_or_cancel: bool = False, tf_fill_or_kill: bool = False, tf_sell: bool = False, fee: str = None) -> dict:
     """create an offer"""
     flags = []
@@ -176,27 +252,85 @@ def create_offer( sender_addr: str, pay: Union[float, IssuedCurrencyAmount], rec
     if tf_sell:
         flags.append(OfferCreateFlag.TF_SELL)
     txn_dict = {}
-    if isinstance(receive, float) and isinstance(pay, IssuedCurrencyAmount): # check if give == xrp and get == asset
-        txn = OfferCreate(account=sender_addr, taker_pays=xrp_to_drops(receive), taker_gets=pay, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG, flags=flags)
-        txn_dict = txn.to_xrpl()
-    if isinstance(receive, IssuedCurrencyAmount) and isinstance(pay, float): # check if give == asset and get == xrp
-        txn = OfferCreate(account=sender_addr, taker_pays=receive, taker_gets=xrp_to_drops(pay), expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG, flags=flags)
-        txn_dict = txn.to_xrpl()
-    if isinstance(receive, IssuedCurrencyAmount) and isinstance(pay, IssuedCurrencyAmount): # check if give and get are == asset
-        txn = OfferCreate(account=sender_addr, taker_pays=receive, taker_gets=pay, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG, flags=flags)
+    taker_pays, taker_gets = model_amount(receive), model_amount(pay)
+    if isinstance(taker_pays, IssuedCurrencyAmount) or isinstance(taker_gets, IssuedCurrencyAmount): # xrp for a token, a token for xrp or a token for a token
+        txn = OfferCreate(account=sender_addr, taker_pays=taker_pays, taker_gets=taker_gets, expiration=expiry_date, fee=fee, memos=mm(), source_tag=M_SOURCE_TAG, flags=flags)
         txn_dict = txn.to_xrpl()
     return txn_dict
 
 
 
+async def iter_account_objects(client: AsyncJsonRpcClient, wallet_addr: str, object_type: str = None, limit: int = 200):
+    """yield every ledger object an account owns, only `object_type` ones if given, following the `marker` page by page\n
+    every page is read from the ledger the first one resolved to, an error response raises `XRPLRequestFailureException`"""
+    marker = None
+    ledger_index = "validated"
+    while True:
+        req = AccountObjects(account=wallet_addr, ledger_index=ledger_index, type=object_type, limit=limit, marker=marker)
+        response = await client.request(req)
+        result = response.result
+        if not response.is_successful():
+            raise XRPLRequestFailureException(result)
+        for account_object in result.get("account_objects", []):
+            yield account_object
+        # markers are only valid against the ledger they came from
+        ledger_index = result.get("ledger_index", ledger_index)
+        marker = result.get("marker")
+        if marker is None:
+            break
+
+def payment_channel_record(paymentchannel: dict) -> xChannel:
+    return xChannel(paymentchannel)
+
+def ticket_record(ticket: dict) -> xTicket:
+    return xTicket(ticket)
+
+def check_record(check: dict) -> xCheck:
+    return xCheck(check)
+
+def escrow_record(escrow: dict) -> Union[xEscrow, None]:
+    """xrp escrows only, token escrows return None"""
+    if not isinstance(escrow["Amount"], str):
+        return None
+    return xEscrow(escrow)
+
+def nft_offer_record(nft_offer: dict) -> xNftOffer:
+    return xNftOffer(nft_offer)
+
+def offer_record(offer: dict) -> xOffer:
+    """an Offer ledger object, `to_dict()` is in the shape `xObject.account_offers` returns"""
+    return xOffer(offer)
+
+# AccountObjects `type` -> parser of that ledger object
+OBJECT_PARSERS = {
+    "payment_channel": payment_channel_record,
+    "ticket": ticket_record,
+    "check": check_record,
+    "escrow": escrow_record,
+    "offer": offer_record,
+    "nft_offer": nft_offer_record,
+}
+
+# LedgerEntryType -> (`xObject.account_snapshot` key, parser)
+LEDGER_ENTRY_PARSERS = {
+    "PayChannel": ("payment_channels", payment_channel_record),
+    "Ticket": ("tickets", ticket_record),
+    "Check": ("checks", check_record),
+    "Escrow": ("escrows", escrow_record),
+    "Offer": ("offers", offer_record),
+    "NFTokenOffer": ("nft_offers", nft_offer_record),
+}
+
+
 class xObject(AsyncJsonRpcClient):
-    def __init__(self, url: str) -> None:
-        self.client = AsyncJsonRpcClient(url)
+    def __init__(self, url: Union[str, AsyncJsonRpcClient]) -> None:
+        """`url` is a node url or a shared `Transport.xTransport`"""
+        self.client = x_client(url)
 
     async def verify_xrp_payment_channel_signature(self, channel_id: str, amount: Union[int, float, Decimal], public_key: str, signature: str) -> bool:
         """check the validity of a signature that can be used to redeem a specific amount of XRP from a payment channel."""
         value = False
-        req = ChannelVerify(channel_id=channel_id, amount=xrp_to_drops(amount), public_key=public_key, signature=signature)
+        req = ChannelVerify(channel_id=channel_id, amount=to_drops(amount), public_key=public_key, signature=signature)
         response = await self.client.request(req)
         result = response.result
         if "signature_verified" in result:
@@ -213,103 +347,47 @@ class xObject(AsyncJsonRpcClient):
             value = result["is_deposit_authorized"]
         return value
 
-    async def account_xrp_payment_channels(self, wallet_addr: str) -> list:
+    async def stream_account_objects(self, wallet_addr: str, object_type: str, limit: int = 200):
+        """yield the `object_type` objects of an account page by page as `Records` records, see `OBJECT_PARSERS` for the types"""
+        parser = OBJECT_PARSERS[object_type]
+        async for account_object in iter_account_objects(self.client, wallet_addr, object_type, limit):
+            record = parser(account_object)
+            if record is not None:
+                yield record
+
+    async def stream_account_snapshot(self, wallet_addr: str, limit: int = 400):
+        """yield (`account_snapshot` key, record) for the payment channels, tickets, checks, xrp escrows, offers and nft offers
+        of an account from one unfiltered walk of its owner directory"""
+        async for account_object in iter_account_objects(self.client, wallet_addr, limit=limit):
+            if account_object["LedgerEntryType"] in LEDGER_ENTRY_PARSERS:
+                key, parser = LEDGER_ENTRY_PARSERS[account_object["LedgerEntryType"]]
+                record = parser(account_object)
+                if record is not None:
+                    yield key, record
+
+    async def account_snapshot(self, wallet_addr: str, limit: int = 400) -> dict:
+        """return the payment channels, tickets, checks, xrp escrows, offers and nft offers of an account\n
+        from one unfiltered walk of its owner directory instead of a request per object type"""
+        snapshot = {key: [] for key, _ in LEDGER_ENTRY_PARSERS.values()}
+        async for key, record in self.stream_account_snapshot(wallet_addr, limit):
+            snapshot[key].append(record.to_dict())
+        return snapshot
+
+    async def account_xrp_payment_channels(self, wallet_addr: str, limit: int = 200) -> list:
         """return a list of the payment channels created by an account"""
-        paymentchannels_ = []
-        req = AccountObjects(account=wallet_addr,  type="payment_channel")
-        response = await self.client.request(req)
-        result = response.result
-        if "account_objects" in result:
-            account_paymentchannels = result["account_objects"]
-            for paymentchannel in account_paymentchannels:
-                paymentchannel_data = {}
-                paymentchannel_data["channel_id"] = paymentchannel["index"]
-                paymentchannel_data["sender"] = paymentchannel["Account"]
-                paymentchannel_data["amount_deposited"] = str(drops_to_xrp(paymentchannel["Amount"]))
-                paymentchannel_data["amount_paid_out"] = str(drops_to_xrp(paymentchannel["Balance"]))
-                paymentchannel_data["amount_remaining"] = str(drops_to_xrp(str(int(paymentchannel["Amount"]) - int(paymentchannel["Balance"]))))
-                paymentchannel_data["receiver"] = paymentchannel["Destination"]
-                paymentchannel_data["settle_delay"] = str(timedelta(seconds=(paymentchannel["SettleDelay"])))
-                paymentchannel_data["public_key"] = paymentchannel["PublicKey"]
-                paymentchannel_data["cancel_after_date"] = str(ripple_time_to_datetime(paymentchannel["CancelAfter"])) if "CancelAfter" in paymentchannel else ''
-                paymentchannel_data["expiry_date"] = str(ripple_time_to_datetime(paymentchannel["Expiration"])) if "Expiration" in paymentchannel else ''
-                paymentchannel_data["destination_tag"] = paymentchannel["DestinationTag"] if "DestinationTag" in paymentchannel else ''
-                paymentchannels_.append(paymentchannel_data)
-        return paymentchannels_
-    
-    async def account_tickets(self, wallet_addr: str) -> list:
+        return [paymentchannel.to_dict() async for paymentchannel in self.stream_account_objects(wallet_addr, "payment_channel", limit)]
+
+    async def account_tickets(self, wallet_addr: str, limit: int = 200) -> list:
         """return a list tickets created by an account"""
-        tickets_ = []
-        req = AccountObjects(account=wallet_addr, ledger_index="validated", type="ticket")
-        response = await self.client.request(req)
-        result = response.result
-        if "account_objects" in result:
-            account_tickets = result["account_objects"]
-            for ticket in account_tickets:
-                ticket_data = {}
-                ticket_data["ticket_id"] = ticket["index"]
-                ticket_data["account"] = ticket["Account"]
-                ticket_data["flags"] = ticket["Flags"]
-                ticket_data["ticket_sequence"] = ticket["TicketSequence"]
-                tickets_.append(ticket_data)
-        return tickets_
-
-    async def account_checks(self, wallet_addr: str) -> list:
+        return [ticket.to_dict() async for ticket in self.stream_account_objects(wallet_addr, "ticket", limit)]
+
+    async def account_checks(self, wallet_addr: str, limit: int = 200) -> list:
         """return a list of checks an account sent or received"""
-        checks_= []
-        req = AccountObjects(account=wallet_addr, ledger_index="validated", type="check")
-        response = await self.client.request(req)
-        result = response.result
-        if "account_objects" in result:
-            account_checks = result["account_objects"]
-            for check in account_checks:
-                check_data = {}
-                check_data["check_id"] = check["index"]
-                check_data["sender"] = check["Account"]
-                check_data["receiver"] = check["Destination"]
-                check_data["expiry_date"] = ""
-                if isinstance(check["SendMax"], str):
-                    check_data["token"] = "XRP"
-                    check_data["issuer"] = ""
-                    check_data["amount"] = str(drops_to_xrp(check["SendMax"]))
-                if isinstance(check["SendMax"], dict):
-                    check_data["token"] = validate_hex_to_symbol(check["SendMax"]["currency"])
-                    check_data["issuer"] = check["SendMax"]["issuer"]
-                    check_data["amount"] = check["SendMax"]["value"]
-                if "Expiration" in check:
-                    check_data["expiry_date"] = str(ripple_time_to_datetime(check["Expiration"]))
-                checks_.append(check_data)
-        return checks_
-
-    async def account_xrp_escrows(self, wallet_addr: str) -> list:
+        return [check.to_dict() async for check in self.stream_account_objects(wallet_addr, "check", limit)]
+
+    async def account_xrp_escrows(self, wallet_addr: str, limit: int = 200) -> list:
         """returns all account escrows, used for returning scheduled payments"""
-        escrows_ = []
-        req = AccountObjects(account=wallet_addr, ledger_index="validated", type="escrow")
-        response = await self.client.request(req)
-        result = response.result
-        if "account_objects" in result:
-            escrows = result["account_objects"]
-            for escrow in escrows:
-                if isinstance(escrow["Amount"], str):
-                    escrow_data = {}
-                    escrow_data["escrow_id"] = escrow["index"]
-                    escrow_data["sender"] = escrow["Account"]
-                    escrow_data["receiver"] = escrow["Destination"]
-                    escrow_data["amount"] = str(drops_to_xrp(escrow["Amount"]))
-                    escrow_data["prev_txn_id"] = ""
-                    escrow_data["redeem_date"] = ""
-                    escrow_data["expiry_date"] = ""
-                    escrow_data["condition"] = ""
-                    if "PreviousTxnID" in escrow:
-                        escrow_data["prev_txn_id"] = escrow["PreviousTxnID"] # needed to cancel or complete the escrow
-                    if "FinishAfter" in escrow:
-                        escrow_data["redeem_date"] = str(ripple_time_to_datetime(escrow["FinishAfter"]))
-                    if "CancelAfter" in escrow:
-                        escrow_data["expiry_date"] = str(ripple_time_to_datetime(escrow["CancelAfter"]))
-                    if "Condition" in escrow:
-                        escrow_data["condition"] = escrow["Condition"]
-                    escrows_.append(escrow_data)
-        return escrows_
+        return [escrow.to_dict() async for escrow in self.stream_account_objects(wallet_addr, "escrow", limit)]
 
     # async def r_seq_dict(prev_txn_id: str, mainnet: bool = True) -> dict:
     #     """return escrow seq or ticket sequence for finishing or cancelling \n use seq_back_up if seq is null"""
@@ -327,40 +405,27 @@ class xObject(AsyncJsonRpcClient):
     #         info_dict["seq_back_up"] = result["TicketSequence"]
     #     return info_dict
 
+    async def stream_account_offers(self, wallet_addr: str, limit: int = 200):
+        """yield every offer an account created as an `xOffer`, following the `marker` page by page"""
+        marker = None
+        ledger_index = "validated"
+        while True:
+            req = AccountOffers(account=wallet_addr, ledger_index=ledger_index, limit=limit, marker=marker)
+            response = await self.client.request(req)
+            result = response.result
+            if not response.is_successful():
+                raise XRPLRequestFailureException(result)
+            for offer in result.get("offers", []):
+                yield xOffer.from_account_offer(offer)
+            # markers are only valid against the ledger they came from
+            ledger_index = result.get("ledger_index", ledger_index)
+            marker = result.get("marker")
+            if marker is None:
+                break
+
     async def account_offers(self, wallet_addr: str) -> list:
         """return all offers an account created"""
-        offer_list = []
-        req = AccountOffers(account=wallet_addr, ledger_index="validated")
-        response = await self.client.request(req)
-        result = response.result
-        if "offers" in result:
-            offers = result["offers"]
-            for offer in offers:
-                of = {}
-                of["flags"] = offer["flags"]
-                of["sequence"] = offer["seq"]
-                of["quality"] = offer["quality"]# str(drops_to_xrp(offer["quality"])) # rate is subject to error from the blockchain because xrp returned in this call has no decimal  # The exchange rate of the offer, as the ratio of the original taker_pays divided by the original taker_gets. rate = pay/get
-                if isinstance(offer["taker_pays"], dict):
-                    of["buy_token"] = validate_hex_to_symbol(offer["taker_pays"]["currency"])
-                    of["buy_issuer"] = offer["taker_pays"]["issuer"]
-                    of["buy_amount"] = offer["taker_pays"]["value"]
-                elif isinstance(offer["taker_pays"], str):
-                    of["buy_token"] = "XRP"
-                    of["buy_issuer"] = ""
-                    of["buy_amount"] = str(drops_to_xrp(offer["taker_pays"]))
-
-                if isinstance(offer["taker_gets"], dict):
-                    of["sell_token"] = validate_hex_to_symbol(offer["taker_gets"]["currency"])
-                    of["sell_issuer"] = offer["taker_gets"]["issuer"]
-                    of["sell_amount"] = offer["taker_gets"]["value"]
-                elif isinstance(offer["taker_gets"], str):
-                    of["sell_token"] = "XRP"
-                    of["sell_issuer"] = ""
-                    of["sell_amount"] = str(drops_to_xrp(offer["taker_gets"]))
-
-                of["rate"] = float(of["sell_amount"])/float(of["buy_amount"])
-                offer_list.append(of)
-        return offer_list
+        return [offer.to_dict() async for offer in self.stream_account_offers(wallet_addr)]
 
     async def all_offers(self, pay: Union[XRP, IssuedCurrency], receive: Union[XRP, IssuedCurrency]) -> list:
         """returns all offers for 2 pairs"""
@@ -378,27 +443,19 @@ class xObject(AsyncJsonRpcClient):
                 of["rate"] = offer["quality"]
                 of["flags"] = offer["Flags"]
                 of["creator_liquidity"] = ""
-                if "owner_funds" in offer and isinstance(offer["TakerGets"], str):
-                    of["creator_liquidity"] = f'{float(drops_to_xrp(offer["owner_funds"]))} XRP' # Amount of the TakerGets currency the side placing the offer has available to be traded.
-                if "owner_funds" in offer and isinstance(offer["TakerGets"], dict):
-                    of["creator_liquidity"] = f'{offer["owner_funds"]}  {validate_hex_to_symbol(offer["TakerGets"]["currency"])}' # Amount of the TakerGets currency the side placing the offer has available to be traded.
-                if isinstance(offer["TakerPays"], dict):
-                    of["buy_token"] = validate_hex_to_symbol(offer["TakerPays"]["currency"])
-                    of["buy_issuer"] = offer["TakerPays"]["issuer"]
-                    of["buy_amount"] = offer["TakerPays"]["value"]
-                elif isinstance(offer["TakerPays"], str):
-                    of["buy_token"] = "XRP"
-                    of["buy_issuer"] = ""
-                    of["buy_amount"] = str(drops_to_xrp(offer["TakerPays"]))
-
-                if isinstance(offer["TakerGets"], dict):
-                    of["sell_token"] = validate_hex_to_symbol(offer["TakerGets"]["currency"])
-                    of["sell_issuer"] = offer["TakerGets"]["issuer"]
-                    of["sell_amount"] = offer["TakerGets"]["value"]
-                elif isinstance(offer["TakerGets"], str):
-                    of["sell_token"] = "XRP"
-                    of["sell_issuer"] = ""
-                    of["sell_amount"] = str(drops_to_xrp(offer["TakerGets"]))
+                liquidity = creator_liquidity(offer) # Amount of the TakerGets currency the side placing the offer has available to be traded.
+                if liquidity and isinstance(offer["TakerGets"], str):
+                    of["creator_liquidity"] = f'{liquidity} XRP'
+                if liquidity and isinstance(offer["TakerGets"], dict):
+                    of["creator_liquidity"] = f'{liquidity}  {validate_hex_to_symbol(offer["TakerGets"]["currency"])}'
+                pays = xAmount.from_xrpl(offer["TakerPays"])
+                gets = xAmount.from_xrpl(offer["TakerGets"])
+                of["buy_token"] = "XRP" if pays.is_xrp() else validate_hex_to_symbol(pays.currency)
+                of["buy_issuer"] = pays.issuer
+                of["buy_amount"] = pays.value()
+                of["sell_token"] = "XRP" if gets.is_xrp() else validate_hex_to_symbol(gets.currency)
+                of["sell_issuer"] = gets.issuer
+                of["sell_amount"] = gets.value()
                 all_offers_list.append(of)
         return all_offers_list
         
@@ -440,8 +497,7 @@ class xObject(AsyncJsonRpcClient):
 
 # )
     
-import asyncio
-p = xObject("http://s.altnet.rippletest.net:51234")
+# p = xObject("http://s.altnet.rippletest.net:51234")
 # print(asyncio.run(p.account_xrp_payment_channels("rHWF24jTY4pREhMaEoe14LDeyRejV5saY6")))
 
 
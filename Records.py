@@ -0,0 +1,288 @@
+import sys
+from datetime import timedelta
+from decimal import Decimal
+
+from xrpl.utils import ripple_time_to_datetime
+
+from Amount import xAmount
+from Currency import validate_hex_to_symbol
+from Flags import OFFER_OBJECT_CODEC
+
+"""
+Parsed ledger objects
+
+Slotted records keep the raw ledger fields and amounts as `xAmount`, whose currency codes and
+issuers are interned so the many objects of one token share them, dates, symbols and amounts are
+only formatted when read. The `stream_*` methods yield records, `to_dict()` returns the dict the list
+returning query methods have always returned
+"""
+
+
+def creator_liquidity(offer: dict) -> str:
+    """the `owner_funds` of a BookOffers offer in units of its TakerGets, xrp as an xrp value like `drops_to_xrp`, "" if not reported"""
+    if "owner_funds" not in offer:
+        return ""
+    if isinstance(offer["TakerGets"], str):
+        return str(float(xAmount.drops(offer["owner_funds"])))
+    return offer["owner_funds"]
+
+
+def ripple_date(ripple_time: int) -> str:
+    return str(ripple_time_to_datetime(ripple_time)) if ripple_time is not None else ""
+
+
+class xRecord:
+    __slots__ = ()
+    FIELDS = ()
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class xTrustLine(xRecord):
+    __slots__ = ("currency", "issuer", "balance", "limit", "no_ripple", "freeze")
+    FIELDS = ("token", "issuer", "amount", "limit", "freeze_status", "ripple_status")
+
+    def __init__(self, line: dict) -> None:
+        """a line of AccountLines"""
+        self.currency = sys.intern(line["currency"])
+        self.issuer = line["account"] # the counterparty, a different address on every line of an issuer
+        self.balance = line["balance"]
+        self.limit = line["limit"] # the max an account can handle
+        self.no_ripple = line.get("no_ripple", False) # no ripple = true, means rippling is disabled which is good; else bad
+        self.freeze = line.get("freeze", False)
+
+    @property
+    def token(self) -> str:
+        return validate_hex_to_symbol(self.currency)
+
+    @property
+    def amount(self) -> str:
+        return self.balance
+
+    @property
+    def freeze_status(self) -> bool:
+        return self.freeze
+
+    @property
+    def ripple_status(self) -> bool:
+        return self.no_ripple
+
+
+class xOffer(xRecord):
+    __slots__ = ("flags", "sequence", "book_directory", "quality_text", "pays", "gets")
+    FIELDS = ("flags", "flag_names", "sequence", "quality", "buy_token", "buy_issuer", "buy_amount",
+        "sell_token", "sell_issuer", "sell_amount", "rate")
+
+    def __init__(self, offer: dict) -> None:
+        """an Offer ledger object"""
+        self.flags = offer["Flags"]
+        self.sequence = offer["Sequence"]
+        self.book_directory = offer["BookDirectory"]
+        self.quality_text = None
+        self.pays = xAmount.from_xrpl(offer["TakerPays"])
+        self.gets = xAmount.from_xrpl(offer["TakerGets"])
+
+    @classmethod
+    def from_account_offer(cls, offer: dict) -> "xOffer":
+        """an offer of AccountOffers, which reports the quality instead of the book directory"""
+        record = cls.__new__(cls)
+        record.flags = offer["flags"]
+        record.sequence = offer["seq"]
+        record.book_directory = None
+        record.quality_text = offer["quality"]
+        record.pays = xAmount.from_xrpl(offer["taker_pays"])
+        record.gets = xAmount.from_xrpl(offer["taker_gets"])
+        return record
+
+    @property
+    def flag_names(self) -> tuple:
+        return OFFER_OBJECT_CODEC.decode(self.flags)
+
+    @property
+    def quality(self) -> str:
+        if self.quality_text is None:
+            # the last 64 bits of the book directory are the offer quality, exponent + 100 in the top byte and a 56 bit mantissa
+            quality = int(self.book_directory[-16:], 16)
+            # plain decimal like the quality AccountOffers reports, never scientific notation
+            return format(Decimal(quality & 0x00FFFFFFFFFFFFFF).scaleb((quality >> 56) - 100).normalize(), "f")
+        return self.quality_text
+
+    @property
+    def buy_token(self) -> str:
+        return "XRP" if self.pays.is_xrp() else validate_hex_to_symbol(self.pays.currency)
+
+    @property
+    def buy_issuer(self) -> str:
+        return self.pays.issuer
+
+    @property
+    def buy_amount(self) -> str:
+        return self.pays.value()
+
+    @property
+    def sell_token(self) -> str:
+        return "XRP" if self.gets.is_xrp() else validate_hex_to_symbol(self.gets.currency)
+
+    @property
+    def sell_issuer(self) -> str:
+        return self.gets.issuer
+
+    @property
+    def sell_amount(self) -> str:
+        return self.gets.value()
+
+    @property
+    def rate(self) -> float:
+        return float(self.gets / self.pays)
+
+
+class xCheck(xRecord):
+    __slots__ = ("check_id", "sender", "receiver", "expiration", "send_max")
+    FIELDS = ("check_id", "sender", "receiver", "expiry_date", "token", "issuer", "amount")
+
+    def __init__(self, check: dict) -> None:
+        """a Check ledger object"""
+        self.check_id = check["index"]
+        self.sender = check["Account"]
+        self.receiver = check["Destination"]
+        self.expiration = check.get("Expiration")
+        self.send_max = xAmount.from_xrpl(check["SendMax"])
+
+    @property
+    def expiry_date(self) -> str:
+        return ripple_date(self.expiration)
+
+    @property
+    def token(self) -> str:
+        return "XRP" if self.send_max.is_xrp() else validate_hex_to_symbol(self.send_max.currency)
+
+    @property
+    def issuer(self) -> str:
+        return self.send_max.issuer
+
+    @property
+    def amount(self) -> str:
+        return self.send_max.value()
+
+
+class xEscrow(xRecord):
+    __slots__ = ("escrow_id", "sender", "receiver", "drops", "prev_txn_id", "finish_after", "cancel_after", "condition")
+    FIELDS = ("escrow_id", "sender", "receiver", "amount", "prev_txn_id", "redeem_date", "expiry_date", "condition")
+
+    def __init__(self, escrow: dict) -> None:
+        """an xrp Escrow ledger object"""
+        self.escrow_id = escrow["index"]
+        self.sender = escrow["Account"]
+        self.receiver = escrow["Destination"]
+        self.drops = xAmount.drops(escrow["Amount"])
+        self.prev_txn_id = escrow.get("PreviousTxnID", "") # needed to cancel or complete the escrow
+        self.finish_after = escrow.get("FinishAfter")
+        self.cancel_after = escrow.get("CancelAfter")
+        self.condition = escrow.get("Condition", "")
+
+    @property
+    def amount(self) -> str:
+        return self.drops.value()
+
+    @property
+    def redeem_date(self) -> str:
+        return ripple_date(self.finish_after)
+
+    @property
+    def expiry_date(self) -> str:
+        return ripple_date(self.cancel_after)
+
+
+class xChannel(xRecord):
+    __slots__ = ("channel_id", "sender", "drops", "balance", "receiver", "settle_delay_seconds", "public_key",
+        "cancel_after", "expiration", "destination_tag")
+    FIELDS = ("channel_id", "sender", "amount_deposited", "amount_paid_out", "amount_remaining", "receiver",
+        "settle_delay", "public_key", "cancel_after_date", "expiry_date", "destination_tag")
+
+    def __init__(self, paymentchannel: dict) -> None:
+        """a PayChannel ledger object"""
+        self.channel_id = paymentchannel["index"]
+        self.sender = paymentchannel["Account"]
+        self.drops = xAmount.drops(paymentchannel["Amount"])
+        self.balance = xAmount.drops(paymentchannel["Balance"])
+        self.receiver = paymentchannel["Destination"]
+        self.settle_delay_seconds = paymentchannel["SettleDelay"]
+        self.public_key = paymentchannel["PublicKey"]
+        self.cancel_after = paymentchannel.get("CancelAfter")
+        self.expiration = paymentchannel.get("Expiration")
+        self.destination_tag = paymentchannel.get("DestinationTag", "")
+
+    @property
+    def amount_deposited(self) -> str:
+        return self.drops.value()
+
+    @property
+    def amount_paid_out(self) -> str:
+        return self.balance.value()
+
+    @property
+    def amount_remaining(self) -> str:
+        return (self.drops - self.balance).value()
+
+    @property
+    def settle_delay(self) -> str:
+        return str(timedelta(seconds=self.settle_delay_seconds))
+
+    @property
+    def cancel_after_date(self) -> str:
+        return ripple_date(self.cancel_after)
+
+    @property
+    def expiry_date(self) -> str:
+        return ripple_date(self.expiration)
+
+
+class xTicket(xRecord):
+    __slots__ = ("ticket_id", "account", "flags", "ticket_sequence")
+    FIELDS = __slots__
+
+    def __init__(self, ticket: dict) -> None:
+        """a Ticket ledger object"""
+        self.ticket_id = ticket["index"]
+        self.account = ticket["Account"]
+        self.flags = ticket["Flags"]
+        self.ticket_sequence = ticket["TicketSequence"]
+
+
+class xNftOffer(xRecord):
+    __slots__ = ("offer_id", "nftoken_id", "owner", "flag", "destination", "expiration", "price")
+    FIELDS = ("offer_id", "nftoken_id", "owner", "flag", "receiver", "expiry_date", "token", "issuer", "amount")
+
+    def __init__(self, nft_offer: dict) -> None:
+        """an NFTokenOffer ledger object"""
+        self.offer_id = nft_offer["index"]
+        self.nftoken_id = nft_offer["NFTokenID"]
+        self.owner = nft_offer["Owner"]
+        self.flag = nft_offer["Flags"]
+        self.destination = nft_offer.get("Destination", "")
+        self.expiration = nft_offer.get("Expiration")
+        self.price = xAmount.from_xrpl(nft_offer["Amount"])
+
+    @property
+    def receiver(self) -> str:
+        return self.destination
+
+    @property
+    def expiry_date(self) -> str:
+        return ripple_date(self.expiration)
+
+    @property
+    def token(self) -> str:
+        return self.price.currency
+
+    @property
+    def issuer(self) -> str:
+        return self.price.issuer
+
+    @property
+    def amount(self) -> str:
+        return self.price.value()
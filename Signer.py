@@ -0,0 +1,99 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha512
+from typing import Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.ledger import get_fee, get_latest_validated_ledger_sequence
+from xrpl.core.binarycodec import encode, encode_for_signing
+from xrpl.core.keypairs import sign
+from xrpl.models import AccountInfo
+from xrpl.wallet import Wallet
+
+from Transport import x_client
+
+"""
+Offline signing
+
+Builders return unsigned `to_xrpl()` dicts, xSigner fills in Sequence (or TicketSequence), Fee and
+LastLedgerSequence from an account state fetched once per batch and signs across a process pool
+"""
+
+TX_HASH_PREFIX = "54584E00"
+
+
+def tx_hash(blob: str) -> str:
+    """return the hash the ledger identifies a signed transaction blob by"""
+    return sha512(bytes.fromhex(TX_HASH_PREFIX + blob)).digest()[:32].hex().upper()
+
+
+def sign_transactions(transactions: list, public_key: str, private_key: str) -> list:
+    """return the (blob, hash) of every autofilled transaction, runs in a worker process"""
+    signed = []
+    for transaction in transactions:
+        transaction = {**transaction, "SigningPubKey": public_key}
+        transaction["TxnSignature"] = sign(bytes.fromhex(encode_for_signing(transaction)), private_key)
+        blob = encode(transaction)
+        signed.append((blob, tx_hash(blob)))
+    return signed
+
+
+async def account_state(url: Union[str, AsyncJsonRpcClient], wallet_addr: str, fee: str = None, ledger_offset: int = 20) -> dict:
+    """return the state `xSigner.autofill` needs: next sequence, fee and last ledger sequence\n
+    transactions autofilled from it expire `ledger_offset` ledgers after the current validated one"""
+    client = x_client(url)
+    response = await client.request(AccountInfo(account=wallet_addr, ledger_index="current"))
+    return {
+        "sequence": response.result["account_data"]["Sequence"],
+        "fee": fee or await get_fee(client),
+        "last_ledger_sequence": await get_latest_validated_ledger_sequence(client) + ledger_offset}
+
+
+class xSigner:
+    def __init__(self, wallet: Wallet, processes: int = None, chunks_per_process: int = 4) -> None:
+        """signs for `wallet` on `processes` workers (one per core by default)\n
+        a batch is cut into `chunks_per_process` chunks per worker so slow chunks do not leave cores idle"""
+        self.wallet = wallet
+        self.processes = processes or os.cpu_count() or 1
+        self.chunks_per_process = chunks_per_process
+        self.pool = None
+
+    def autofill(self, transactions: list, state: dict, tickets: list = None) -> list:
+        """fill Fee, LastLedgerSequence and Sequence from `state`, or spend `tickets` when given\n
+        `state["sequence"]` is advanced past the sequences used so the next batch continues from it"""
+        common = {"Account": self.wallet.classic_address, "Fee": state["fee"], "LastLedgerSequence": state["last_ledger_sequence"]}
+        if tickets is not None:
+            return [{**transaction, **common, "Sequence": 0, "TicketSequence": ticket} for transaction, ticket in zip(transactions, tickets)]
+        filled = [{**transaction, **common, "Sequence": state["sequence"] + i} for i, transaction in enumerate(transactions)]
+        state["sequence"] += len(filled)
+        return filled
+
+    async def sign(self, transactions: list) -> list:
+        """return the (blob, hash) of every autofilled transaction, in order"""
+        if not transactions:
+            return []
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.processes)
+        loop = asyncio.get_running_loop()
+        size = -(-len(transactions) // (self.processes * self.chunks_per_process))
+        chunks = [transactions[i:i + size] for i in range(0, len(transactions), size)]
+        signed = await asyncio.gather(*[
+            loop.run_in_executor(self.pool, sign_transactions, chunk, self.wallet.public_key, self.wallet.private_key) for chunk in chunks])
+        return [item for chunk in signed for item in chunk]
+
+    async def sign_batch(self, transactions: list, state: dict, tickets: list = None) -> list:
+        """autofill then sign"""
+        return await self.sign(self.autofill(transactions, state, tickets))
+
+    def close(self) -> None:
+        """shut the worker processes down"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self) -> "xSigner":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
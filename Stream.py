@@ -0,0 +1,97 @@
+import asyncio
+import inspect
+from typing import Callable
+
+from websockets.exceptions import ConnectionClosed
+from xrpl.asyncio.clients import AsyncWebsocketClient
+from xrpl.asyncio.clients.exceptions import XRPLWebsocketException
+from xrpl.models import StreamParameter, Subscribe, Unsubscribe
+
+from Wallet import balance_record, payment_record
+
+"""
+Real time account updates
+
+Subscribes to the `accounts` and `ledger` streams over websocket and turns them into
+("payment", record) events shaped like `xWallet.payment_transactions` records,
+("balance", record) events shaped like `xWallet.xrp_balance` plus "address" and "ledger_index",
+and ("ledger", message) events for every validated ledger
+"""
+
+
+class xStream:
+    def __init__(self, url: str, wallet_addrs: list = None, timeout: float = 30.0, backoff: float = 1.0, max_backoff: float = 60.0) -> None:
+        """`url` is a websocket url, see `x_constants.XURLS_`\n
+        the connection is dropped and resubscribed when nothing arrives for `timeout` seconds, ledgers close every ~4s"""
+        self.url = url
+        self.accounts = set(wallet_addrs or [])
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.ws = None
+
+    async def watch(self, wallet_addrs: list) -> None:
+        """start watching more addresses, takes effect immediately when connected"""
+        new = [wallet_addr for wallet_addr in wallet_addrs if wallet_addr not in self.accounts]
+        self.accounts.update(new)
+        if new and self.ws is not None and self.ws.is_open():
+            await self.ws.send(Subscribe(accounts=new))
+
+    async def unwatch(self, wallet_addrs: list) -> None:
+        """stop watching addresses"""
+        old = [wallet_addr for wallet_addr in wallet_addrs if wallet_addr in self.accounts]
+        self.accounts.difference_update(old)
+        if old and self.ws is not None and self.ws.is_open():
+            await self.ws.send(Unsubscribe(accounts=old))
+
+    def parse(self, message: dict) -> list:
+        """return the events in a stream message"""
+        events = []
+        if message.get("type") == "ledgerClosed":
+            events.append(("ledger", message))
+        elif message.get("type") == "transaction" and message.get("validated"):
+            transaction = {"tx": message["transaction"], "meta": message["meta"]}
+            if message["transaction"]["TransactionType"] == "Payment":
+                events.append(("payment", payment_record(transaction)))
+            for affected_node in message["meta"].get("AffectedNodes", []):
+                node = affected_node.get("ModifiedNode") or affected_node.get("CreatedNode")
+                if node is None or node["LedgerEntryType"] != "AccountRoot":
+                    continue
+                account_data = node.get("FinalFields") or node.get("NewFields")
+                if account_data["Account"] in self.accounts and "Balance" in account_data:
+                    balance = balance_record({"Balance": account_data["Balance"], "OwnerCount": account_data.get("OwnerCount", 0)})
+                    balance["address"] = account_data["Account"]
+                    balance["ledger_index"] = message["ledger_index"]
+                    events.append(("balance", balance))
+        return events
+
+    async def events(self):
+        """yield (kind, record) events forever, reconnecting and resubscribing with backoff when the connection drops"""
+        delay = self.backoff
+        while True:
+            try:
+                async with AsyncWebsocketClient(self.url) as client:
+                    self.ws = client
+                    await client.send(Subscribe(streams=[StreamParameter.LEDGER], accounts=sorted(self.accounts) or None))
+                    delay = self.backoff
+                    messages = client.__aiter__()
+                    while True:
+                        message = await asyncio.wait_for(messages.__anext__(), self.timeout)
+                        for event in self.parse(message):
+                            yield event
+            except (asyncio.TimeoutError, StopAsyncIteration, ConnectionClosed, OSError, XRPLWebsocketException):
+                pass
+            finally:
+                self.ws = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    async def run(self, on_payment: Callable = None, on_balance: Callable = None, on_ledger: Callable = None) -> None:
+        """call `on_payment`, `on_balance` and `on_ledger` (plain functions or coroutines) for every event"""
+        callbacks = {"payment": on_payment, "balance": on_balance, "ledger": on_ledger}
+        async for kind, record in self.events():
+            callback = callbacks[kind]
+            if callback is not None:
+                result = callback(record)
+                if inspect.isawaitable(result):
+                    await result
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from typing import Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.ledger import get_latest_validated_ledger_sequence
+from xrpl.core.binarycodec import decode
+from xrpl.models import Ledger, SubmitOnly
+
+from Signer import tx_hash
+from Transport import x_client
+
+"""
+Submission pipeline
+
+Signed blobs are submitted concurrently and tracked by hash, one background task reads every new
+validated ledger with its transactions and settles all the tracked ones it contains at once,
+anything still missing after its LastLedgerSequence validated can never apply and is "expired"
+"""
+
+logger = logging.getLogger(__name__)
+
+# submit results worth sending the same blob again on the next ledger
+RESUBMIT = ("terQUEUED", "terPRE_SEQ", "terRETRY", "telCAN_NOT_QUEUE", "telCAN_NOT_QUEUE_BALANCE", "telCAN_NOT_QUEUE_BLOCKS",
+    "telCAN_NOT_QUEUE_BLOCKED", "telCAN_NOT_QUEUE_FEE", "telCAN_NOT_QUEUE_FULL", "telINSUF_FEE_P", "tooBusy", "noNetwork", "noCurrent")
+
+
+class xSubmitter:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], concurrency: int = 50, poll_interval: float = 1.0, max_attempts: int = 10,
+        max_errors: int = 30) -> None:
+        """`concurrency` bounds the submits in flight, validated ledgers are looked for every `poll_interval` seconds\n
+        a blob is sent at most `max_attempts` times, after `max_errors` failed rounds in a row the pending futures fail"""
+        self.client = x_client(url)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.max_errors = max_errors
+        self.errors = 0
+        self.pending = {}
+        self.ledger_index = None
+        self.semaphore = None
+        self.task = None
+
+    async def send(self, txid: str) -> None:
+        entry = self.pending.get(txid)
+        if entry is None:
+            return
+        entry["attempts"] += 1
+        try:
+            async with self.semaphore:
+                response = await self.client.request(SubmitOnly(tx_blob=entry["blob"]))
+            entry["submit_result"] = response.result.get("engine_result", response.result.get("error", "unknown"))
+        except Exception as error:
+            entry["submit_result"] = repr(error)
+            entry["retry"] = True
+            return
+        entry["retry"] = entry["submit_result"] in RESUBMIT
+        # malformed transactions never make it into a ledger
+        if entry["submit_result"].startswith("tem") and txid in self.pending:
+            self.settle(txid, entry["submit_result"], None)
+
+    async def submit(self, blob: str) -> asyncio.Future:
+        """submit a signed blob, returns a future resolved with its final record once validated or expired\n
+        the blob must carry a LastLedgerSequence, without one a transaction that never validates would never settle"""
+        txid = tx_hash(blob)
+        if txid in self.pending:
+            return self.pending[txid]["future"]
+        last_ledger_sequence = decode(blob).get("LastLedgerSequence")
+        if last_ledger_sequence is None:
+            raise ValueError(f"{txid} has no LastLedgerSequence")
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self.pending[txid] = {
+            "blob": blob,
+            "last_ledger_sequence": last_ledger_sequence,
+            "future": future,
+            "attempts": 0,
+            "submit_result": None,
+            "retry": False}
+        await self.send(txid)
+        return future
+
+    async def submit_many(self, blobs: list) -> list:
+        """submit signed blobs concurrently and wait for all of them, returns their final records in order"""
+        futures = await asyncio.gather(*[self.submit(blob) for blob in blobs])
+        return await asyncio.gather(*futures)
+
+    def settle(self, txid: str, result: str, ledger_index: int) -> None:
+        entry = self.pending.pop(txid)
+        if not entry["future"].done():
+            entry["future"].set_result({
+                "txid": txid,
+                "result": result,
+                "ledger_index": ledger_index,
+                "submit_result": entry["submit_result"],
+                "attempts": entry["attempts"]})
+
+    async def process_ledger(self, ledger_index: int) -> None:
+        """settle tracked transactions in a validated ledger, expire the ones past their LastLedgerSequence, resend the retryable rest"""
+        response = await self.client.request(Ledger(ledger_index=ledger_index, transactions=True, expand=True))
+        for transaction in response.result["ledger"].get("transactions", []):
+            if transaction["hash"] in self.pending:
+                self.settle(transaction["hash"], transaction["metaData"]["TransactionResult"], ledger_index)
+        for txid, entry in list(self.pending.items()):
+            if entry["last_ledger_sequence"] <= ledger_index:
+                self.settle(txid, "expired", None)
+        resend = [txid for txid, entry in self.pending.items() if entry["retry"] and entry["attempts"] < self.max_attempts]
+        await asyncio.gather(*[self.send(txid) for txid in resend])
+
+    async def run(self) -> None:
+        """follow validated ledgers until cancelled"""
+        while True:
+            try:
+                validated = await get_latest_validated_ledger_sequence(self.client)
+                if self.ledger_index is None or not self.pending:
+                    self.ledger_index = validated
+                while self.ledger_index < validated:
+                    await self.process_ledger(self.ledger_index + 1)
+                    self.ledger_index += 1
+                self.errors = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                # a node hiccup is retried next round with the same ledgers, a persistent failure fails everything pending
+                self.errors += 1
+                logger.warning("reading validated ledgers failed (%d in a row): %r", self.errors, error)
+                if self.errors >= self.max_errors:
+                    self.fail(error)
+            await asyncio.sleep(self.poll_interval)
+
+    def fail(self, error: Exception) -> None:
+        """fail every pending future with `error`"""
+        pending, self.pending = self.pending, {}
+        for entry in pending.values():
+            if not entry["future"].done():
+                entry["future"].set_exception(error)
+        self.errors = 0
+
+    def start(self) -> None:
+        """start the ledger follower on the running event loop"""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def __aenter__(self) -> "xSubmitter":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from typing import Union
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.models import Ledger
+
+from Objects import cancel_xrp_escrow_async, finish_xrp_escrow_async, iter_account_objects
+from Transport import x_client
+
+"""
+Escrow sweeper
+
+Finds every matured escrow of a set of accounts and builds the EscrowFinish / EscrowCancel for it,
+used to settle payments scheduled with `Objects.schedule_xrp` in bulk
+"""
+
+
+class xEscrowSweeper:
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], sender_addr: str, concurrency: int = 10, limit: int = 200) -> None:
+        """`sender_addr` signs the finish / cancel transactions, any account may finish or cancel a matured escrow\n
+        `concurrency` bounds the requests in flight, `limit` is the AccountObjects page size"""
+        self.client = x_client(url)
+        self.sender_addr = sender_addr
+        self.concurrency = concurrency
+        self.limit = limit
+
+    async def escrows(self, wallet_addr: str) -> list:
+        """return every escrow an account sent or will receive, across all AccountObjects pages"""
+        return [escrow async for escrow in iter_account_objects(self.client, wallet_addr, "escrow", self.limit)]
+
+    async def sweep(self, wallet_addrs: list, fee: str = None) -> dict:
+        """return ready to sign EscrowFinish and EscrowCancel transactions for every matured escrow of `wallet_addrs`\n
+        escrows with a crypto-condition need a fulfillment and are left out of `finish`,
+        matured escrows whose sequence could not be looked up are listed in `unresolved` with the node's error instead of built"""
+        started = time.perf_counter()
+        # the ledger judges FinishAfter / CancelAfter by the parent ledger's close time, which trails the wall clock
+        response = await self.client.request(Ledger(ledger_index="validated"))
+        now = response.result["ledger"]["close_time"]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def account_escrows(wallet_addr: str) -> list:
+            async with semaphore:
+                return await self.escrows(wallet_addr)
+
+        # an escrow shows up under both its sender and its receiver
+        escrows = {}
+        for account in await asyncio.gather(*[account_escrows(wallet_addr) for wallet_addr in dict.fromkeys(wallet_addrs)]):
+            for escrow in account:
+                escrows[escrow["index"]] = escrow
+
+        to_finish = []
+        to_cancel = []
+        for escrow in escrows.values():
+            if "PreviousTxnID" not in escrow:
+                continue
+            if "CancelAfter" in escrow and escrow["CancelAfter"] < now:
+                to_cancel.append(escrow)
+            elif "FinishAfter" in escrow and escrow["FinishAfter"] < now and "Condition" not in escrow:
+                to_finish.append(escrow)
+
+        # without its sequence the transaction would fail on ledger and still burn its fee, so a failed lookup skips the escrow
+        unresolved = []
+
+        async def build(escrow: dict, builder) -> Union[dict, None]:
+            async with semaphore:
+                try:
+                    return await builder(self.client, self.sender_addr, escrow["Account"], escrow["PreviousTxnID"], fee=fee)
+                except XRPLRequestFailureException as error:
+                    unresolved.append({"escrow_id": escrow["index"], "prev_txn_id": escrow["PreviousTxnID"], "error": error.error})
+                    return None
+
+        tasks = [asyncio.create_task(build(escrow, finish_xrp_escrow_async)) for escrow in to_finish]
+        tasks += [asyncio.create_task(build(escrow, cancel_xrp_escrow_async)) for escrow in to_cancel]
+        try:
+            built = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finish = [txn for txn in built[:len(to_finish)] if txn is not None]
+        cancel = [txn for txn in built[len(to_finish):] if txn is not None]
+
+        seconds = time.perf_counter() - started
+        return {
+            "finish": finish,
+            "cancel": cancel,
+            "unresolved": unresolved,
+            "escrows": len(escrows),
+            "seconds": seconds,
+            "escrows_per_second": len(escrows) / seconds if seconds else 0.0}
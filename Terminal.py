@@ -1,15 +1,87 @@
-import requests
+import asyncio
+from typing import Union
+
+from httpx import AsyncClient, Limits, TransportError
 from xrpl.asyncio.clients import AsyncJsonRpcClient
 from xrpl.models import AccountDelete, AccountInfo, AccountSet,GatewayBalances, IssuedCurrencyAmount, TrustSet, TrustSetFlag
-from Misc import mm, transfer_fee_to_xrp_format, validate_hex_to_symbol, validate_symbol_to_hex, xrp_format_to_nft_fee
+from Currency import hex_to_text, text_to_hex, validate_hex_to_symbol, validate_symbol_to_hex
+from Misc import mm, transfer_fee_to_xrp_format, xrp_format_to_nft_fee
 from xrpl.utils import str_to_hex
-from x_constants import M_SOURCE_TAG
+from Transport import x_client
+from x_constants import M_SOURCE_TAG, XURLS_
 
 
 
 class xEng(AsyncJsonRpcClient):
-    def __init__(self, url: str) -> None:
-        self.client = AsyncJsonRpcClient(url)
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], timeout: float = 10.0, retries: int = 3, backoff: float = 0.5,
+        http_client: AsyncClient = None) -> None:
+        """`url` is a node url or a shared `Transport.xTransport`\n
+        `timeout`, `retries` and `backoff` (seconds, doubled per retry) apply to the xrpldata api\n
+        xrpldata is fetched through `http_client` when given, it stays open on `close` as its owner closes it,
+        otherwise through a pool of its own, use `async with xEng(url) as eng` or `close` to release it"""
+        self.client = x_client(url)
+        self.domains = {} # issuer -> domain, filled by issuer_domains
+        self.owns_http_client = http_client is None
+        self.http_client = http_client if http_client is not None else AsyncClient(timeout=timeout, limits=Limits(max_connections=10, max_keepalive_connections=10))
+        self.retries = retries
+        self.backoff = backoff
+
+    async def close(self) -> None:
+        """close the pooled xrpldata connections, a shared `http_client` is left to its owner"""
+        if self.owns_http_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self) -> "xEng":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def xrpldata_get(self, url: str, params: dict = None) -> dict:
+        """get an xrpldata url, retrying connection errors, 429 and 5xx responses with exponential backoff"""
+        delay = self.backoff
+        for _ in range(self.retries):
+            try:
+                response = await self.http_client.get(url, params=params)
+                if response.status_code != 429 and response.status_code < 500:
+                    return response.json()
+            except TransportError:
+                pass
+            await asyncio.sleep(delay)
+            delay *= 2
+        response = await self.http_client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def xrpldata(self, path: str, key: str, mainnet: bool = True) -> list:
+        """return every `key` item of an xrpldata xls20-nfts endpoint, following the `marker` when a result is paged"""
+        url = (XURLS_["MAINNET_XRPLDATA"] if mainnet else XURLS_["TESTNET_XRPLDATA"]) + path
+        items = []
+        params = None
+        while True:
+            result = await self.xrpldata_get(url, params)
+            data = result.get("data")
+            if not isinstance(data, dict):
+                break
+            items.extend(data.get(key, []))
+            if not data.get("marker"):
+                break
+            params = {"marker": data["marker"]}
+        return items
+
+    async def issuer_domains(self, issuers: list, concurrency: int = 10) -> dict:
+        """return the domain of each issuer, every distinct issuer is looked up at most once per xEng"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def lookup(issuer: str) -> None:
+            async with semaphore:
+                acc_info = AccountInfo(account=issuer, ledger_index="validated")
+                response = await self.client.request(acc_info)
+            account_data = response.result.get("account_data", {})
+            self.domains[issuer] = hex_to_text(account_data["Domain"]) if "Domain" in account_data else ""
+
+        await asyncio.gather(*[lookup(issuer) for issuer in dict.fromkeys(issuers) if issuer not in self.domains])
+        return {issuer: self.domains[issuer] for issuer in issuers}
 
     async def created_tokens_issuer(self, wallet_addr: str) -> list:
         """returns all tokens an account has created as the issuer"""
@@ -19,17 +91,13 @@ class xEng(AsyncJsonRpcClient):
         result = response.result
         if 'obligations' in result:
             obligations = result["obligations"]
+            domains = await self.issuer_domains([wallet_addr])
             for key, value in obligations.items():
                 asset = {}
                 asset["token"] = validate_hex_to_symbol(key)
                 asset["amount"] = value
                 asset["issuer"] = wallet_addr
-                asset["domain"] = ""
-                acc_info = AccountInfo(account=wallet_addr, ledger_index="validated")
-                account_data = await self.client.request(acc_info)
-                account_data = account_data.result["account_data"]
-                if "Domain" in account_data:
-                    asset["domain"] = validate_hex_to_symbol(account_data["Domain"])
+                asset["domain"] = domains[wallet_addr]
                 created_assets.append(asset)
         return created_assets
 
@@ -42,6 +110,7 @@ class xEng(AsyncJsonRpcClient):
         result = response.result
         if 'assets' in result:
             assets = result["assets"]
+            domains = await self.issuer_domains(list(assets))
             for issuer, issuings in assets.items():
                 for iss_cur in issuings:
                     asset = {}
@@ -49,61 +118,45 @@ class xEng(AsyncJsonRpcClient):
                     asset["token"] = validate_hex_to_symbol(iss_cur["currency"])
                     asset["amount"] = iss_cur["value"]
                     asset["manager"] = wallet_addr
-                    asset["domain"] = ""
-                    acc_info = AccountInfo(account=asset["cold_address"], ledger_index="validated")
-                    account_data = await self.client.request(acc_info)
-                    account_data = account_data.result["account_data"]
-                    if "Domain" in account_data:
-                        asset["domain"] = validate_hex_to_symbol(account_data["Domain"])
+                    asset["domain"] = domains[issuer]
                     created_assets.append(asset)
         return created_assets
 
     async def created_nfts(self, wallet_addr: str, mainnet: bool = True) -> list:
         """return all nfts an account created as an issuer \n this method uses an external api"""
         created_nfts = []
-        result = requests.get(f"https://api.xrpldata.com/api/v1/xls20-nfts/issuer/{wallet_addr}") if mainnet else requests.get(f"https://test-api.xrpldata.com/api/v1/xls20-nfts/issuer/{wallet_addr}")
-        result = result.json()
-        if "data" in result and "nfts" in result["data"]:
-            nfts = result["data"]["nfts"]
-            for nft in nfts:
-                nft_data = {}
-                nft_data["nftoken_id"] = nft["NFTokenID"]
-                nft_data["issuer"] = nft["Issuer"]
-                nft_data["owner"] = nft["Owner"]
-                nft_data["taxon"] = nft["Taxon"]
-                nft_data["sequence"] = nft["Sequence"]
-                nft_data["transfer_fee"] = xrp_format_to_nft_fee(nft["TransferFee"])
-                nft_data["flags"] = nft["Flags"]
-                nft_data["uri"] = validate_hex_to_symbol(nft["URI"])
-                created_nfts.append(nft_data)
+        for nft in await self.xrpldata(f"issuer/{wallet_addr}", "nfts", mainnet):
+            nft_data = {}
+            nft_data["nftoken_id"] = nft["NFTokenID"]
+            nft_data["issuer"] = nft["Issuer"]
+            nft_data["owner"] = nft["Owner"]
+            nft_data["taxon"] = nft["Taxon"]
+            nft_data["sequence"] = nft["Sequence"]
+            nft_data["transfer_fee"] = xrp_format_to_nft_fee(nft["TransferFee"])
+            nft_data["flags"] = nft["Flags"]
+            nft_data["uri"] = hex_to_text(nft["URI"])
+            created_nfts.append(nft_data)
         return created_nfts
 
-    async def created_taxons(wallet_addr: str, mainnet: bool = True) -> list:
+    async def created_taxons(self, wallet_addr: str, mainnet: bool = True) -> list:
         """return all taxons an account has used to create nfts"""
-        taxons = []
-        result = requests.get(f"https://api.xrpldata.com/api/v1/xls20-nfts/taxon/{wallet_addr}").json() if mainnet else requests.get(f"https://test-api.xrpldata.com/api/v1/xls20-nfts/taxon/{wallet_addr}").json()
-        if "data" in result and "taxons" in result["data"]:
-            taxons = result["data"]["taxons"]
-        return taxons
+        return await self.xrpldata(f"taxon/{wallet_addr}", "taxons", mainnet)
 
-    async def created_nfts_taxon(wallet_addr: str, taxon: int, mainnet: bool = True):
+    async def created_nfts_taxon(self, wallet_addr: str, taxon: int, mainnet: bool = True) -> list:
         """return all nfts with similar taxon an account has created"""
         created_nfts = []
-        result = requests.get(f"https://api.xrpldata.com/api/v1/xls20-nfts/issuer/{wallet_addr}/taxon/{taxon}").json() if mainnet else requests.get(f"https://test-api.xrpldata.com/api/v1/xls20-nfts/issuer/{wallet_addr}/taxon/{taxon}").json()
-        if "data" in result and "nfts" in result["data"]:
-            nfts = result["data"]["nfts"]
-            for nft in nfts:
-                nft_data = {}
-                nft_data["nftoken_id"] = nft["NFTokenID"]
-                nft_data["issuer"] = nft["Issuer"]
-                nft_data["owner"] = nft["Owner"]
-                nft_data["taxon"] = nft["Taxon"]
-                nft_data["sequence"] = nft["Sequence"]
-                nft_data["transfer_fee"] = xrp_format_to_nft_fee(
-                    nft["TransferFee"])
-                # nft_data["flags"] = nft["Flags"]
-                nft_data["uri"] = validate_hex_to_symbol(nft["URI"])
-                created_nfts.append(nft_data)
+        for nft in await self.xrpldata(f"issuer/{wallet_addr}/taxon/{taxon}", "nfts", mainnet):
+            nft_data = {}
+            nft_data["nftoken_id"] = nft["NFTokenID"]
+            nft_data["issuer"] = nft["Issuer"]
+            nft_data["owner"] = nft["Owner"]
+            nft_data["taxon"] = nft["Taxon"]
+            nft_data["sequence"] = nft["Sequence"]
+            nft_data["transfer_fee"] = xrp_format_to_nft_fee(
+                nft["TransferFee"])
+            # nft_data["flags"] = nft["Flags"]
+            nft_data["uri"] = hex_to_text(nft["URI"])
+            created_nfts.append(nft_data)
         return created_nfts
 
 
@@ -145,7 +198,7 @@ def delete_account( sender_addr: str, receiver_addr: str, fee: str = None) -> di
 
 def modify_domain( sender_addr: str, domain: str, fee: str = None) -> dict:
     """modify the domain of an account"""
-    txn = AccountSet(account=sender_addr, domain=validate_symbol_to_hex(domain), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
+    txn = AccountSet(account=sender_addr, domain=text_to_hex(domain), fee=fee, memos=mm(), source_tag=M_SOURCE_TAG)
     return txn.to_xrpl()
 
 def modify_token_transfer_fee( sender_addr: str, transfer_fee: float, fee: str = None):
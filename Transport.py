@@ -0,0 +1,135 @@
+import json
+import time
+from collections import OrderedDict
+from json import JSONDecodeError
+from typing import Union
+
+from httpx import AsyncClient, Limits, Timeout
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+from xrpl.models.requests import Ledger
+from xrpl.models.requests.request import Request
+from xrpl.models.response import Response
+
+try:
+    import h2  # noqa: F401 # http/2 support for httpx is optional
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+"""
+Shared rpc transport
+
+xrpl-py's AsyncJsonRpcClient opens (and tears down) a new http client on every request,
+one xTransport keeps a pool of keep-alive connections to the node and can be handed to
+xWallet, xObject, xOrderBook, xNFT and xEng in place of a url
+
+an xLedgerCache wrapped around a url or transport answers repeated `ledger_index="validated"`
+queries locally until the next ledger validates
+"""
+
+
+class xTransport(AsyncJsonRpcClient):
+    def __init__(self, url: str, max_connections: int = 100, max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0, timeout: float = 10.0, http2: bool = HTTP2) -> None:
+        """a transport talks to a single node, so `max_connections` is also the per host limit\n
+        http2 is used when the `h2` package is installed and the node negotiates it"""
+        super().__init__(url)
+        self.http_client = AsyncClient(
+            limits=Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections, keepalive_expiry=keepalive_expiry),
+            timeout=Timeout(timeout),
+            http2=http2 and HTTP2)
+
+    async def request_impl(self, request: Request) -> Response:
+        response = await self.http_client.post(self.url, json=request_to_json_rpc(request))
+        try:
+            return json_to_response(response.json())
+        except JSONDecodeError:
+            raise XRPLRequestFailureException({"error": response.status_code, "error_message": response.text})
+
+    async def close(self) -> None:
+        """close every pooled connection"""
+        await self.http_client.aclose()
+
+    async def __aenter__(self) -> "xTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class xLedgerCache(AsyncJsonRpcClient):
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], max_size: int = 4096, probe_interval: float = 1.0) -> None:
+        """`url` is a node url or an `xTransport` to send misses through, `max_size` bounds the cached responses\n
+        the validated ledger index is re-read at most every `probe_interval` seconds, ledgers close every ~4s\n
+        cached responses are shared between callers and must not be mutated"""
+        self.client = x_client(url)
+        super().__init__(self.client.url)
+        self.max_size = max_size
+        self.probe_interval = probe_interval
+        self.entries = OrderedDict()
+        self.ledger_index = 0
+        self.probed = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def advance(self, ledger_index: int) -> None:
+        """move the known validated ledger forward, e.g. from an `xStream` ledger event"""
+        if ledger_index > self.ledger_index:
+            self.ledger_index = ledger_index
+            self.probed = time.monotonic()
+
+    async def validated_ledger(self) -> int:
+        """return the newest validated ledger index known, asking the node when the last probe is stale"""
+        if time.monotonic() - self.probed >= self.probe_interval:
+            self.probed = time.monotonic()
+            response = await self.client.request(Ledger(ledger_index="validated"))
+            if response.is_successful():
+                self.advance(response.result["ledger_index"])
+        return self.ledger_index
+
+    async def request_impl(self, request: Request) -> Response:
+        params = request.to_dict()
+        if params.get("ledger_index") != "validated":
+            return await self.client.request(request)
+        params.pop("id", None)
+        key = json.dumps(params, sort_keys=True, default=str)
+        ledger_index = await self.validated_ledger()
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] >= ledger_index:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        response = await self.client.request(request)
+        if response.is_successful():
+            # the node may already be a ledger ahead of the last probe
+            served = response.result.get("ledger_index", ledger_index)
+            self.advance(served)
+            self.entries[key] = (served, response)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return response
+
+    def stats(self) -> dict:
+        """return the hit and miss counters"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "ledger_index": self.ledger_index,
+            "hit_rate": self.hits / total if total else 0.0}
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+def x_client(url: Union[str, AsyncJsonRpcClient]) -> AsyncJsonRpcClient:
+    """return the client a query class should use, pass a shared `xTransport` to reuse its connections"""
+    if isinstance(url, AsyncJsonRpcClient):
+        return url
+    return AsyncJsonRpcClient(url)
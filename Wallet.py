@@ -1,15 +1,20 @@
+import asyncio
 from decimal import Decimal
-from typing import Union
+from typing import Callable, Union
 
 from xrpl.asyncio.clients import AsyncJsonRpcClient
-from xrpl.clients import JsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
 from xrpl.asyncio.ledger import get_fee
 from xrpl.models import (AccountInfo, AccountLines, AccountNFTs, AccountTx, IssuedCurrencyAmount, Memo, NFTokenAcceptOffer,NFTokenCreateOffer, NFTokenCreateOfferFlag, Payment,PaymentFlag)
-from xrpl.utils import drops_to_xrp, ripple_time_to_datetime, xrp_to_drops
+from xrpl.utils import ripple_time_to_datetime
 
-from Misc import (is_hex, memo_builder, validate_hex_to_symbol, validate_symbol_to_hex,
-                  xrp_format_to_nft_fee)
+from Amount import to_drops, xrp_string
+from Currency import hex_to_text, is_lp_token, validate_hex_to_symbol, validate_symbol_to_hex
+from Flags import NFTOKEN_CODEC
+from Misc import memo_builder, xrp_format_to_nft_fee
+from Records import xTrustLine
 
+from Transport import x_client
 from x_constants import D_DATA, D_TYPE, M_SOURCE_TAG
 
 
@@ -18,7 +23,7 @@ def send_xrp( sender_addr: str, receiver_addr: str, amount: Union[float, Decimal
     """send xrp"""
     txn = Payment(
         account=sender_addr,
-        amount=xrp_to_drops(amount),
+        amount=to_drops(amount),
         destination=receiver_addr,
         destination_tag=destination_tag,
         source_tag=M_SOURCE_TAG, fee=fee, memos=[memo])
@@ -67,164 +72,228 @@ def receive_nft(sender_addr: str, nft_sell_id: str, fee: str = None) -> dict:
 
 
 
+def balance_record(account_data: Union[dict, None]) -> dict:
+    """return the spendable xrp balance (after reserves) and objects count of an AccountRoot"""
+    _balance = 0
+    owner_count = 0
+    balance = 0
+    if account_data is not None:
+        _balance = int(account_data["Balance"]) - 10000000
+        owner_count = int(account_data["OwnerCount"])
+        balance = _balance - (2000000 * owner_count)
+    return {
+        "object_count": owner_count,
+        "balance": xrp_string(balance)}
+
+def payment_record(transaction: dict) -> dict:
+    """parse an account_tx payment into a sent or received xrp / token payment"""
+    transact = {}
+    transact["sender"] = transaction["tx"]["Account"]
+    transact["receiver"] = transaction["tx"]["Destination"]
+    if isinstance(transaction["tx"]['Amount'], str):
+        transact["token"] = "XRP"
+        transact["issuer"] = ""
+        transact["amount"] = xrp_string(transaction["meta"]["delivered_amount"]) if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], str) else xrp_string(transaction["tx"]["Amount"])
+    if isinstance(transaction["tx"]["Amount"], dict) or "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict):
+        transact["token"] = validate_hex_to_symbol(transaction["meta"]["delivered_amount"]["currency"]) if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else validate_hex_to_symbol(transaction["tx"]["Amount"]["currency"])
+        transact["issuer"] = transaction["meta"]["delivered_amount"]["issuer"] if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else hex_to_text(transaction["tx"]["Amount"]["issuer"])
+        transact["amount"] = transaction["meta"]["delivered_amount"]["value"] if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else transaction["tx"]["Amount"]["value"]
+    transact["fee"] = xrp_string(transaction["tx"]["Fee"])
+    transact["timestamp"] = str(ripple_time_to_datetime(transaction["tx"]["date"]))
+    transact["result"] = transaction["meta"]["TransactionResult"]
+    transact["txid"] = transaction["tx"]["hash"]
+    transact["tx_type"] = transaction["tx"]["TransactionType"]
+    # transact["memo"] = transaction["tx"]["Memo"] // this is a list that contains dicts 'parse later'
+    return transact
+
+
 class xWallet(AsyncJsonRpcClient):
-    def __init__(self, url: str) -> None:
-        self.client = AsyncJsonRpcClient(url)
+    def __init__(self, url: Union[str, AsyncJsonRpcClient], fee_oracle=None) -> None:
+        """`url` is a node url or a shared `Transport.xTransport`\n
+        with a `Fee.xFeeOracle` the network fee is served from its cache"""
+        self.client = x_client(url)
+        self.fee_oracle = fee_oracle
 
     async def get_network_fee(self) -> str:
         """return transaction fee, to populate interface and carry out transactions"""
+        if self.fee_oracle is not None:
+            return await self.fee_oracle.get()
         return await get_fee(self.client)
 
     async def xrp_balance(self, wallet_addr: str) -> dict:
-        """return xrp balance and objects count"""
-        _balance = 0
-        owner_count = 0
-        balance = 0
+        """return xrp balance and objects count, zero for an account that does not exist\n
+        any other error response raises `XRPLRequestFailureException`"""
         acc_info = AccountInfo(account=wallet_addr, ledger_index="validated")
         response = await self.client.request(acc_info)
         result = response.result
-        if "account_data" in result:
-            _balance = int(result["account_data"]["Balance"]) - 10000000
-            owner_count = int(result["account_data"]["OwnerCount"])
-            balance = _balance - (2000000 * owner_count)
-        return {
-            "object_count": owner_count,
-            "balance": str(drops_to_xrp(str(balance)))}
+        if not response.is_successful():
+            if result.get("error") == "actNotFound":
+                return balance_record(None)
+            raise XRPLRequestFailureException(result)
+        return balance_record(result["account_data"])
+
+    async def portfolio(self, wallet_addr: str) -> dict:
+        """return the xrp balance, tokens and nfts of an address, if one of them fails the others are cancelled"""
+        tasks = [asyncio.create_task(self.xrp_balance(wallet_addr)), asyncio.create_task(self.account_tokens(wallet_addr)),
+            asyncio.create_task(self.account_nfts(wallet_addr))]
+        try:
+            balance, tokens, nfts = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return {"address": wallet_addr, "balance": balance, "tokens": tokens, "nfts": nfts, "error": ""}
+
+    async def portfolios(self, wallet_addrs: list, concurrency: int = 10):
+        """yield the portfolio of every address as soon as it is fetched, with at most `concurrency` addresses in flight\n
+        an address that fails is yielded with its `error` set instead of stopping the batch\n
+        only `concurrency` workers run, and they are cancelled when the caller stops iterating early"""
+        wallet_addrs = list(wallet_addrs)
+        pending = iter(wallet_addrs)
+        fetched = asyncio.Queue()
+
+        async def worker() -> None:
+            for wallet_addr in pending:
+                try:
+                    portfolio = await self.portfolio(wallet_addr)
+                except Exception as error:
+                    portfolio = {"address": wallet_addr, "balance": None, "tokens": [], "nfts": [], "error": repr(error)}
+                fetched.put_nowait(portfolio)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(wallet_addrs)))]
+        try:
+            for _ in wallet_addrs:
+                yield await fetched.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
     async def xrp_transactions(self, wallet_addr: str) -> dict:
         """return all xrp payment transactions an address has carried out"""
-        transactions_dict = {}
-        sent = []
-        received = []
-        acc_tx = AccountTx(account=wallet_addr)
-        response = await self.client.request(acc_tx)
-        result = response.result
-        if "transactions" in result:
-            for transaction in result["transactions"]:
-                if transaction["tx"]["TransactionType"] == "Payment":
-                    transact = {}
-                    transact["sender"] = transaction["tx"]["Account"]
-                    transact["receiver"] = transaction["tx"]["Destination"]
-                    transact["amount"] = str(drops_to_xrp(str(transaction["meta"]["delivered_amount"]))) if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], str) else str(drops_to_xrp(str(transaction["tx"]["Amount"])))
-                    transact["fee"] = str(drops_to_xrp(str(transaction["tx"]["Fee"])))
-                    transact["timestamp"] = str(ripple_time_to_datetime(transaction["tx"]["date"]))
-                    transact["result"] = transaction["meta"]["TransactionResult"]
-                    transact["txid"] = transaction["tx"]["hash"]
-                    transact["tx_type"] = transaction["tx"]["TransactionType"]
-                    # transact["memo"] = transaction["tx"]["Memo"] // this is a list that contains dicts 'parse later'
-                    if transact["sender"] == wallet_addr:
-                        sent.append(transact)
-                    elif transact["sender"] != wallet_addr:
-                        received.append(transact)
-        transactions_dict["sent"] = sent
-        transactions_dict["received"] = received
-        return transactions_dict
+        return (await self.transaction_history(wallet_addr))["xrp"]
 
     async def token_transactions(self, wallet_addr: str) -> dict:
         """return all token payment transactions an account has carried out"""
-        transactions_dict = {}
-        sent = []
-        received = []
-        acc_tx = AccountTx(account=wallet_addr)
-        response = await self.client.request(acc_tx)
-        result = response.result
-        if "transactions" in result:
-            for transaction in result["transactions"]:
-                if transaction["tx"]["TransactionType"] == "Payment" and isinstance(transaction["tx"]["Amount"], dict):  
-                    transact = {}
-                    transact["sender"] = transaction["tx"]["Account"]
-                    transact["receiver"] = transaction["tx"]["Destination"]
-                    transact["token"] = validate_hex_to_symbol(transaction["meta"]["delivered_amount"]["currency"]) if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else validate_hex_to_symbol(transaction["tx"]["Amount"]["currency"])
-                    transact["issuer"] = transaction["meta"]["delivered_amount"]["issuer"] if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else validate_hex_to_symbol(transaction["tx"]["Amount"]["issuer"])
-                    transact["amount"] = transaction["meta"]["delivered_amount"]["value"] if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else validate_hex_to_symbol(transaction["tx"]["Amount"]["value"])
-                    transact["fee"] = str(drops_to_xrp(str(transaction["tx"]["Fee"])))
-                    transact["timestamp"] = str(ripple_time_to_datetime(transaction["tx"]["date"]))
-                    transact["result"] = transaction["meta"]["TransactionResult"]
-                    transact["txid"] = transaction["tx"]["hash"]
-                    transact["tx_type"] = transaction["tx"]["TransactionType"]
-                    # transact["memo"] = transaction["tx"]["Memo"] // this is a list that contains dicts 'parse later'
-                    if transact["sender"] == wallet_addr:
-                        sent.append(transact)
-                    elif transact["sender"] != wallet_addr:
-                        received.append(transact)
-        transactions_dict["sent"] = sent
-        transactions_dict["received"] = received
-        return transactions_dict
-
-    async def payment_transactions(self, wallet_addr: str) -> dict:
-        """return all payment transactions for xrp and tokens both sent and received"""
-        transactions = []
-        acc_tx = AccountTx(account=wallet_addr)
-        response = await self.client.request(acc_tx)
-        result = response.result
-        if "transactions" in result:
-            for transaction in result["transactions"]:
-                if transaction["tx"]["TransactionType"] == "Payment":
-                    transact = {}
-                    transact["sender"] = transaction["tx"]["Account"]
-                    transact["receiver"] = transaction["tx"]["Destination"]
-                    if isinstance(transaction["tx"]['Amount'], str):
-                        transact["token"] = "XRP"
-                        transact["issuer"] = ""
-                        transact["amount"] = str(drops_to_xrp(str(transaction["meta"]["delivered_amount"]))) if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], str) else str(drops_to_xrp(str(transaction["tx"]["Amount"])))
-                    if isinstance(transaction["tx"]["Amount"], dict) or "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict):
-                        transact["token"] = validate_hex_to_symbol(transaction["meta"]["delivered_amount"]["currency"]) if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else validate_hex_to_symbol(transaction["tx"]["Amount"]["currency"])
-                        transact["issuer"] = transaction["meta"]["delivered_amount"]["issuer"] if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else validate_hex_to_symbol(transaction["tx"]["Amount"]["issuer"])
-                        transact["amount"] = transaction["meta"]["delivered_amount"]["value"] if "delivered_amount" in transaction["meta"] and isinstance(transaction["meta"]["delivered_amount"], dict) else transaction["tx"]["Amount"]["value"]
-                    transact["fee"] = str(drops_to_xrp(str(transaction["tx"]["Fee"])))
-                    transact["timestamp"] = str(ripple_time_to_datetime(transaction["tx"]["date"]))
-                    transact["result"] = transaction["meta"]["TransactionResult"]
-                    transact["txid"] = transaction["tx"]["hash"]
-                    transact["tx_type"] = transaction["tx"]["TransactionType"]
-                    # transact["memo"] = transaction["tx"]["Memo"] // this is a list that contains dicts 'parse later'
-                    transactions.append(transact)
-        return transactions
+        return (await self.transaction_history(wallet_addr))["token"]
+
+    async def transaction_history(self, wallet_addr: str, limit: int = 200, ledger_index_min: int = -1, ledger_index_max: int = -1) -> dict:
+        """return the xrp, token and combined payment views of an account from a single account_tx walk\n
+        each payment is parsed once and the same record is shared by the views it belongs to"""
+        xrp_sent = []
+        xrp_received = []
+        token_sent = []
+        token_received = []
+        payments = []
+        async for payment in self.payments(wallet_addr, limit, ledger_index_min, ledger_index_max):
+            payments.append(payment)
+            sent = payment["sender"] == wallet_addr
+            if payment["token"] == "XRP":
+                if sent:
+                    xrp_sent.append(payment)
+                else:
+                    xrp_received.append(payment)
+            else:
+                if sent:
+                    token_sent.append(payment)
+                else:
+                    token_received.append(payment)
+        return {
+            "xrp": {"sent": xrp_sent, "received": xrp_received},
+            "token": {"sent": token_sent, "received": token_received},
+            "payments": payments}
 
+    async def payment_transactions(self, wallet_addr: str) -> list:
+        """return all payment transactions for xrp and tokens both sent and received"""
+        return [payment async for payment in self.payments(wallet_addr)]
+
+    async def iter_account_tx(self, wallet_addr: str, limit: int = 200, ledger_index_min: int = -1, ledger_index_max: int = -1):
+        """yield every transaction of an account newest first, following the `marker` page by page\n
+        -1 for `ledger_index_min`/`ledger_index_max` means the earliest/latest validated ledger the node has\n
+        an error response raises `XRPLRequestFailureException` rather than ending the history early"""
+        marker = None
+        while True:
+            acc_tx = AccountTx(account=wallet_addr, ledger_index_min=ledger_index_min, ledger_index_max=ledger_index_max, limit=limit, marker=marker)
+            response = await self.client.request(acc_tx)
+            result = response.result
+            if not response.is_successful():
+                raise XRPLRequestFailureException(result)
+            for transaction in result.get("transactions", []):
+                yield transaction
+            marker = result.get("marker")
+            if marker is None:
+                break
+
+    async def payments(self, wallet_addr: str, limit: int = 200, ledger_index_min: int = -1, ledger_index_max: int = -1,
+        stop: Callable[[dict], bool] = None):
+        """stream every xrp and token payment an account sent or received, newest first\n
+        `limit` is the page size, iteration ends before the first payment `stop(payment)` returns True for"""
+        async for transaction in self.iter_account_tx(wallet_addr, limit, ledger_index_min, ledger_index_max):
+            if transaction["tx"]["TransactionType"] == "Payment":
+                payment = payment_record(transaction)
+                if stop is not None and stop(payment):
+                    break
+                yield payment
+
+
+    async def iter_account_lines(self, wallet_addr: str, limit: int = 400, marker=None, ledger_index: Union[str, int] = "validated"):
+        """yield the trust lines of an account page by page as {"lines", "marker", "ledger_index"}, following the `marker`\n
+        every page is read from the ledger the first one resolved to, pass a saved `marker` and `ledger_index` to resume\n
+        an error response raises `XRPLRequestFailureException` rather than passing for the last page"""
+        while True:
+            req = AccountLines(account=wallet_addr, ledger_index=ledger_index, limit=limit, marker=marker)
+            response = await self.client.request(req)
+            result = response.result
+            if not response.is_successful():
+                raise XRPLRequestFailureException(result)
+            ledger_index = result.get("ledger_index", ledger_index)
+            marker = result.get("marker")
+            yield {"lines": result.get("lines", []), "marker": marker, "ledger_index": ledger_index}
+            if marker is None:
+                break
+
+    async def stream_tokens(self, wallet_addr: str, limit: int = 400):
+        """yield every token except LP tokens a wallet address is holding as an `xTrustLine`, page by page\n
+        an account that does not exist holds none, any other error response raises `XRPLRequestFailureException`"""
+        try:
+            async for page in self.iter_account_lines(wallet_addr, limit):
+                for line in page["lines"]:
+                    if is_lp_token(line["currency"]):
+                        pass
+                    else:
+                        # filter lp tokens
+                        """Query for domain and transfer rate with info.get_token_info()"""
+                        yield xTrustLine(line)
+        except XRPLRequestFailureException as error:
+            if error.error != "actNotFound":
+                raise
 
     async def account_tokens(self, wallet_addr: str) -> list:
         """returns all tokens except LP tokens a wallet address is holding with their respective issuers, limit and balances"""
-        assets = []
-        acc_info = AccountLines(account=wallet_addr, ledger_index="validated")
-        response = await self.client.request(acc_info)
-        result = response.result
-        if "lines" in result:
-            lines = result["lines"]
-            for line in lines:
-                if isinstance(is_hex(line["currency"]), Exception):
-                    pass
-                else:
-                    asset = {}
-                    # filter lp tokens
-                    asset["token"] = validate_hex_to_symbol(line["currency"])
-                    asset["issuer"] = line["account"]
-                    asset["amount"] = line["balance"]
-                    asset["limit"] = line["limit"]  # the max an account can handle
-                    asset["freeze_status"] = False
-                    asset["ripple_status"] = False
-                    if "no_ripple" in line:
-                        asset["ripple_status"] = line["no_ripple"]  # no ripple = true, means rippling is disabled which is good; else bad
-                    if "freeze" in line:
-                        asset["freeze_status"] = line["freeze"]
-                    """Query for domain and transfer rate with info.get_token_info()"""
-                    assets.append(asset)
-        return assets
+        return [asset.to_dict() async for asset in self.stream_tokens(wallet_addr)]
 
     async def account_nfts(self, wallet_addr: str) -> list:
-        "return all nfts an account is holding"
+        """return all nfts an account is holding, none for an account that does not exist\n
+        any other error response raises `XRPLRequestFailureException`"""
         account_nft = []
         acc_info = AccountNFTs(account=wallet_addr, id="validated")
         response = await self.client.request(acc_info)
         result = response.result
+        if not response.is_successful():
+            if result.get("error") == "actNotFound":
+                return account_nft
+            raise XRPLRequestFailureException(result)
         if "account_nfts" in result:
             account_nfts = result["account_nfts"] 
             for nfts in account_nfts:
                 nft = {}
                 nft["flags"] = nfts["Flags"] if "Flags" in nfts else 0
+                nft["flag_names"] = NFTOKEN_CODEC.decode(nft["flags"])
                 nft["issuer"] = nfts["Issuer"]
                 nft["id"] = nfts["NFTokenID"]
                 nft["taxon"] = nfts["NFTokenTaxon"]
                 nft["serial"] = nfts["nft_serial"]
-                nft["uri"] = validate_hex_to_symbol(nfts["URI"]) if "URI" in nfts else ""
+                nft["uri"] = hex_to_text(nfts["URI"]) if "URI" in nfts else ""
                 nft["transfer_fee"] = xrp_format_to_nft_fee(nfts["TransferFee"]) if "TransferFee" in nfts else 0
                 account_nft.append(nft)
         return account_nft
@@ -234,8 +303,8 @@ class xWallet(AsyncJsonRpcClient):
 
 # client = AsyncJsonRpcClient("http://s.devnet.rippletest.net:51234")
 # client = AsyncJsonRpcClient("https://s.altnet.rippletest.net:51234")
-client = JsonRpcClient("https://s.altnet.rippletest.net:51234")
-d = xWallet(client.url)
+# client = JsonRpcClient("https://s.altnet.rippletest.net:51234")
+# d = xWallet(client.url)
 # d = xWallet("https://xrplcluster.com")
 
 # acc_info = AccountLines(account="rGiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W", id="validated")
@@ -265,7 +334,7 @@ d = xWallet(client.url)
 #     """send xrp"""
 #     txn = Payment(
 #         account=sender_addr,
-#         amount=xrp_to_drops(amount),
+#         amount=to_drops(amount),
 #         destination=receiver_addr,
 #         destination_tag=destination_tag,
 #         source_tag=M_SOURCE_TAG, fee=fee, memos=[memo],  flags=[
@@ -338,13 +407,13 @@ d = xWallet(client.url)
 # "USD", "10", "rBZJzEisyXt2gvRWXLxHftFRkd1vJEpBQP", True
 # ))
     
-print(send_xrp(
-    "rGiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W",
-    "rHiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W",
-    20.0,
-    1001010,
-    memo_builder("note", "TextRP prize winning")
-))
+# print(send_xrp(
+#     "rGiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W",
+#     "rHiyqjWjhsRZ8FUjBL2k5ciUa2tcptTX9W",
+#     20.0,
+#     1001010,
+#     memo_builder("note", "TextRP prize winning")
+# ))
 
 
 
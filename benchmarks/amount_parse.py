@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Amount import xAmount
+
+"""
+Amount parsing benchmark
+
+Parses a million amount fields, half xrp drops and half token values, as `xAmount` and as the
+Decimal / float the parsers used before, and reports amounts per second of each
+
+python benchmarks/amount_parse.py [count]
+"""
+
+ISSUERS = ["rvYAfWj5gh67oV6fW32ZzP3Aw4Eubs59B", "rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq", "rcEGREd8NmkKRE8GE424sksyt1tJVFZwu"]
+CURRENCIES = ["USD", "EUR", "534F4C4F00000000000000000000000000000000"]
+
+
+def amounts(count: int) -> list:
+    """`count` amount fields as rippled returns them"""
+    rng = random.Random(1)
+    fields = []
+    for index in range(count):
+        if index % 2:
+            fields.append(str(rng.randrange(1, 10 ** 14)))
+        else:
+            value = f"{rng.randrange(1, 10 ** 9)}.{rng.randrange(0, 10 ** 6):06d}".rstrip("0").rstrip(".")
+            fields.append({"currency": rng.choice(CURRENCIES), "issuer": rng.choice(ISSUERS), "value": value})
+    return fields
+
+
+def parse_decimal(amount) -> Decimal:
+    if isinstance(amount, str):
+        return Decimal(amount) / 1000000
+    return Decimal(amount["value"])
+
+
+def parse_float(amount) -> float:
+    if isinstance(amount, str):
+        return int(amount) / 1000000
+    return float(amount["value"])
+
+
+def measure(name: str, parse, fields: list) -> float:
+    started = time.perf_counter()
+    for field in fields:
+        parse(field)
+    seconds = time.perf_counter() - started
+    print(f"{name:<24}{len(fields) / seconds:>14,.0f} amounts/s")
+    return seconds
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    fields = amounts(count)
+    measure("xAmount.from_xrpl", xAmount.from_xrpl, fields)
+    measure("xAmount + value()", lambda field: xAmount.from_xrpl(field).value(), fields)
+    measure("Decimal", parse_decimal, fields)
+    measure("float", parse_float, fields)
+    # the exact parse must agree with Decimal on every amount
+    for field in fields[:10000]:
+        assert xAmount.from_xrpl(field).to_decimal() == parse_decimal(field), field
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xrpl.wallet import Wallet
+
+from Bulk import xBulkPayer
+from Transport import xTransport
+from stub_node import StubNode
+
+"""
+Bulk payment benchmark
+
+Pays a batch of xrp payments out of one account with `xBulkPayer` against a local stub node that closes a
+ledger every second and checks the tickets spent, and reports payments/minute from TicketCreate to finality
+
+python benchmarks/bulk_payments.py [payments] [processes] [ledger interval seconds]
+"""
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+    wallet = Wallet.create()
+    recipients = [Wallet.create().classic_address for _ in range(20)]
+    payments = [(recipients[index % len(recipients)], "1.5", index) for index in range(count)]
+    async with StubNode(latency=0.002, ledger_interval=interval) as node:
+        async with xTransport(node.url) as transport:
+            payer = xBulkPayer(transport, wallet, processes=processes, poll_interval=interval / 4)
+            try:
+                result = await payer.pay(payments, fee="12")
+            finally:
+                await payer.close()
+    print(f"{len(result['payments'])} payments, {result['succeeded']} succeeded in {result['seconds']:.1f}s, "
+        f"{result['payments_per_minute']:,.0f} payments/minute ({node.requests} requests)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
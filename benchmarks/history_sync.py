@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from History import xHistory
+from Transport import xTransport
+from stub_node import StubNode, address
+
+"""
+History sync benchmark
+
+Syncs an account with 100k payments from a local stub node into a fresh sqlite store, then times an
+incremental sync after ten more ledgers validate and a date range query served from the store
+
+python benchmarks/history_sync.py [transactions] [latency seconds]
+"""
+
+
+async def main() -> None:
+    transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.002
+    account = address(0)
+    async with StubNode(latency=latency, transactions=transactions) as node:
+        with tempfile.TemporaryDirectory() as directory:
+            async with xTransport(node.url) as transport:
+                history = xHistory(transport, os.path.join(directory, "history.sqlite3"))
+
+                started = time.perf_counter()
+                added = await history.sync(account, limit=400)
+                seconds = time.perf_counter() - started
+                print(f"full sync          {added:>8} payments in {seconds:7.2f}s  {added / seconds:>10,.0f} payments/s  {node.requests} requests")
+
+                node.ledger_index += 10
+                requests = node.requests
+                started = time.perf_counter()
+                added = await history.sync(account, limit=400)
+                print(f"incremental sync   {added:>8} payments in {time.perf_counter() - started:7.3f}s  {node.requests - requests} requests")
+
+                started = time.perf_counter()
+                day = history.payments(account, start=datetime.now(timezone.utc) - timedelta(days=1), token="USD")
+                print(f"last day of USD    {len(day):>8} payments in {(time.perf_counter() - started) * 1000:7.1f}ms")
+                history.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Analytics import xHolderAnalytics, xHolderBook
+from Transport import xTransport
+from stub_node import StubNode, address
+
+"""
+Holder analytics benchmark
+
+Builds the `xHolderBook` of a token with 500k holders and times the summary (rich list, gini, concentration,
+threshold counts, frozen supply) against the same numbers computed with python sorts and loops, then scans an
+issuer with a smaller holder count on a local stub node and times a full scan and a reused one
+
+python benchmarks/holders.py [holders] [scanned holders]
+"""
+
+THRESHOLDS = (1, 1000, 1000000)
+
+
+def holders(count: int) -> tuple:
+    """(holders, balances, frozen) columns of `count` trust lines, balances heavy tailed, some lines empty"""
+    rng = random.Random(1)
+    balances = [f"{rng.lognormvariate(5, 3):.6f}" if index % 20 else "0" for index in range(count)]
+    return [address(index) for index in range(count)], balances, [index % 97 == 0 for index in range(count)]
+
+
+def python_summary(holders: list, balances: list, frozen: list, top_n: int = 10) -> dict:
+    """the numbers `xHolderBook.summary` reports, computed without numpy"""
+    held = sorted([(float(balance), holder, freeze) for holder, balance, freeze in zip(holders, balances, frozen) if float(balance) > 0],
+        key=lambda row: -row[0])
+    supply = sum(row[0] for row in held)
+    count = len(held)
+    weighted = sum(rank * row[0] for rank, row in enumerate(reversed(held), 1))
+    return {
+        "holders": count,
+        "supply": supply,
+        "frozen_supply": sum(row[0] for row in held if row[2]),
+        "gini": 2.0 * weighted / (count * supply) - (count + 1) / count,
+        "top_concentration": sum(row[0] for row in held[:top_n]) / supply,
+        "holders_above": {threshold: sum(1 for row in held if row[0] >= threshold) for threshold in THRESHOLDS},
+        "top_holders": [row[1] for row in held[:top_n]]}
+
+
+def timed(name: str, function) -> object:
+    started = time.perf_counter()
+    result = function()
+    print(f"{name:<32}{(time.perf_counter() - started) * 1000:>10.1f}ms")
+    return result
+
+
+async def scan(count: int) -> None:
+    issuer = address(-1)
+    async with StubNode(latency=0.002) as node:
+        node.overrides[issuer] = count
+        transport = xTransport(node.url)
+        analytics = xHolderAnalytics(transport, issuer)
+        started = time.perf_counter()
+        summary = await analytics.distribution("USD")
+        print(f"{'full scan, ' + str(count) + ' lines':<32}{(time.perf_counter() - started) * 1000:>10.1f}ms"
+            f"   {summary['holders']} USD holders on ledger {summary['ledger_index']}")
+        started = time.perf_counter()
+        await analytics.distribution("USD")
+        print(f"{'reused scan':<32}{(time.perf_counter() - started) * 1000:>10.1f}ms")
+        await transport.close()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    scanned = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    columns = holders(count)
+    print(f"{count} holders")
+    expected = timed("python summary", lambda: python_summary(*columns))
+    book = timed("xHolderBook", lambda: xHolderBook(*columns))
+    summary = timed("xHolderBook.summary", book.summary)
+    assert summary["holders"] == expected["holders"]
+    assert summary["holders_above"] == expected["holders_above"]
+    assert [row["holder"] for row in summary["top_holders"]] == expected["top_holders"]
+    assert abs(summary["gini"] - expected["gini"]) < 1e-9
+    if scanned:
+        asyncio.run(scan(scanned))
+
+
+if __name__ == "__main__":
+    main()
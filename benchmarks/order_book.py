@@ -0,0 +1,100 @@
+import asyncio
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xrpl.models import XRP, IssuedCurrency
+
+from Exchange import book_offer_record, xBook, xOrderBook
+from stub_node import StubNode, address
+
+"""
+Order book benchmark
+
+Builds `xBook`s from BookOffers offers selling xrp for USD, with qualities spread over several orders of
+magnitude, and times sorting, best price, depth and vwap against the string sort and python loops the
+book used before, then times `xOrderBook.sort_best_offer` against a local stub node
+
+python benchmarks/order_book.py [offers] [queries]
+"""
+
+USD = {"currency": "USD", "issuer": "rvYAfWj5gh67oV6fW32ZzP3Aw4Eubs59B"}
+
+
+def offers(count: int) -> list:
+    """`count` BookOffers offers in random order, about a tenth of them partly funded"""
+    rng = random.Random(1)
+    book = []
+    for index in range(count):
+        drops = rng.randrange(10 ** 6, 10 ** 11)
+        pays = Decimal(rng.randrange(1, 10 ** 6)) / 10 ** rng.randrange(0, 6)
+        offer = {"Account": address(index), "Flags": 0, "Sequence": index + 1, "index": f"{index:064X}",
+            "BookDirectory": "0" * 64, "TakerGets": str(drops), "TakerPays": {**USD, "value": str(pays)},
+            "quality": str((pays / drops).normalize())}
+        if index % 10 == 0:
+            offer["owner_funds"] = str(drops // 2)
+            offer["taker_gets_funded"] = str(drops // 2)
+            offer["taker_pays_funded"] = {**USD, "value": str(pays / 2)}
+        book.append(offer)
+    return book
+
+
+def loop_vwap(levels: list, size: float) -> float:
+    """the average price of filling `size` from (price, size) levels, walking them one by one"""
+    filled = cost = 0.0
+    for price, available in levels:
+        take = min(available, size - filled)
+        filled += take
+        cost += take * price
+        if filled >= size:
+            return cost / size
+    return None
+
+
+def timed(name: str, count: int, function) -> object:
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    print(f"{name:<36}{seconds * 1000:>10.1f}ms" + (f"   {count / seconds:>12,.0f}/s" if count > 1 else ""))
+    return result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    book = offers(count)
+    print(f"{count} offers, {queries} queries")
+
+    by_string = timed("sort by quality string", 1, lambda: sorted(book, key=lambda offer: offer["quality"]))
+    by_decimal = timed("sort by Decimal(quality)", 1, lambda: sorted(book, key=lambda offer: Decimal(offer["quality"])))
+    asks = timed("xBook", 1, lambda: xBook(book))
+    misplaced = sum(a["index"] != b["index"] for a, b in zip(by_string, by_decimal))
+    assert [offer["index"] for offer in asks.offers] == [offer["index"] for offer in by_decimal]
+    print(f"{misplaced} of {count} offers out of place in the string sort")
+
+    levels = [(float(offer["quality"]) * 10 ** 6, float(int(offer.get("taker_gets_funded", offer["TakerGets"]))) / 10 ** 6)
+        for offer in by_decimal]
+    sizes = [asks.depth[-1] * (index + 1) / (queries + 1) for index in range(queries)]
+    timed("python loop vwap", queries, lambda: [loop_vwap(levels, size) for size in sizes])
+    timed("xBook.vwap", queries, lambda: [asks.vwap(size) for size in sizes])
+    prices = [asks.price[int(len(asks) * (index + 1) / (queries + 1))] for index in range(queries)]
+    timed("python loop depth", queries, lambda: [sum(available for price, available in levels if price <= limit) for limit in prices])
+    timed("xBook.depth_at", queries, lambda: [asks.depth_at(limit) for limit in prices])
+    timed("xBook.best", queries, lambda: [asks.best() for _ in range(queries)])
+    timed("book_offer_record", count, lambda: [book_offer_record(offer) for offer in asks.offers])
+
+    async def sort_best_offer() -> None:
+        async with StubNode(latency=0.0, offers=count) as node:
+            order_book = xOrderBook(node.url)
+            best = await order_book.sort_best_offer(IssuedCurrency(**USD), XRP(), best_buy=True)
+            assert len(best) == count
+
+    timed("sort_best_offer (stub node)", count, lambda: asyncio.run(sort_best_offer()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Transport import xTransport
+from Wallet import xWallet
+from stub_node import StubNode, address
+
+"""
+Portfolio benchmark
+
+Fetches the balance, trust lines and nfts of a batch of addresses from a local stub node with
+`xWallet.portfolios` at 1, 10 and 100 addresses in flight and reports addresses/sec
+
+python benchmarks/portfolios.py [addresses] [latency seconds]
+"""
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.005
+    addresses = [address(index) for index in range(count)]
+    async with StubNode(latency=latency) as node:
+        for concurrency in (1, 10, 100):
+            # every address sends 3 requests at once
+            async with xTransport(node.url, max_connections=3 * concurrency) as transport:
+                wallet = xWallet(transport)
+                batch = addresses[:max(concurrency * 10, 100)] if concurrency == 1 else addresses
+                started = time.perf_counter()
+                errors = 0
+                async for portfolio in wallet.portfolios(batch, concurrency):
+                    errors += bool(portfolio["error"])
+                seconds = time.perf_counter() - started
+                print(f"concurrency {concurrency:>4}  {len(batch):>6} addresses in {seconds:6.2f}s  {len(batch) / seconds:>9,.0f} addresses/s  {errors} errors")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
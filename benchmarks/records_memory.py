@@ -0,0 +1,95 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Records import xChannel, xCheck, xEscrow, xNftOffer, xOffer, xTicket, xTrustLine
+from stub_node import address, tx_hash
+
+"""
+Record memory benchmark
+
+Parses the same ledger objects into each slotted record type and into the dicts `to_dict()` returns,
+which is what the query methods built before, and reports the bytes held per object and the build time
+
+python benchmarks/records_memory.py [objects]
+"""
+
+USD = {"currency": "USD", "issuer": "rvYAfWj5gh67oV6fW32ZzP3Aw4Eubs59B"}
+SOLO = "534F4C4F00000000000000000000000000000000"
+
+
+def trust_line(index: int) -> dict:
+    return {"account": address(index), "balance": f"{(index * 7919) % 1000003}.{index % 100:02d}", "currency": "USD" if index % 3 else SOLO,
+        "limit": "1000000000", "limit_peer": "0", "no_ripple": True, "no_ripple_peer": False, "quality_in": 0, "quality_out": 0}
+
+
+def offer(index: int) -> dict:
+    return {"LedgerEntryType": "Offer", "Account": address(index), "Flags": 0, "Sequence": index + 1, "index": tx_hash("offer", index),
+        "BookDirectory": "0" * 48 + "5503A0E5DAB8B3A0", "TakerGets": str((1000 + index) * 1000000),
+        "TakerPays": {**USD, "value": str(500 + index)}}
+
+
+def check(index: int) -> dict:
+    return {"LedgerEntryType": "Check", "index": tx_hash("check", index), "Account": address(index), "Destination": address(-1),
+        "Expiration": 750000000 + index, "SendMax": {**USD, "value": f"{index}.5"}}
+
+
+def escrow(index: int) -> dict:
+    return {"LedgerEntryType": "Escrow", "index": tx_hash("escrow", index), "Account": address(index), "Destination": address(-1),
+        "Amount": str(1000000 + index), "PreviousTxnID": tx_hash("create", index), "FinishAfter": 750000000 + index,
+        "CancelAfter": 760000000 + index}
+
+
+def channel(index: int) -> dict:
+    return {"LedgerEntryType": "PayChannel", "index": tx_hash("channel", index), "Account": address(index), "Destination": address(-1),
+        "Amount": str(10000000 + index), "Balance": str(index), "SettleDelay": 86400,
+        "PublicKey": "ED" + tx_hash("key", index)[:64], "CancelAfter": 760000000 + index}
+
+
+def ticket(index: int) -> dict:
+    return {"LedgerEntryType": "Ticket", "index": tx_hash("ticket", index), "Account": address(index), "Flags": 0,
+        "TicketSequence": index + 1}
+
+
+def nft_offer(index: int) -> dict:
+    return {"LedgerEntryType": "NFTokenOffer", "index": tx_hash("nft offer", index), "NFTokenID": tx_hash("nft", index)[:64],
+        "Owner": address(index), "Flags": 1, "Amount": str(1000000 + index), "Expiration": 750000000 + index}
+
+
+RECORDS = [("xTrustLine", xTrustLine, trust_line), ("xOffer", xOffer, offer), ("xCheck", xCheck, check),
+    ("xEscrow", xEscrow, escrow), ("xChannel", xChannel, channel), ("xTicket", xTicket, ticket), ("xNftOffer", xNftOffer, nft_offer)]
+
+
+def held(build) -> tuple:
+    """return (bytes still allocated by what `build()` returned, seconds) with the result kept alive while measuring"""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    del result
+    return size, seconds
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{count} objects per type, bytes held per object")
+    print(f"{'':<12}{'record':>10}{'to_dict()':>12}{'saved':>8}{'build':>10}{'to_dict()':>12}")
+    tracemalloc.start()
+    for name, record, raw in RECORDS:
+        objects = [raw(index) for index in range(count)]
+        record_size, record_seconds = held(lambda: [record(item) for item in objects])
+        dict_size, dict_seconds = held(lambda: [record(item).to_dict() for item in objects])
+        print(f"{name:<12}{record_size / count:>10.0f}{dict_size / count:>12.0f}{1 - record_size / dict_size:>8.0%}"
+            f"{record_seconds * 1000:>8.0f}ms{dict_seconds * 1000:>10.0f}ms")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+"""
+Stub rippled
+
+A local JSON-RPC node for the benchmarks, it answers the requests the query classes send with generated
+accounts, trust lines, nfts, payments and offers after a fixed `latency`, over keep-alive http/1.1 so pooled
+and per-request clients can be told apart (`connections` counts the ones opened). It also serves the
+xrpldata xls20-nfts endpoints over GET, paged like the real api. With a `ledger_interval` it closes a ledger
+that often and applies the blobs submitted since, checking their Sequence or TicketSequence
+
+    async with StubNode(latency=0.002) as node:
+        wallet = xWallet(xTransport(node.url))
+"""
+
+RIPPLE_EPOCH = 946684800
+
+
+def address(index: int) -> str:
+    """a fake classic address, only used as an identifier by the stub"""
+    return "r" + hashlib.sha256(str(index).encode()).hexdigest()[:33]
+
+
+def tx_hash(account: str, index: int) -> str:
+    return hashlib.sha256(f"{account}:{index}".encode()).hexdigest().upper()
+
+
+class StubNode:
+    def __init__(self, latency: float = 0.002, ledger_index: int = 80000000, lines: int = 20, nfts: int = 5,
+        transactions: int = 1000, offers: int = 200, xrpldata_nfts: int = 1000, xrpldata_page: int = 250,
+        ledger_interval: float = None) -> None:
+        """every request is answered after `latency` seconds, as if the node was that far away\n
+        every account has `lines` trust lines, `nfts` nfts and `transactions` payments, one per ledger up to the
+        validated `ledger_index`, books have `offers` offers, an xrpldata issuer `xrpldata_nfts` nfts\n
+        a new ledger validates every `ledger_interval` seconds when given, otherwise the ledger never moves"""
+        self.latency = latency
+        self.ledger_index = ledger_index
+        self.lines = lines
+        self.nfts = nfts
+        self.transactions = transactions
+        self.offers = offers
+        self.xrpldata_nfts = xrpldata_nfts
+        self.xrpldata_page = xrpldata_page
+        self.overrides = {} # account -> trust line count, e.g. one issuer with 500k holders
+        self.errors = {} # method -> rippled error returned instead of a result
+        self.ledger_interval = ledger_interval
+        self.sequences = {} # account -> next sequence
+        self.tickets = {} # account -> unused ticket sequences
+        self.queued = [] # hashes of the blobs submitted since the last ledger closed
+        self.closed = {} # ledger index -> hashes of the transactions in it
+        self.closer = None
+        self.server = None
+        self.url = None
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """start serving, returns the url to hand to the clients"""
+        self.server = await asyncio.start_server(self.serve, host, port)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        self.url = f"http://{host}:{port}"
+        if self.ledger_interval:
+            self.closer = asyncio.create_task(self.close_ledgers())
+        return self.url
+
+    def start_thread(self) -> str:
+        """serve from a daemon thread with an event loop of its own, for clients that block the caller's loop"""
+        started = threading.Event()
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        return self.url
+
+    async def close(self) -> None:
+        if self.closer is not None:
+            self.closer.cancel()
+            self.closer = None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __aenter__(self) -> "StubNode":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """answer http/1.1 requests on one connection until the client closes it"""
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if method == "POST":
+                    payload = {"result": self.rpc(json.loads(body))}
+                else:
+                    payload = self.get(target)
+                data = json.dumps(payload).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n" % len(data) + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def rpc(self, request: dict) -> dict:
+        method = request["method"]
+        params = request["params"][0] if request.get("params") else {}
+        if method in self.errors:
+            return {"error": self.errors[method], "status": "error", "request": params}
+        handler = getattr(self, "rpc_" + method, None)
+        if handler is None:
+            return {"error": "unknownCmd", "status": "error", "request": params}
+        result = handler(params)
+        result["status"] = "success"
+        return result
+
+    def close_time(self, ledger_index: int) -> int:
+        # ledgers close every 4 seconds, the validated one closed now
+        return int(time.time()) - RIPPLE_EPOCH - 4 * (self.ledger_index - ledger_index)
+
+    async def close_ledgers(self) -> None:
+        while True:
+            await asyncio.sleep(self.ledger_interval)
+            self.ledger_index += 1
+            self.closed[self.ledger_index] = self.queued
+            self.queued = []
+
+    def rpc_ledger(self, params: dict) -> dict:
+        ledger_index = params.get("ledger_index")
+        ledger_index = ledger_index if isinstance(ledger_index, int) else self.ledger_index
+        transactions = []
+        if params.get("transactions"):
+            transactions = [{"hash": txid, "metaData": {"TransactionResult": "tesSUCCESS"}} for txid in self.closed.get(ledger_index, [])]
+        return {"ledger_index": ledger_index, "validated": True, "ledger_hash": tx_hash("ledger", ledger_index),
+            "ledger": {"ledger_index": str(ledger_index), "close_time": self.close_time(ledger_index), "closed": True, "transactions": transactions}}
+
+    def rpc_submit(self, params: dict) -> dict:
+        """queue a signed blob for the next ledger if its Sequence is the next one or its ticket is unused"""
+        from xrpl.core.binarycodec import decode # only the submit benchmarks need xrpl-py on the node side
+
+        blob = params["tx_blob"]
+        transaction = decode(blob)
+        account = transaction["Account"]
+        sequence = self.sequences.get(account, 1000)
+        tickets = self.tickets.setdefault(account, set())
+        if transaction.get("TicketSequence"):
+            if transaction["TicketSequence"] not in tickets:
+                return {"engine_result": "tefNO_TICKET", "tx_blob": blob}
+            tickets.remove(transaction["TicketSequence"])
+        elif transaction["Sequence"] != sequence:
+            return {"engine_result": "tefPAST_SEQ" if transaction["Sequence"] < sequence else "terPRE_SEQ", "tx_blob": blob}
+        else:
+            sequence += 1
+        if transaction["TransactionType"] == "TicketCreate":
+            # a TicketCreate at sequence S creates tickets S+1 .. S+count
+            tickets.update(range(transaction["Sequence"] + 1, transaction["Sequence"] + 1 + transaction["TicketCount"]))
+            sequence += transaction["TicketCount"]
+        self.sequences[account] = sequence
+        self.queued.append(hashlib.sha512(bytes.fromhex("54584E00" + blob)).digest()[:32].hex().upper())
+        return {"engine_result": "tesSUCCESS", "accepted": True, "tx_blob": blob}
+
+    def rpc_account_objects(self, params: dict) -> dict:
+        """only tickets are kept, every other object type is empty"""
+        account = params["account"]
+        tickets = sorted(self.tickets.get(account, ())) if params.get("type") in (None, "ticket") else []
+        start, end, marker = self.page(len(tickets), params, 200)
+        result = {"account": account, "ledger_index": self.ledger_index, "validated": True, "account_objects": [
+            {"LedgerEntryType": "Ticket", "Account": account, "Flags": 0, "TicketSequence": ticket, "index": tx_hash(account, ticket)}
+            for ticket in tickets[start:end]]}
+        if marker is not None:
+            result["marker"] = marker
+        return result
+
+    def rpc_fee(self, params: dict) -> dict:
+        return {"current_queue_size": "0", "max_queue_size": "2000", "ledger_current_index": self.ledger_index + 1,
+            "drops": {"base_fee": "10", "median_fee": "5000", "minimum_fee": "10", "open_ledger_fee": "10"}}
+
+    def rpc_account_info(self, params: dict) -> dict:
+        account = params["account"]
+        return {"ledger_index": self.ledger_index, "validated": True, "account_data": {
+            "Account": account, "Balance": "125000000", "Flags": 0, "LedgerEntryType": "AccountRoot",
+            "OwnerCount": self.lines + self.nfts, "Sequence": self.sequences.get(account, 1000), "index": tx_hash(account, -1)}}
+
+    def page(self, count: int, params: dict, default_limit: int) -> tuple:
+        """(start, end, marker) of the page `params` asks for out of `count` items"""
+        start = int(params.get("marker") or 0)
+        end = min(count, start + int(params.get("limit") or default_limit))
+        return start, end, (str(end) if end < count else None)
+
+    def rpc_account_lines(self, params: dict) -> dict:
+        account = params["account"]
+        start, end, marker = self.page(self.overrides.get(account, self.lines), params, 200)
+        lines = []
+        for index in range(start, end):
+            # an issuer sees what its holders hold as negative balances
+            lines.append({"account": address(index) if account in self.overrides else address(-index - 1),
+                "balance": f"-{(index * 7919) % 1000003}.{index % 100:02d}" if account in self.overrides else f"{index * 10}.5",
+                "currency": "USD" if index % 3 else "534F4C4F00000000000000000000000000000000",
+                "limit": "1000000000" if account not in self.overrides else "0", "limit_peer": "1000000000" if account in self.overrides else "0",
+                "no_ripple": True, "no_ripple_peer": False, "quality_in": 0, "quality_out": 0,
+                **({"freeze": True} if index % 97 == 0 else {})})
+        result = {"account": account, "ledger_index": self.ledger_index, "validated": True, "lines": lines}
+        if marker is not None:
+            result["marker"] = marker
+        return result
+
+    def rpc_account_nfts(self, params: dict) -> dict:
+        account = params["account"]
+        return {"account": account, "ledger_index": self.ledger_index, "validated": True, "account_nfts": [{
+            "Flags": 8, "Issuer": account, "NFTokenID": tx_hash(account, index)[:64], "NFTokenTaxon": index % 3,
+            "URI": "697066733A2F2F62616679", "nft_serial": index, "TransferFee": 500} for index in range(self.nfts)]}
+
+    def rpc_account_tx(self, params: dict) -> dict:
+        """one payment per ledger, newest first, ending at the validated ledger"""
+        account = params["account"]
+        newest = self.ledger_index if params.get("ledger_index_max", -1) == -1 else min(self.ledger_index, params["ledger_index_max"])
+        oldest = self.ledger_index - self.transactions + 1
+        if params.get("ledger_index_min", -1) != -1:
+            oldest = max(oldest, params["ledger_index_min"])
+        start, end, marker = self.page(max(0, newest - oldest + 1), params, 200)
+        transactions = []
+        for offset in range(start, end):
+            ledger_index = newest - offset
+            sent = ledger_index % 2 == 0
+            amount = str(1000000 + ledger_index % 1000) if ledger_index % 5 else {"currency": "USD", "issuer": address(-1), "value": f"{ledger_index % 1000}.25"}
+            transactions.append({"validated": True, "tx": {
+                "Account": account if sent else address(ledger_index), "Destination": address(ledger_index) if sent else account,
+                "Amount": amount, "Fee": "12", "Flags": 0, "Sequence": ledger_index, "TransactionType": "Payment",
+                "date": self.close_time(ledger_index), "hash": tx_hash(account, ledger_index), "ledger_index": ledger_index},
+                "meta": {"TransactionResult": "tesSUCCESS", "delivered_amount": amount}})
+        result = {"account": account, "ledger_index_min": oldest, "ledger_index_max": newest, "transactions": transactions, "validated": True}
+        if marker is not None:
+            result["marker"] = marker
+        return result
+
+    def rpc_book_offers(self, params: dict) -> dict:
+        gets, pays = params["taker_gets"], params["taker_pays"]
+        offers = []
+        for index in range(min(self.offers, int(params.get("limit") or self.offers))):
+            gets_value, pays_value = 1000 + index, 500 + 3 * index
+            taker_gets = str(gets_value * 1000000) if gets.get("currency") == "XRP" else {**gets, "value": str(gets_value)}
+            taker_pays = str(pays_value * 1000000) if pays.get("currency") == "XRP" else {**pays, "value": str(pays_value)}
+            offers.append({"Account": address(index), "Flags": 0, "Sequence": index + 1, "index": tx_hash("offer", index),
+                "BookDirectory": "0" * 48 + "5503A0E5DAB8B3A0", "TakerGets": taker_gets, "TakerPays": taker_pays,
+                "owner_funds": str(gets_value * 1000000 * 2) if isinstance(taker_gets, str) else str(gets_value * 2),
+                "quality": repr(pays_value / gets_value)})
+        return {"ledger_index": self.ledger_index, "validated": True, "offers": offers}
+
+    def rpc_tx(self, params: dict) -> dict:
+        transaction = params["transaction"]
+        return {"hash": transaction, "Account": address(1), "TransactionType": "EscrowCreate",
+            "Sequence": int(transaction[:6], 16) + 1, "ledger_index": self.ledger_index, "validated": True}
+
+    def get(self, target: str) -> dict:
+        """the xrpldata xls20-nfts api, `issuer/<account>`, `issuer/<account>/taxon/<taxon>` and `taxon/<account>`"""
+        split = urlsplit(target)
+        parts = split.path.rstrip("/").split("/")
+        query = parse_qs(split.query)
+        if "taxon" in parts and parts[-2] == "taxon" and "issuer" not in parts:
+            return {"data": {"issuer": parts[-1], "taxons": [0, 1, 2]}}
+        issuer = parts[parts.index("issuer") + 1]
+        start = int(query.get("marker", ["0"])[0])
+        end = min(self.xrpldata_nfts, start + self.xrpldata_page)
+        nfts = [{"NFTokenID": tx_hash(issuer, index)[:64], "Issuer": issuer, "Owner": address(index), "Taxon": index % 3,
+            "Sequence": index, "TransferFee": 500, "Flags": 8, "URI": "697066733A2F2F62616679"} for index in range(start, end)]
+        data = {"issuer": issuer, "nfts": nfts}
+        if end < self.xrpldata_nfts:
+            data["marker"] = str(end)
+        return {"data": data}
+
+
+if __name__ == "__main__":
+    async def main() -> None:
+        node = StubNode()
+        print(await node.start(port=5005))
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
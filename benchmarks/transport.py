@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.models import AccountInfo
+
+from Transport import xTransport
+from stub_node import StubNode, address
+
+"""
+Transport benchmark
+
+Sends the same AccountInfo load to a local stub node through xrpl-py's AsyncJsonRpcClient, which opens a new
+http client per request, and through one pooled `xTransport`, and reports requests/sec, p50 / p99 latency and
+the connections each opened
+
+python benchmarks/transport.py [requests] [concurrency] [latency seconds]
+"""
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load(client: AsyncJsonRpcClient, requests: int, concurrency: int) -> tuple:
+    """send `requests` AccountInfo requests with `concurrency` in flight, returns (seconds, latencies)"""
+    latencies = []
+    pending = iter(range(requests))
+
+    async def worker() -> None:
+        for index in pending:
+            started = time.perf_counter()
+            response = await client.request(AccountInfo(account=address(index % 100), ledger_index="validated"))
+            assert response.is_successful(), response.result
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return time.perf_counter() - started, latencies
+
+
+async def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.002
+    print(f"{requests} requests, {concurrency} in flight, {latency * 1000:.1f}ms node latency")
+    async with StubNode(latency=latency) as node:
+        url = node.url
+        for name in ("AsyncJsonRpcClient", "xTransport"):
+            connections = node.connections
+            client = AsyncJsonRpcClient(url) if name == "AsyncJsonRpcClient" else xTransport(url, max_connections=concurrency)
+            await load(client, min(requests, 50), concurrency) # warm up
+            seconds, latencies = await load(client, requests, concurrency)
+            if isinstance(client, xTransport):
+                await client.close()
+            print(f"{name:<20}{requests / seconds:>10,.0f} req/s   p50 {percentile(latencies, 0.5) * 1000:6.2f}ms"
+                f"   p99 {percentile(latencies, 0.99) * 1000:6.2f}ms   {node.connections - connections} connections")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Terminal import xEng
+from x_constants import XURLS_
+from stub_node import StubNode, address
+
+"""
+xrpldata benchmark
+
+Fetches every nft of an issuer from a stubbed xrpldata api, paged, while a ticker measures how long the event
+loop is held up: once with a blocking http call inside the coroutine (what `requests.get` did) and once
+through xEng's async client, with 10 issuers at a time
+
+python benchmarks/xrpldata.py [nfts per issuer] [latency seconds]
+"""
+
+
+async def ticker(lags: list, stop: asyncio.Event, interval: float = 0.001) -> None:
+    """record how late every `interval` tick wakes up"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def blocking_nfts(base: str, issuer: str) -> list:
+    nfts = []
+    url = base + f"issuer/{issuer}"
+    while True:
+        with urllib.request.urlopen(url) as response:
+            data = json.loads(response.read())["data"]
+        nfts += data["nfts"]
+        if not data.get("marker"):
+            return nfts
+        url = base + f"issuer/{issuer}?marker={data['marker']}"
+
+
+async def measure(name: str, fetch, issuers: list) -> None:
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    started = time.perf_counter()
+    fetched = await asyncio.gather(*[fetch(issuer) for issuer in issuers])
+    seconds = time.perf_counter() - started
+    stop.set()
+    await tick
+    print(f"{name:<12}{sum(map(len, fetched)):>8} nfts in {seconds:6.2f}s   max loop stall {max(lags, default=0) * 1000:7.1f}ms")
+
+
+async def main() -> None:
+    nfts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    issuers = [address(index) for index in range(10)]
+    # the stub runs on a thread of its own, a blocking client would otherwise stall it too
+    node = StubNode(latency=latency, xrpldata_nfts=nfts)
+    url = node.start_thread()
+    base = url + "/api/v1/xls20-nfts/"
+    XURLS_["MAINNET_XRPLDATA"] = base
+    await measure("blocking", lambda issuer: blocking_nfts(base, issuer), issuers)
+    async with xEng(url) as eng:
+        await measure("xEng", eng.created_nfts, issuers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+import os
+import sys
+
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.models.response import Response, ResponseStatus
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ALICE = "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh"
+BOB = "rPT1Sjq2YGrBMTttX4GZHjKu9dyfzbpAYe"
+CAROL = "rf1BiGeXwwQoi8Z2ueFYTEXSwuJYfV2Jpn"
+
+
+class FakeNode(AsyncJsonRpcClient):
+    def __init__(self, **handlers) -> None:
+        """answers every request with `handlers[method](params)`, a result with an "error" key is an error response\n
+        the requests are kept in `requests` as (method, params)"""
+        super().__init__("http://fake.invalid")
+        self.handlers = handlers
+        self.requests = []
+
+    async def request_impl(self, request) -> Response:
+        params = request.to_dict()
+        method = params.pop("method")
+        self.requests.append((method, params))
+        result = self.handlers[method](params)
+        return Response(status=ResponseStatus.ERROR if "error" in result else ResponseStatus.SUCCESS, result=result)
+
+    def sent(self, method: str) -> list:
+        """the params of every `method` request sent"""
+        return [params for sent, params in self.requests if sent == method]
+
+
+def payment(account: str, ledger_index: int, sent: bool = True, amount="1000000") -> dict:
+    """an account_tx payment of `account` closed in `ledger_index`"""
+    counterparty = BOB if account != BOB else CAROL
+    return {"validated": True, "meta": {"TransactionResult": "tesSUCCESS", "delivered_amount": amount}, "tx": {
+        "Account": account if sent else counterparty, "Destination": counterparty if sent else account, "Amount": amount,
+        "Fee": "12", "Sequence": ledger_index, "TransactionType": "Payment", "date": 700000000 + 4 * ledger_index,
+        "hash": f"{ledger_index:064X}", "ledger_index": ledger_index}}
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.utils import ripple_time_to_datetime
+
+from History import xHistory
+from conftest import ALICE, FakeNode, payment
+
+
+class Ledgers:
+    def __init__(self, validated: int, transactions: list) -> None:
+        """a node with `transactions` of ALICE, validated up to `validated`, paged `limit` per AccountTx"""
+        self.validated = validated
+        self.transactions = transactions
+        self.fail_marker = None
+
+    def ledger(self, params: dict) -> dict:
+        return {"ledger_index": self.validated, "ledger": {"close_time": 0}}
+
+    def account_tx(self, params: dict) -> dict:
+        if params.get("marker") is not None and params["marker"] == self.fail_marker:
+            return {"error": "tooBusy"}
+        low = params["ledger_index_min"] if params["ledger_index_min"] != -1 else 0
+        high = params["ledger_index_max"] if params["ledger_index_max"] != -1 else self.validated
+        matching = sorted([tx for tx in self.transactions if low <= tx["tx"]["ledger_index"] <= high], key=lambda tx: -tx["tx"]["ledger_index"])
+        start = params.get("marker") or 0
+        end = start + params["limit"]
+        result = {"transactions": matching[start:end]}
+        if end < len(matching):
+            result["marker"] = end
+        return result
+
+    def node(self) -> FakeNode:
+        return FakeNode(ledger=self.ledger, account_tx=self.account_tx)
+
+
+def test_sync_stores_payments_and_only_asks_for_new_ledgers(tmp_path):
+    ledgers = Ledgers(110, [payment(ALICE, index, sent=index % 2 == 0) for index in range(101, 111)])
+    node = ledgers.node()
+    history = xHistory(node, str(tmp_path / "history.sqlite3"))
+
+    assert asyncio.run(history.sync(ALICE, limit=3)) == 10
+    assert history.last_synced_ledger(ALICE) == 110
+    assert len(history.payments(ALICE)) == 10
+
+    # nothing validated since, the node is not asked for transactions again
+    asked = len(node.sent("account_tx"))
+    assert asyncio.run(history.sync(ALICE, limit=3)) == 0
+    assert len(node.sent("account_tx")) == asked
+
+    ledgers.transactions += [payment(ALICE, 111), payment(ALICE, 112)]
+    ledgers.validated = 112
+    assert asyncio.run(history.sync(ALICE, limit=3)) == 2
+    assert node.sent("account_tx")[-1]["ledger_index_min"] == 111
+    assert [row["txid"] for row in history.payments(ALICE)][:2] == [f"{112:064X}", f"{111:064X}"]
+    history.close()
+
+
+def test_failed_sync_keeps_rows_but_not_the_mark(tmp_path):
+    ledgers = Ledgers(110, [payment(ALICE, index) for index in range(101, 111)])
+    ledgers.fail_marker = 6
+    history = xHistory(ledgers.node(), str(tmp_path / "history.sqlite3"))
+
+    with pytest.raises(XRPLRequestFailureException):
+        asyncio.run(history.sync(ALICE, limit=3))
+    # the pages read before the error are stored, the range is not marked synced
+    assert len(history.payments(ALICE)) == 6
+    assert history.last_synced_ledger(ALICE) == -1
+
+    ledgers.fail_marker = None
+    assert asyncio.run(history.sync(ALICE, limit=3)) == 4
+    assert len(history.payments(ALICE)) == 10
+    assert history.last_synced_ledger(ALICE) == 110
+    history.close()
+
+
+def test_payments_between_dates_and_by_token(tmp_path):
+    usd = {"currency": "USD", "issuer": ALICE, "value": "5"}
+    ledgers = Ledgers(110, [payment(ALICE, index, amount=usd if index > 105 else "1000000") for index in range(101, 111)])
+    history = xHistory(ledgers.node(), str(tmp_path / "history.sqlite3"))
+    asyncio.run(history.sync(ALICE))
+
+    start = ripple_time_to_datetime(700000000 + 4 * 103)
+    end = ripple_time_to_datetime(700000000 + 4 * 107)
+    between = history.payments(ALICE, start=start, end=end)
+    assert [row["txid"] for row in between] == [f"{index:064X}" for index in range(107, 102, -1)]
+    assert len(history.payments(ALICE, token="USD")) == 5
+    assert len(history.payments(ALICE, token="XRP", start=datetime(2100, 1, 1, tzinfo=timezone.utc))) == 0
+    history.close()
@@ -0,0 +1,105 @@
+import asyncio
+import csv
+import os
+
+import pytest
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+
+from Holders import COLUMNS, xHolderExport, holder_row
+from conftest import ALICE, FakeNode
+
+
+class Issuer:
+    def __init__(self, holders: int, ledger_index: int = 90) -> None:
+        """ALICE as an issuer of USD to `holders` accounts, AccountLines resolves "validated" to `ledger_index`"""
+        self.lines = [{"account": f"r{index:033d}", "currency": "USD", "balance": f"-{index}", "limit": "0",
+            "limit_peer": "1000000", "no_ripple_peer": index % 2 == 0} for index in range(holders)]
+        self.ledger_index = ledger_index
+        self.fail_marker = None
+        self.error = "tooBusy"
+
+    def account_lines(self, params: dict) -> dict:
+        if params.get("marker") is not None and params["marker"] == self.fail_marker:
+            return {"error": self.error}
+        ledger_index = self.ledger_index if params["ledger_index"] == "validated" else params["ledger_index"]
+        start = int(params.get("marker") or 0)
+        end = start + params["limit"]
+        result = {"account": ALICE, "ledger_index": ledger_index, "lines": self.lines[start:end]}
+        if end < len(self.lines):
+            result["marker"] = str(end)
+        return result
+
+    def node(self) -> FakeNode:
+        return FakeNode(account_lines=self.account_lines)
+
+
+def read_rows(path: str) -> list:
+    with open(path, newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_holder_row_is_from_the_holders_side():
+    line = {"account": ALICE, "currency": "USD", "balance": "-12.5", "limit": "0", "limit_peer": "100", "no_ripple_peer": True}
+    assert holder_row(line) == (ALICE, "USD", "12.5", "100", False, True)
+    assert holder_row({**line, "balance": "3"})[2] == "-3"
+    assert holder_row({**line, "balance": "0"})[2] == "0"
+
+
+def test_csv_export_writes_every_holder_and_removes_its_state(tmp_path):
+    issuer = Issuer(25)
+    state_path = str(tmp_path / "state.json")
+    export = xHolderExport(issuer.node(), ALICE, page_size=4, state_path=state_path, checkpoint_pages=2)
+    summary = asyncio.run(export.to_csv(str(tmp_path / "holders.csv")))
+
+    assert summary["rows"] == 25
+    assert summary["pages"] == 7
+    assert summary["ledger_index"] == 90
+    rows = read_rows(str(tmp_path / "holders.csv"))
+    assert tuple(rows[0]) == COLUMNS
+    assert [row[0] for row in rows[1:]] == [line["account"] for line in issuer.lines]
+    assert not os.path.exists(state_path)
+
+
+def test_interrupted_export_resumes_from_its_checkpoint(tmp_path):
+    issuer = Issuer(25)
+    issuer.fail_marker = "20"
+    state_path = str(tmp_path / "state.json")
+    path = str(tmp_path / "holders.csv")
+    node = issuer.node()
+    export = xHolderExport(node, ALICE, page_size=4, state_path=state_path, checkpoint_pages=2)
+    with pytest.raises(XRPLRequestFailureException):
+        asyncio.run(export.to_csv(path))
+    assert os.path.exists(state_path)
+
+    issuer.fail_marker = None
+    issuer.ledger_index = 95 # a resumed export stays on the ledger its marker came from
+    asked = len(node.sent("account_lines"))
+    summary = asyncio.run(export.to_csv(path))
+
+    resumed = node.sent("account_lines")[asked:]
+    assert resumed[0]["marker"] == "16"
+    assert {params["ledger_index"] for params in resumed} == {90}
+    assert summary["rows"] == 25
+    assert summary["ledger_index"] == 90
+    # the page read after the checkpoint is not written twice
+    assert [row[0] for row in read_rows(path)[1:]] == [line["account"] for line in issuer.lines]
+    assert not os.path.exists(state_path)
+
+
+def test_lost_ledger_drops_the_state(tmp_path):
+    issuer = Issuer(25)
+    issuer.fail_marker = "8"
+    issuer.error = "lgrNotFound"
+    state_path = str(tmp_path / "state.json")
+    export = xHolderExport(issuer.node(), ALICE, page_size=4, state_path=state_path, checkpoint_pages=1)
+    with pytest.raises(RuntimeError):
+        asyncio.run(export.to_csv(str(tmp_path / "holders.csv")))
+    assert not os.path.exists(state_path)
+
+
+def test_callable_sink_gets_every_page():
+    issuer = Issuer(10)
+    pages = []
+    summary = asyncio.run(xHolderExport(issuer.node(), ALICE, page_size=4).export(pages.append))
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert summary["rows"] == 10
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.core.binarycodec import encode
+
+from Signer import tx_hash
+from Submit import xSubmitter
+from conftest import ALICE, BOB, FakeNode
+
+
+def blob(sequence: int, last_ledger_sequence: int = 110) -> str:
+    transaction = {"TransactionType": "Payment", "Account": ALICE, "Destination": BOB, "Amount": "1000000", "Fee": "12",
+        "Sequence": sequence, "SigningPubKey": ""}
+    if last_ledger_sequence is not None:
+        transaction["LastLedgerSequence"] = last_ledger_sequence
+    return encode(transaction)
+
+
+class Chain:
+    def __init__(self, validated: int = 100, engine_results: dict = None, include: bool = True) -> None:
+        """every validated ledger request closes a ledger holding the blobs submitted since the last one\n
+        `engine_results` maps a hash to the submit results it gets in order, tesSUCCESS after them"""
+        self.validated = validated
+        self.engine_results = engine_results or {}
+        self.include = include
+        self.queued = []
+        self.closed = {}
+        self.failing = False
+
+    def ledger(self, params: dict) -> dict:
+        if self.failing:
+            return {"error": "noNetwork"}
+        if params["ledger_index"] == "validated":
+            self.validated += 1
+            self.closed[self.validated], self.queued = self.queued, []
+            return {"ledger_index": self.validated}
+        return {"ledger_index": params["ledger_index"], "ledger": {"transactions": [
+            {"hash": txid, "metaData": {"TransactionResult": "tesSUCCESS"}} for txid in self.closed.get(params["ledger_index"], [])]}}
+
+    def submit(self, params: dict) -> dict:
+        txid = tx_hash(params["tx_blob"])
+        results = self.engine_results.get(txid, [])
+        result = results.pop(0) if results else "tesSUCCESS"
+        if result == "tesSUCCESS" and self.include:
+            self.queued.append(txid)
+        return {"engine_result": result}
+
+    def node(self) -> FakeNode:
+        return FakeNode(ledger=self.ledger, submit=self.submit)
+
+
+async def submit_all(submitter: xSubmitter, blobs: list) -> list:
+    async with submitter:
+        return await asyncio.wait_for(submitter.submit_many(blobs), 5)
+
+
+def test_blob_without_last_ledger_sequence_is_rejected():
+    submitter = xSubmitter(Chain().node(), poll_interval=0.01)
+    with pytest.raises(ValueError):
+        asyncio.run(submit_all(submitter, [blob(1, None)]))
+
+
+def test_submitted_blobs_settle_in_the_ledger_that_holds_them():
+    chain = Chain()
+    blobs = [blob(sequence) for sequence in range(1, 6)]
+    finals = asyncio.run(submit_all(xSubmitter(chain.node(), poll_interval=0.01), blobs))
+    assert [final["txid"] for final in finals] == [tx_hash(item) for item in blobs]
+    assert all(final["result"] == "tesSUCCESS" and final["attempts"] == 1 for final in finals)
+    assert all(tx_hash(item) in chain.closed[final["ledger_index"]] for item, final in zip(blobs, finals))
+
+
+def test_retryable_submit_results_are_sent_again():
+    item = blob(1)
+    chain = Chain(engine_results={tx_hash(item): ["terQUEUED", "telINSUF_FEE_P"]})
+    [final] = asyncio.run(submit_all(xSubmitter(chain.node(), poll_interval=0.01), [item]))
+    assert final["result"] == "tesSUCCESS"
+    assert final["attempts"] == 3
+
+
+def test_malformed_blob_settles_without_waiting_for_a_ledger():
+    item = blob(1)
+    chain = Chain(engine_results={tx_hash(item): ["temBAD_AMOUNT"]})
+    [final] = asyncio.run(submit_all(xSubmitter(chain.node(), poll_interval=0.01), [item]))
+    assert final["result"] == "temBAD_AMOUNT"
+    assert final["ledger_index"] is None
+
+
+def test_blob_missing_past_its_last_ledger_sequence_expires():
+    chain = Chain(include=False)
+    [final] = asyncio.run(submit_all(xSubmitter(chain.node(), poll_interval=0.01), [blob(1, 103)]))
+    assert final["result"] == "expired"
+    assert final["attempts"] == 1
+    assert chain.validated >= 103
+
+
+def test_persistent_node_errors_fail_the_pending_futures():
+    chain = Chain(include=False)
+    submitter = xSubmitter(chain.node(), poll_interval=0.01, max_errors=3)
+
+    async def run() -> None:
+        async with submitter:
+            future = await submitter.submit(blob(1, 200))
+            chain.failing = True
+            await asyncio.wait_for(future, 5)
+
+    with pytest.raises(XRPLRequestFailureException) as error:
+        asyncio.run(run())
+    assert error.value.error == "noNetwork"
+    assert not submitter.pending
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+import Objects
+from Sweeper import xEscrowSweeper
+from conftest import ALICE, BOB, CAROL, FakeNode
+
+CLOSE_TIME = 750000000
+
+
+def escrow(number: int, **fields) -> dict:
+    """an escrow ALICE created for BOB with sequence `number`"""
+    return {"index": f"{number:064X}", "LedgerEntryType": "Escrow", "Account": ALICE, "Destination": BOB, "Amount": "1000000",
+        "PreviousTxnID": f"{number + 1000:064X}", **fields}
+
+
+class Escrows:
+    def __init__(self, escrows: list, missing: tuple = ()) -> None:
+        """a node holding `escrows`, whose create transactions are found except the `missing` ones"""
+        self.escrows = escrows
+        self.missing = missing
+
+    def ledger(self, params: dict) -> dict:
+        return {"ledger_index": 100, "ledger": {"close_time": CLOSE_TIME}}
+
+    def account_objects(self, params: dict) -> dict:
+        owned = [item for item in self.escrows if params["account"] in (item["Account"], item["Destination"])]
+        return {"account": params["account"], "ledger_index": 100, "account_objects": owned}
+
+    def tx(self, params: dict) -> dict:
+        for item in self.escrows:
+            if item["PreviousTxnID"] == params["transaction"] and item["PreviousTxnID"] not in self.missing:
+                return {"hash": item["PreviousTxnID"], "TransactionType": "EscrowCreate", "Sequence": int(item["index"], 16)}
+        return {"error": "txnNotFound"}
+
+    def node(self) -> FakeNode:
+        return FakeNode(ledger=self.ledger, account_objects=self.account_objects, tx=self.tx)
+
+
+@pytest.fixture(autouse=True)
+def clear_sequences():
+    Objects.ESCROW_SEQUENCES.clear()
+    yield
+    Objects.ESCROW_SEQUENCES.clear()
+
+
+def test_matured_escrows_are_judged_by_the_validated_close_time():
+    escrows = Escrows([
+        escrow(1, FinishAfter=CLOSE_TIME - 1),
+        escrow(2, FinishAfter=CLOSE_TIME),
+        escrow(3, FinishAfter=CLOSE_TIME - 10, CancelAfter=CLOSE_TIME - 1),
+        escrow(4, CancelAfter=CLOSE_TIME + 60)])
+    node = escrows.node()
+    swept = asyncio.run(xEscrowSweeper(node, CAROL).sweep([ALICE, BOB]))
+
+    # both ends of every escrow were asked, each escrow is built once
+    assert swept["escrows"] == 4
+    assert [(txn["TransactionType"], txn["OfferSequence"]) for txn in swept["finish"]] == [("EscrowFinish", 1)]
+    assert [(txn["TransactionType"], txn["OfferSequence"]) for txn in swept["cancel"]] == [("EscrowCancel", 3)]
+    assert all(txn["Account"] == CAROL and txn["Owner"] == ALICE for txn in swept["finish"] + swept["cancel"])
+    assert swept["unresolved"] == []
+
+
+def test_escrow_with_a_condition_is_not_finished():
+    escrows = Escrows([escrow(1, FinishAfter=CLOSE_TIME - 1, Condition="A0258020" + "00" * 32 + "810120")])
+    swept = asyncio.run(xEscrowSweeper(escrows.node(), CAROL).sweep([ALICE]))
+    assert swept["finish"] == []
+    assert swept["cancel"] == []
+
+
+def test_failed_sequence_lookup_is_reported_not_built():
+    found = escrow(1, FinishAfter=CLOSE_TIME - 1)
+    lost = escrow(2, CancelAfter=CLOSE_TIME - 1)
+    node = Escrows([found, lost], missing=(lost["PreviousTxnID"],)).node()
+    swept = asyncio.run(xEscrowSweeper(node, CAROL).sweep([ALICE]))
+
+    assert [txn["OfferSequence"] for txn in swept["finish"]] == [1]
+    assert swept["cancel"] == []
+    assert swept["unresolved"] == [{"escrow_id": lost["index"], "prev_txn_id": lost["PreviousTxnID"], "error": "txnNotFound"}]
+    assert lost["PreviousTxnID"] not in Objects.ESCROW_SEQUENCES
+
+
+def test_sequences_are_looked_up_once():
+    escrows = Escrows([escrow(1, FinishAfter=CLOSE_TIME - 1)])
+    node = escrows.node()
+    sweeper = xEscrowSweeper(node, CAROL)
+    asyncio.run(sweeper.sweep([ALICE]))
+    asyncio.run(sweeper.sweep([ALICE]))
+    assert len(node.sent("tx")) == 1
@@ -5,6 +5,10 @@ XURLS_ = {
     "MAINNET_TXNS": "https://livenet.xrpl.org/transactions/",
     "MAINNET_ACCOUNT": "https://livenet.xrpl.org/accounts/",
     "TESTNET_ACCOUNT": "https://testnet.xrpl.org/accounts/",
+    "MAINNET_XRPLDATA": "https://api.xrpldata.com/api/v1/xls20-nfts/",
+    "TESTNET_XRPLDATA": "https://test-api.xrpldata.com/api/v1/xls20-nfts/",
+    "MAINNET_WS": "wss://xrplcluster.com",
+    "TESTNET_WS": "wss://s.altnet.rippletest.net:51233",
 }
 
 
@@ -49,7 +53,7 @@ ACCOUNT_ROOT_FLAGS = [
     {
         "flagname": "lsfDisallowIncomingNFTokenOffer",
         "hex": 0x04000000,
-        "decimal": 134217728,
+        "decimal": 67108864,
         "asf": "asfDisallowIncomingNFTokenOffer",
         "description": ""
     },
@@ -164,7 +168,7 @@ OFFER_FLAGS = [
     {
         "flagname": "tfFillOrKill",
         "hex": 0x00040000,
-        "decimal": 131072,
+        "decimal": 262144,
         "description": "Treat the offer as a Fill or Kill order . The Offer never creates an Offer object in the ledger, and is canceled if it cannot be fully filled at the time of execution. By default, this means that the owner must receive the full TakerPays amount; if the tfSell flag is enabled, the owner must be able to spend the entire TakerGets amount instead.",
     },
     {
@@ -175,6 +179,22 @@ OFFER_FLAGS = [
     },
 ]
 
+# flags of Offer ledger objects, as returned by AccountOffers, BookOffers and AccountObjects
+OFFER_OBJECT_FLAGS = [
+    {
+        "flagname": "lsfPassive",
+        "hex": 0x00010000,
+        "decimal": 65536,
+        "description": "The object was placed as a passive Offer. This has no effect on the object in the ledger.",
+    },
+    {
+        "flagname": "lsfSell",
+        "hex": 0x00020000,
+        "decimal": 131072,
+        "description": "The object was placed as a sell Offer. This has no effect on the object in the ledger (because tfSell only matters if you get a better rate than you asked for, which cannot happen after the object enters the ledger).",
+    },
+]
+
 PAYMENT_FLAGS = [
     {
         "flagname": "tfNoDirectRipple",